@@ -7,6 +7,7 @@ from sqlalchemy import text
 from sqlmodel import Session
 
 from agreements.contract_attachment_data import ContractAttachmentData
+from core.unit_of_work import flush_or_commit
 
 
 class ContractAttachmentDataRepositoryImp:
@@ -33,7 +34,6 @@ class ContractAttachmentDataRepositoryImp:
 
     def save(self, contract_attachment_data: ContractAttachmentData) -> Optional[ContractAttachmentData]:
         self.session.add(contract_attachment_data)
-        self.session.commit()
-        self.session.refresh(contract_attachment_data)
+        flush_or_commit(self.session, contract_attachment_data)
         return contract_attachment_data
 
@@ -7,6 +7,7 @@ from sqlalchemy import text
 from sqlmodel import Session
 
 from agreements.contract import Contract
+from core.unit_of_work import flush_or_commit
 
 
 class ContractRepositoryImp:
@@ -18,8 +19,7 @@ class ContractRepositoryImp:
 
     def save(self, contract: Contract) -> Optional[Contract]:
         self.session.add(contract)
-        self.session.commit()
-        self.session.refresh(contract)
+        flush_or_commit(self.session, contract)
         return contract
 
     def find_by_partner_name(self, partner_name: str) -> List[Contract]:
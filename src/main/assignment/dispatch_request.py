@@ -0,0 +1,11 @@
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from carfleet.car_class import CarClass
+from geolocation.address.address_dto import AddressDTO
+
+
+class DispatchRequest(NamedTuple):
+    transit_request_uuid: UUID
+    address_from: AddressDTO
+    car_class: Optional[CarClass]
@@ -1,6 +1,5 @@
-import json
 from datetime import datetime
-from typing import Any, Optional, Set
+from typing import Any, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
 from dateutil.relativedelta import relativedelta
@@ -8,6 +7,7 @@ from sqlalchemy import Enum, Column
 from sqlmodel import Field
 
 from assignment.assignment_status import AssignmentStatus
+from assignment.driver_assignment_involvement import DriverAssignmentInvolvement
 from common.base_entity import BaseEntity
 
 
@@ -21,14 +21,13 @@ class DriverAssignment(BaseEntity, table=True):
         sa_column=Column(Enum(AssignmentStatus))
     )
     assigned_driver: Optional[int]
-    drivers_rejections: Optional[str]
-    proposed_drivers: Optional[str]
     awaiting_drivers_responses: int = 0
 
     def __init__(self, request_uuid: Optional[UUID] = None, published_at: Optional[datetime] = None, **data: Any):
         super().__init__(**data)
         self.request_uuid = request_uuid
         self.published_at = published_at
+        self.involved_drivers_loaded([], [])
 
     def cancel(self) -> None:
         if self.status not in (AssignmentStatus.WAITING_FOR_DRIVER_ASSIGNMENT, AssignmentStatus.ON_THE_WAY):
@@ -38,7 +37,7 @@ class DriverAssignment(BaseEntity, table=True):
         self.awaiting_drivers_responses = 0
 
     def can_propose_to(self, driver_id: int) -> bool:
-        return driver_id not in self.get_driver_rejections()
+        return driver_id not in self.__involved(DriverAssignmentInvolvement.Kind.REJECTED)
 
     def propose_to(self, driver_id: int) -> None:
         if self.can_propose_to(driver_id):
@@ -46,9 +45,7 @@ class DriverAssignment(BaseEntity, table=True):
             self.awaiting_drivers_responses += 1
 
     def __add_driver_to_proposed(self, driver_id: int) -> None:
-        proposed_drivers_set: Set[int] = self.get_proposed_drivers()
-        proposed_drivers_set.add(driver_id)
-        self.proposed_drivers = json.dumps(list(proposed_drivers_set))
+        self.__involve(driver_id, DriverAssignmentInvolvement.Kind.PROPOSED)
 
     def fail_driver_assignment(self) -> None:
         self.status = AssignmentStatus.DRIVER_ASSIGNMENT_FAILED
@@ -62,10 +59,10 @@ class DriverAssignment(BaseEntity, table=True):
         if self.assigned_driver:
             raise AttributeError(f"Transit already accepted, id = {self.id}")
         else:
-            if driver_id not in self.get_proposed_drivers():
+            if driver_id not in self.__involved(DriverAssignmentInvolvement.Kind.PROPOSED):
                 raise AttributeError(f"Driver out of possible drivers, id = {self.id}")
             else:
-                if driver_id in self.get_driver_rejections():
+                if driver_id in self.__involved(DriverAssignmentInvolvement.Kind.REJECTED):
                     raise AttributeError(f"Driver out of possible drivers, id = {self.id}")
         self.assigned_driver = driver_id
         self.awaiting_drivers_responses = 0
@@ -76,12 +73,40 @@ class DriverAssignment(BaseEntity, table=True):
         self.awaiting_drivers_responses -= 1
 
     def __add_to_driver_rejections(self, driver_id: int) -> None:
-        driver_rejection_set: Set[int] = self.get_driver_rejections()
-        driver_rejection_set.add(driver_id)
-        self.drivers_rejections = json.dumps(list(driver_rejection_set))
+        self.__involve(driver_id, DriverAssignmentInvolvement.Kind.REJECTED)
 
     def get_driver_rejections(self) -> Set[int]:
-        return set(json.loads(self.drivers_rejections)) if self.drivers_rejections else set()
+        return set(self.__involved(DriverAssignmentInvolvement.Kind.REJECTED))
 
     def get_proposed_drivers(self) -> Set[int]:
-        return set(json.loads(self.proposed_drivers)) if self.proposed_drivers else set()
+        return set(self.__involved(DriverAssignmentInvolvement.Kind.PROPOSED))
+
+    # Proposals and rejections are decoded once per aggregate and written back by the repository on save.
+    # They live outside the mapped columns, so SQLAlchemy expiring the entity on commit keeps them.
+
+    def involved_drivers_are_loaded(self) -> bool:
+        return "_involved_drivers" in self.__dict__
+
+    def involved_drivers_loaded(self, proposed: Iterable[int], rejected: Iterable[int]) -> None:
+        self.__dict__["_involved_drivers"] = {
+            DriverAssignmentInvolvement.Kind.PROPOSED: set(proposed),
+            DriverAssignmentInvolvement.Kind.REJECTED: set(rejected),
+        }
+        self.__dict__["_unsaved_involvements"] = []
+
+    def unsaved_involvements(self) -> List[Tuple[int, DriverAssignmentInvolvement.Kind]]:
+        return list(self.__dict__.get("_unsaved_involvements", []))
+
+    def involvements_saved(self) -> None:
+        self.__dict__["_unsaved_involvements"] = []
+
+    def __involved(self, kind: DriverAssignmentInvolvement.Kind) -> Set[int]:
+        if not self.involved_drivers_are_loaded():
+            self.involved_drivers_loaded([], [])
+        return self.__dict__["_involved_drivers"][kind]
+
+    def __involve(self, driver_id: int, kind: DriverAssignmentInvolvement.Kind) -> None:
+        involved: Set[int] = self.__involved(kind)
+        if driver_id not in involved:
+            involved.add(driver_id)
+            self.__dict__["_unsaved_involvements"].append((driver_id, kind))
@@ -1,10 +1,13 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Tuple
 
+import numpy as np
 from injector import inject
 from sqlalchemy.dialects.postgresql import UUID
 
 from assignment.assignment_status import AssignmentStatus
+from assignment.dispatch_request import DispatchRequest
+from assignment.greedy_matcher import GreedyMatcher
 from assignment.involved_drivers_summary import InvolvedDriversSummary
 from driverfleet.driver import Driver
 from tracking.driver_position_dtov_2 import DriverPositionDTOV2
@@ -15,14 +18,21 @@ from assignment.driver_assignment_repository import DriverAssignmentRepository
 from carfleet.car_class import CarClass
 from carfleet.car_type_service import CarTypeService
 from crm.notification.driver_notification_service import DriverNotificationService
+from geolocation.distance_calculator import DistanceCalculator
+from tracking.available_driver import AvailableDriver
 from tracking.driver_tracking_service import DriverTrackingService
+from tracking.nearby_drivers_search import NearbyDriversSearch
 
 
 class DriverAssignmentFacade:
+    MAX_DISTANCE_TO_CHECK_IN_KM: int = 19
+
     driver_assignment_repository: DriverAssignmentRepository
     car_type_service: CarTypeService
     driver_tracking_service: DriverTrackingService
     driver_notification_service: DriverNotificationService
+    distance_calculator: DistanceCalculator
+    greedy_matcher: GreedyMatcher
 
     @inject
     def __init__(
@@ -31,11 +41,15 @@ class DriverAssignmentFacade:
         car_type_service: CarTypeService,
         driver_tracking_service: DriverTrackingService,
         driver_notification_service: DriverNotificationService,
+        distance_calculator: DistanceCalculator,
+        greedy_matcher: GreedyMatcher,
     ):
         self.driver_assignment_repository = driver_assignment_repository
         self.car_type_service = car_type_service
         self.driver_tracking_service = driver_tracking_service
         self.driver_notification_service = driver_notification_service
+        self.distance_calculator = distance_calculator
+        self.greedy_matcher = greedy_matcher
 
     def start_assigning_drivers(
         self,
@@ -55,54 +69,147 @@ class DriverAssignmentFacade:
     ):
         driver_assignment: DriverAssignment = self.find(transit_request_uuid)
         if driver_assignment:
-            distance_to_check: int = 0
-
-            # Tested on production, works as expected.
-            # If you change this code and the system will collapse AGAIN, I'll find you...
-            while True:
-                if driver_assignment.awaiting_drivers_responses > 4:
-                    return InvolvedDriversSummary.none_found()
-                distance_to_check += 1
-
-                # FIXME: to refactor when the final business logic will be determined
-                if (
-                        driver_assignment.should_not_wait_for_driver_any_more(datetime.now())
-                        or distance_to_check >= 20
-                ):
-                    driver_assignment.fail_driver_assignment()
-                    self.driver_assignment_repository.save(driver_assignment)
-                    return InvolvedDriversSummary.none_found()
+            if driver_assignment.awaiting_drivers_responses > 4:
+                return InvolvedDriversSummary.none_found()
 
-                car_classes: List[CarClass] = self.choose_possible_car_classes(car_class)
-                if not car_classes:
-                    return InvolvedDriversSummary.none_found()
+            # FIXME: to refactor when the final business logic will be determined
+            if driver_assignment.should_not_wait_for_driver_any_more(datetime.now()):
+                return self.fail_driver_assignment(driver_assignment)
 
-                drivers_avg_positions: List[DriverPositionDTOV2] = \
-                    self.driver_tracking_service.find_active_drivers_nearby_by_address(
-                        address_from,
-                        Distance.of_km(distance_to_check), car_classes
-                    )
+            car_classes: List[CarClass] = self.choose_possible_car_classes(car_class)
+            if not car_classes:
+                return InvolvedDriversSummary.none_found()
+
+            # Candidates are fetched once for the widest radius, each next kilometer is checked in memory.
+            search: NearbyDriversSearch = self.driver_tracking_service.search_active_drivers_nearby_by_address(
+                address_from,
+                Distance.of_km(self.MAX_DISTANCE_TO_CHECK_IN_KM),
+                car_classes
+            )
+            for distance_to_check in range(1, self.MAX_DISTANCE_TO_CHECK_IN_KM + 1):
+                drivers_avg_positions: List[DriverPositionDTOV2] = search.within(Distance.of_km(distance_to_check))
 
                 if not drivers_avg_positions:
-                    # next iteration
+                    # next distance
                     continue
 
+                proposed_to: List[int] = []
                 for driver_avg_position in drivers_avg_positions:
                     if driver_assignment.can_propose_to(driver_avg_position.driver_id):
                         driver_assignment.propose_to(driver_avg_position.driver_id)
-                        self.driver_notification_service.notify_about_possible_transit(
-                            driver_avg_position.driver_id,
-                            transit_request_uuid
-                        )
+                        proposed_to.append(driver_avg_position.driver_id)
 
                 self.driver_assignment_repository.save(driver_assignment)
+                for driver_id in proposed_to:
+                    self.driver_notification_service.notify_about_possible_transit(driver_id, transit_request_uuid)
                 return self.load_involved_drivers(driver_assignment)
+
+            return self.fail_driver_assignment(driver_assignment)
         else:
             raise AttributeError(f"Transit does not exist, id = {transit_request_uuid}")
 
+    def find_waiting_for_driver_assignment(self) -> List[UUID]:
+        return [
+            driver_assignment.request_uuid
+            for driver_assignment in self.driver_assignment_repository.find_all_by_status(
+                AssignmentStatus.WAITING_FOR_DRIVER_ASSIGNMENT
+            )
+        ]
+
+    def dispatch(self, requests: List[DispatchRequest]) -> Dict[UUID, InvolvedDriversSummary]:
+        # All waiting transits share one candidate fetch and one cost matrix, so neighbouring
+        # requests get different drivers instead of all being proposed to the same nearest ones.
+        driver_assignments: Dict[UUID, DriverAssignment] = {
+            driver_assignment.request_uuid: driver_assignment
+            for driver_assignment in self.driver_assignment_repository.find_all_by_request_uuids(
+                [request.transit_request_uuid for request in requests]
+            )
+        }
+        active_car_classes: List[CarClass] = self.car_type_service.find_active_car_classes()
+        now: datetime = datetime.now()
+        summaries: Dict[UUID, InvolvedDriversSummary] = {}
+        changed: List[DriverAssignment] = []
+        matchable: List[Tuple[DriverAssignment, List[CarClass], Tuple[float, float]]] = []
+        for request in requests:
+            driver_assignment: DriverAssignment = driver_assignments.get(request.transit_request_uuid)
+            if not driver_assignment:
+                raise AttributeError(f"Transit does not exist, id = {request.transit_request_uuid}")
+            if driver_assignment.awaiting_drivers_responses > 4:
+                summaries[request.transit_request_uuid] = InvolvedDriversSummary.none_found()
+                continue
+            if driver_assignment.should_not_wait_for_driver_any_more(now):
+                driver_assignment.fail_driver_assignment()
+                changed.append(driver_assignment)
+                summaries[request.transit_request_uuid] = InvolvedDriversSummary.none_found()
+                continue
+            car_classes: List[CarClass] = self.__choose_possible_car_classes(request.car_class, active_car_classes)
+            if not car_classes:
+                summaries[request.transit_request_uuid] = InvolvedDriversSummary.none_found()
+                continue
+            matchable.append(
+                (driver_assignment, car_classes, self.driver_tracking_service.geocode(request.address_from))
+            )
+
+        available: List[AvailableDriver] = []
+        proposed: Dict[int, int] = {}
+        if matchable:
+            available = self.driver_tracking_service.find_available_drivers_around(
+                [pickup for _, _, pickup in matchable],
+                Distance.of_km(self.MAX_DISTANCE_TO_CHECK_IN_KM),
+                list({car_class for _, car_classes, _ in matchable for car_class in car_classes})
+            )
+            costs: np.ndarray = self.__dispatch_costs(matchable, available)
+            proposed = dict(self.greedy_matcher.match(costs))
+            for row, (driver_assignment, _, _) in enumerate(matchable):
+                if row in proposed:
+                    driver_assignment.propose_to(available[proposed[row]].position.driver_id)
+                elif not np.isfinite(costs[row]).any() and not driver_assignment.get_proposed_drivers():
+                    # Nobody within reach at all, the same outcome as running out of radii one by one.
+                    driver_assignment.fail_driver_assignment()
+                changed.append(driver_assignment)
+
+        self.driver_assignment_repository.save_all(changed)
+        for row, (driver_assignment, _, _) in enumerate(matchable):
+            if row in proposed:
+                self.driver_notification_service.notify_about_possible_transit(
+                    available[proposed[row]].position.driver_id,
+                    driver_assignment.request_uuid
+                )
+            summaries[driver_assignment.request_uuid] = self.load_involved_drivers(driver_assignment)
+        return summaries
+
+    def __dispatch_costs(
+        self,
+        matchable: List[Tuple[DriverAssignment, List[CarClass], Tuple[float, float]]],
+        available: List[AvailableDriver],
+    ) -> np.ndarray:
+        # Distance from every pickup to every available driver, infinite where a driver cannot be proposed.
+        costs: np.ndarray = self.distance_calculator.calculate_by_geo_many(
+            np.array([[pickup[0]] for _, _, pickup in matchable], dtype=float),
+            np.array([[pickup[1]] for _, _, pickup in matchable], dtype=float),
+            np.array([driver.position.latitude for driver in available], dtype=float),
+            np.array([driver.position.longitude for driver in available], dtype=float),
+        ).reshape(len(matchable), len(available))
+        costs[costs > self.MAX_DISTANCE_TO_CHECK_IN_KM] = np.inf
+        driver_car_classes: np.ndarray = np.array([driver.car_class.name for driver in available], dtype=object)
+        column_of: Dict[int, int] = {driver.position.driver_id: column for column, driver in enumerate(available)}
+        for row, (driver_assignment, car_classes, _) in enumerate(matchable):
+            costs[row, ~np.isin(driver_car_classes, [car_class.name for car_class in car_classes])] = np.inf
+            for driver_id in driver_assignment.get_driver_rejections() | driver_assignment.get_proposed_drivers():
+                if driver_id in column_of:
+                    costs[row, column_of[driver_id]] = np.inf
+        return costs
+
+    def fail_driver_assignment(self, driver_assignment: DriverAssignment) -> InvolvedDriversSummary:
+        driver_assignment.fail_driver_assignment()
+        self.driver_assignment_repository.save(driver_assignment)
+        return InvolvedDriversSummary.none_found()
+
     def choose_possible_car_classes(self, car_class: CarClass):
+        return self.__choose_possible_car_classes(car_class, self.car_type_service.find_active_car_classes())
+
+    def __choose_possible_car_classes(self, car_class: CarClass, active_car_classes: List[CarClass]) -> List[CarClass]:
         car_classes: List[CarClass] = []
-        active_car_classes: List[CarClass] = self.car_type_service.find_active_car_classes()
         if car_class is not None:
             if car_class in active_car_classes:
                 car_classes.append(car_class)
@@ -120,6 +227,7 @@ class DriverAssignmentFacade:
         if not driver_assignment:
             raise AttributeError(f"Assignment does not exist, id = {transit_request_uuid}")
         driver_assignment.reject_by(driver_id)
+        self.driver_assignment_repository.save(driver_assignment)
         return self.load_involved_drivers(driver_assignment)
 
     def is_driver_assigned(self, transit_request_uuid: UUID) -> bool:
@@ -153,8 +261,8 @@ class DriverAssignmentFacade:
 
     def notify_assigned_driver_about_changed_destination(self, transit_request_uuid: UUID):
         driver_assignment: DriverAssignment = self.find(transit_request_uuid)
-        if driver_assignment and driver_assignment.get_assigned_driver():
-            assigned_driver: int = self.driver_assignment.get_assigned_driver()
+        if driver_assignment and driver_assignment.assigned_driver:
+            assigned_driver: int = driver_assignment.assigned_driver
             self.driver_notification_service.notify_about_changed_transit_address(
                 assigned_driver,
                 transit_request_uuid
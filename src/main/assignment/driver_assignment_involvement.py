@@ -0,0 +1,21 @@
+import enum
+
+from sqlalchemy import Column, Enum, ForeignKey, Index, Integer
+from sqlmodel import Field, SQLModel
+
+
+class DriverAssignmentInvolvement(SQLModel, table=True):
+    """A driver proposed a transit, or rejecting it, one row per assignment, driver and kind."""
+    __table_args__ = (
+        Index('ix_driverassignmentinvolvement_driver_id_kind', 'driver_id', 'kind'),
+        {'extend_existing': True},
+    )
+
+    class Kind(enum.Enum):
+        PROPOSED = 1
+        REJECTED = 2
+
+    assignment_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("driverassignment.id"), primary_key=True, nullable=False))
+    driver_id: int = Field(sa_column=Column(Integer, primary_key=True, nullable=False))
+    kind: Kind = Field(sa_column=Column(Enum(Kind), primary_key=True, nullable=False))
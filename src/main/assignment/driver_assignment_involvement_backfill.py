@@ -0,0 +1,13 @@
+from injector import Injector
+
+from assignment.driver_assignment_repository import DriverAssignmentRepository
+from core.database import DatabaseModule
+
+
+def main() -> None:
+    # Copies proposals and rejections of assignments stored before the involvement table was deployed.
+    Injector([DatabaseModule]).get(DriverAssignmentRepository).backfill_involvements_from_json_columns()
+
+
+if __name__ == "__main__":
+    main()
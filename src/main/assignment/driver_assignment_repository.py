@@ -1,11 +1,18 @@
-from typing import Optional
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
 from uuid import UUID
 
 from injector import inject
+from sqlalchemy import inspect, text
 from sqlmodel import Session
 
 from assignment.assignment_status import AssignmentStatus
 from assignment.driver_assignment import DriverAssignment
+from assignment.driver_assignment_involvement import DriverAssignmentInvolvement
+from core.identity_map import cached
+from core.unit_of_work import flush_or_commit
 
 
 class DriverAssignmentRepository:
@@ -16,17 +23,137 @@ class DriverAssignmentRepository:
         self.session = session
 
     def find_by_request_uuid(self, request_uuid: UUID) -> DriverAssignment:
-        return self.session.query(DriverAssignment).where(DriverAssignment.request_uuid == request_uuid).first()
+        return cached(DriverAssignment, "request_uuid", request_uuid, lambda: self.__with_involved_drivers(
+            self.session.query(DriverAssignment).where(DriverAssignment.request_uuid == request_uuid).first()
+        ))
 
     def find_by_request_uuid_and_status(self, request_uuid: UUID, status: AssignmentStatus) -> DriverAssignment:
-        return self.session.query(DriverAssignment).where(
+        return self.__with_involved_drivers(self.session.query(DriverAssignment).where(
             DriverAssignment.request_uuid == request_uuid
         ).where(
             DriverAssignment.status == status
-        ).first()
+        ).first())
+
+    def find_all_by_status(self, status: AssignmentStatus) -> List[DriverAssignment]:
+        return self.__with_all_involved_drivers(
+            self.session.query(DriverAssignment).where(DriverAssignment.status == status).all()
+        )
+
+    def find_all_by_request_uuids(self, request_uuids: List[UUID]) -> List[DriverAssignment]:
+        return self.__with_all_involved_drivers(
+            self.session.query(DriverAssignment).where(DriverAssignment.request_uuid.in_(request_uuids)).all()
+        )
+
+    def find_all_waiting_involving(self, driver_id: int) -> List[DriverAssignment]:
+        return self.__with_all_involved_drivers(self.session.query(DriverAssignment).join(
+            DriverAssignmentInvolvement, DriverAssignmentInvolvement.assignment_id == DriverAssignment.id
+        ).where(
+            DriverAssignmentInvolvement.driver_id == driver_id
+        ).where(
+            DriverAssignment.status == AssignmentStatus.WAITING_FOR_DRIVER_ASSIGNMENT
+        ).distinct().all())
+
+    def find_request_uuids_waiting_since_before(self, deadline: datetime, limit: int) -> List[UUID]:
+        return [
+            request_uuid for request_uuid, in self.session.query(DriverAssignment.request_uuid).where(
+                DriverAssignment.status == AssignmentStatus.WAITING_FOR_DRIVER_ASSIGNMENT
+            ).where(
+                DriverAssignment.published_at < deadline
+            ).limit(limit)
+        ]
+
+    def fail_all_waiting_since_before(self, request_uuids: List[UUID], deadline: datetime) -> int:
+        # Left uncommitted, so callers can fail the matching transit details in the same transaction.
+        return self.session.query(DriverAssignment).where(
+            DriverAssignment.request_uuid.in_(request_uuids)
+        ).where(
+            DriverAssignment.status == AssignmentStatus.WAITING_FOR_DRIVER_ASSIGNMENT
+        ).where(
+            DriverAssignment.published_at < deadline
+        ).update({
+            DriverAssignment.status: AssignmentStatus.DRIVER_ASSIGNMENT_FAILED,
+            DriverAssignment.assigned_driver: None,
+            DriverAssignment.awaiting_drivers_responses: 0,
+        }, synchronize_session=False)
 
     def save(self, driver_assignment: DriverAssignment) -> Optional[DriverAssignment]:
         self.session.add(driver_assignment)
+        self.__save_involvements([driver_assignment])
+        flush_or_commit(self.session, driver_assignment)
+        return driver_assignment
+
+    def save_all(self, driver_assignments: List[DriverAssignment]) -> List[DriverAssignment]:
+        self.session.add_all(driver_assignments)
+        self.__save_involvements(driver_assignments)
+        flush_or_commit(self.session)
+        return driver_assignments
+
+    def backfill_involvements_from_json_columns(self) -> int:
+        # Assignments written before the involvement table keep their drivers in the JSON columns
+        # proposed_drivers and drivers_rejections, which create_all leaves in place on existing databases.
+        columns: Set[str] = {
+            column["name"] for column in inspect(self.session.get_bind()).get_columns("driverassignment")
+        }
+        if not {"proposed_drivers", "drivers_rejections"} <= columns:
+            return 0
+        involvements: List[Dict] = []
+        for assignment_id, proposed, rejected in self.session.execute(text(
+            "SELECT id, proposed_drivers, drivers_rejections FROM driverassignment"
+            " WHERE proposed_drivers IS NOT NULL OR drivers_rejections IS NOT NULL"
+        )):
+            for drivers, kind in (
+                (proposed, DriverAssignmentInvolvement.Kind.PROPOSED),
+                (rejected, DriverAssignmentInvolvement.Kind.REJECTED),
+            ):
+                involvements.extend(
+                    {"assignment_id": assignment_id, "driver_id": driver_id, "kind": kind.name}
+                    for driver_id in set(json.loads(drivers) if drivers else [])
+                )
+        if involvements:
+            self.session.execute(text(
+                "INSERT INTO driverassignmentinvolvement (assignment_id, driver_id, kind)"
+                " VALUES (:assignment_id, :driver_id, :kind)"
+                " ON CONFLICT (assignment_id, driver_id, kind) DO NOTHING"
+            ), involvements)
         self.session.commit()
-        self.session.refresh(driver_assignment)
+        return len(involvements)
+
+    def __save_involvements(self, driver_assignments: List[DriverAssignment]) -> None:
+        # Only proposals and rejections added since the aggregate was loaded are written, after a flush assigns ids.
+        self.session.flush()
+        involvements: List[Dict] = [
+            {"assignment_id": driver_assignment.id, "driver_id": driver_id, "kind": kind}
+            for driver_assignment in driver_assignments
+            for driver_id, kind in driver_assignment.unsaved_involvements()
+        ]
+        if involvements:
+            self.session.execute(DriverAssignmentInvolvement.__table__.insert(), involvements)
+        for driver_assignment in driver_assignments:
+            driver_assignment.involvements_saved()
+
+    def __with_involved_drivers(self, driver_assignment: Optional[DriverAssignment]) -> Optional[DriverAssignment]:
+        if driver_assignment is not None:
+            self.__with_all_involved_drivers([driver_assignment])
         return driver_assignment
+
+    def __with_all_involved_drivers(self, driver_assignments: List[DriverAssignment]) -> List[DriverAssignment]:
+        not_loaded: Dict[int, DriverAssignment] = {
+            driver_assignment.id: driver_assignment
+            for driver_assignment in driver_assignments
+            if not driver_assignment.involved_drivers_are_loaded()
+        }
+        if not not_loaded:
+            return driver_assignments
+        involved: Dict[int, Dict[DriverAssignmentInvolvement.Kind, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        for assignment_id, driver_id, kind in self.session.query(
+            DriverAssignmentInvolvement.assignment_id,
+            DriverAssignmentInvolvement.driver_id,
+            DriverAssignmentInvolvement.kind,
+        ).where(DriverAssignmentInvolvement.assignment_id.in_(list(not_loaded))):
+            involved[assignment_id][kind].add(driver_id)
+        for assignment_id, driver_assignment in not_loaded.items():
+            driver_assignment.involved_drivers_loaded(
+                involved[assignment_id][DriverAssignmentInvolvement.Kind.PROPOSED],
+                involved[assignment_id][DriverAssignmentInvolvement.Kind.REJECTED],
+            )
+        return driver_assignments
@@ -0,0 +1,53 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+class GreedyMatcher:
+    """Pairs rows with columns of a cost matrix, cheapest pair first, each row and column at most once.
+
+    Only the cheapest candidates of every row are sorted; rows that lose all of them to other rows
+    get another pass over the columns that are still free. Infinite costs are never matched.
+    """
+    CANDIDATES_PER_ROW: int = 20
+
+    def match(self, costs: np.ndarray) -> List[Tuple[int, int]]:
+        costs = np.asarray(costs, dtype=float)
+        rows, columns = costs.shape
+        free_rows: np.ndarray = np.arange(rows)
+        free_columns: np.ndarray = np.arange(columns)
+        matched: List[Tuple[int, int]] = []
+        while free_rows.size and free_columns.size:
+            pairs: List[Tuple[int, int]] = self.__match_nearest(costs[np.ix_(free_rows, free_columns)])
+            if not pairs:
+                break
+            matched.extend((int(free_rows[row]), int(free_columns[column])) for row, column in pairs)
+            free_rows = np.delete(free_rows, [row for row, _ in pairs])
+            free_columns = np.delete(free_columns, [column for _, column in pairs])
+        return matched
+
+    def __match_nearest(self, costs: np.ndarray) -> List[Tuple[int, int]]:
+        rows, columns = costs.shape
+        k: int = min(self.CANDIDATES_PER_ROW, columns)
+        if k < columns:
+            nearest: np.ndarray = np.argpartition(costs, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.broadcast_to(np.arange(columns), (rows, columns))
+        pair_costs: np.ndarray = np.take_along_axis(costs, nearest, axis=1).ravel()
+        pair_rows: np.ndarray = np.repeat(np.arange(rows), k)
+        pair_columns: np.ndarray = nearest.ravel()
+
+        finite: np.ndarray = np.isfinite(pair_costs)
+        pair_costs, pair_rows, pair_columns = pair_costs[finite], pair_rows[finite], pair_columns[finite]
+        order: np.ndarray = np.argsort(pair_costs, kind="stable")
+
+        row_taken: np.ndarray = np.zeros(rows, dtype=bool)
+        column_taken: np.ndarray = np.zeros(columns, dtype=bool)
+        pairs: List[Tuple[int, int]] = []
+        for row, column in zip(pair_rows[order].tolist(), pair_columns[order].tolist()):
+            if row_taken[row] or column_taken[column]:
+                continue
+            row_taken[row] = True
+            column_taken[column] = True
+            pairs.append((row, column))
+        return pairs
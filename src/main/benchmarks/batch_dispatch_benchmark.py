@@ -0,0 +1,82 @@
+"""Compares dispatching waiting transits one by one with the batch cost-matrix dispatch.
+
+Run from src/main:
+
+    python -m benchmarks.batch_dispatch_benchmark --requests 1000 --drivers 5000
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from assignment.greedy_matcher import GreedyMatcher
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.nearest_k_selector import NearestKSelector
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
+
+CENTER: Tuple[float, float] = (52.2297, 21.0122)
+MAX_DISTANCE_IN_KM: float = 19
+DRIVERS_PER_PROPOSAL: int = 20
+
+
+def points(size: int, generator: random.Random) -> List[Tuple[float, float]]:
+    return [
+        (CENTER[0] + generator.uniform(-0.17, 0.17), CENTER[1] + generator.uniform(-0.28, 0.28))
+        for _ in range(size)
+    ]
+
+
+def one_by_one(pickups: List[Tuple[float, float]], drivers: List[DriverPositionDTOV2]) -> Dict[int, List[int]]:
+    # Every transit ranks the whole fleet on its own and is proposed to its nearest drivers.
+    selector = NearestKSelector(DistanceCalculator())
+    return {
+        request: [
+            position.driver_id for position in selector.select(
+                drivers, latitude, longitude, DRIVERS_PER_PROPOSAL, lambda position: (position.latitude, position.longitude)
+            )
+        ]
+        for request, (latitude, longitude) in enumerate(pickups)
+    }
+
+
+def batch(pickups: List[Tuple[float, float]], drivers: List[DriverPositionDTOV2]) -> Dict[int, List[int]]:
+    costs = DistanceCalculator().calculate_by_geo_many(
+        np.array([[latitude] for latitude, _ in pickups]),
+        np.array([[longitude] for _, longitude in pickups]),
+        np.array([position.latitude for position in drivers]),
+        np.array([position.longitude for position in drivers]),
+    )
+    costs[costs > MAX_DISTANCE_IN_KM] = np.inf
+    return {request: [drivers[column].driver_id] for request, column in GreedyMatcher().match(costs)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--drivers", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    pickups = points(args.requests, generator)
+    drivers = [
+        DriverPositionDTOV2(driver_id=driver_id, latitude=latitude, longitude=longitude, seen_at=None)
+        for driver_id, (latitude, longitude) in enumerate(points(args.drivers, generator))
+    ]
+
+    print(f"{args.requests} waiting transits, {args.drivers} drivers")
+    for name, dispatch in (("one by one", one_by_one), ("batch", batch)):
+        started: float = time.perf_counter()
+        proposals = dispatch(pickups, drivers)
+        elapsed: float = time.perf_counter() - started
+        proposed_to = Counter(driver_id for driver_ids in proposals.values() for driver_id in driver_ids)
+        print(f"  {name:10s} {elapsed * 1000:9.1f}ms {args.requests / elapsed:9.0f} transits/s, "
+              f"{len(proposals)} transits with proposals, "
+              f"{sum(1 for count in proposed_to.values() if count > 1)} drivers proposed more than one transit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Compares completing transits with a commit per repository save and with one unit of work.
+
+Run from src/main against a scratch database (tables are created and dropped):
+
+    DATABASE_URI=sqlite:////tmp/complete_transit_benchmark.db python -m benchmarks.complete_transit_benchmark --transits 500
+
+Every completion replays what RideService._complete_transit writes, through the same repositories:
+the destination address, the transit, the driver marked as not occupied, the transit details, awarded
+miles and the invoice. Statements are counted on the engine, so commits and refreshes are included.
+"""
+import argparse
+import contextlib
+import logging
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, ContextManager, List, Tuple
+from uuid import UUID
+
+from injector import Injector
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel
+
+from common.base_entity import new_uuid
+from core.database import DatabaseModule
+from core.unit_of_work import UnitOfWork
+from crm.client import Client
+from driverfleet.driver import Driver
+from driverfleet.driver_service import DriverService
+from geolocation.address.address import Address
+from geolocation.address.address_repository import AddressRepositoryImp
+from geolocation.distance import Distance
+from invocing.invoice_generator import InvoiceGenerator
+from loyalty.awards_service import AwardsService
+from loyalty.awards_service_impl import AwardsServiceImpl
+from money import Money
+from pricing.tariff import Tariff
+from ride.details.transit_details import TransitDetails
+from ride.details.transit_details_facade import TransitDetailsFacade
+from ride.transit import Transit
+from ride.transit_repository import TransitRepositoryImp
+
+
+def configure(binder):
+    binder.bind(AwardsService, to=AwardsServiceImpl)
+
+
+class Completion:
+    address_repository: AddressRepositoryImp
+    transit_repository: TransitRepositoryImp
+    driver_service: DriverService
+    transit_details_facade: TransitDetailsFacade
+    awards_service: AwardsService
+    invoice_generator: InvoiceGenerator
+
+    def __init__(self, an_injector: Injector):
+        self.address_repository = an_injector.get(AddressRepositoryImp)
+        self.transit_repository = an_injector.get(TransitRepositoryImp)
+        self.driver_service = an_injector.get(DriverService)
+        self.transit_details_facade = an_injector.get(TransitDetailsFacade)
+        self.awards_service = an_injector.get(AwardsService)
+        self.invoice_generator = an_injector.get(InvoiceGenerator)
+
+    def complete(self, driver_id: int, client_id: int, request_uuid: UUID, destination: Address) -> None:
+        self.address_repository.save(destination)
+        transit: Transit = self.transit_repository.find_by_transit_request_uuid(request_uuid)
+        final_price: Money = transit.complete_ride_at(Distance.of_km(12))
+        self.transit_repository.save(transit)
+        self.driver_service.mark_not_occupied(driver_id)
+        self.transit_details_facade.transit_completed(request_uuid, datetime.now(), final_price, final_price)
+        self.awards_service.register_miles(client_id, transit.id)
+        self.invoice_generator.generate(final_price.to_int(), "Jan Kowalski")
+
+
+def transits_in_progress(completion: Completion, session: Session, transits: int) -> Tuple[int, int, List[UUID]]:
+    client = Client(name="Jan", last_name="Kowalski")
+    session.add(client)
+    driver: Driver = completion.driver_service.create_driver(
+        "FARME100165AB5EW", "Nowak", "Jan", Driver.Type.REGULAR, Driver.Status.ACTIVE, ""
+    )
+    completion.driver_service.mark_occupied(driver.id)
+    tariff: Tariff = Tariff.of_time(datetime(2021, 4, 19, 12, 12))
+    request_uuids: List[UUID] = []
+    for _ in range(transits):
+        request_uuid: UUID = new_uuid()
+        transit = Transit(tariff=tariff, transit_request_uuid=request_uuid)
+        session.add(transit)
+        session.flush()
+        session.add(TransitDetails(
+            request_id=request_uuid,
+            when=datetime.now(),
+            transit_id=transit.id,
+            client_id=client.id,
+            tariff=tariff,
+            distance=Distance.of_km(10),
+        ))
+        request_uuids.append(request_uuid)
+    session.commit()
+    return driver.id, client.id, request_uuids
+
+
+def measure(
+        name: str,
+        completion: Completion,
+        transaction: Callable[[], ContextManager],
+        session: Session,
+        transits: int,
+) -> None:
+    SQLModel.metadata.create_all(session.get_bind())
+    try:
+        driver_id, client_id, request_uuids = transits_in_progress(completion, session, transits)
+        statements: List[int] = [0]
+
+        def count(*_) -> None:
+            statements[0] += 1
+
+        engine = session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        latencies: List[float] = []
+        try:
+            for number, request_uuid in enumerate(request_uuids):
+                destination = Address(country="Polska", city="Warszawa", street=f"Ulica {number}", building_number=1)
+                started: float = time.perf_counter()
+                with transaction():
+                    completion.complete(driver_id, client_id, request_uuid, destination)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+    finally:
+        session.close()
+        SQLModel.metadata.drop_all(session.get_bind())
+
+    latencies.sort()
+    print(f"  {name:<22} {statements[0] / transits:6.1f} statements "
+          f"{statistics.mean(latencies) * 1000:8.2f}ms mean "
+          f"{latencies[len(latencies) // 2] * 1000:8.2f}ms p50 "
+          f"{latencies[int(len(latencies) * 0.99)] * 1000:8.2f}ms p99")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transits", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    an_injector = Injector([configure, DatabaseModule])
+    session: Session = an_injector.get(Session)
+    completion = Completion(an_injector)
+    unit_of_work: UnitOfWork = an_injector.get(UnitOfWork)
+
+    print(f"{args.transits} completions per run")
+    measure("commit per repository", completion, contextlib.nullcontext, session, args.transits)
+    measure("one unit of work", completion, unit_of_work.begin, session, args.transits)
+
+
+if __name__ == "__main__":
+    main()
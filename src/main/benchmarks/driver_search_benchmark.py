@@ -0,0 +1,213 @@
+"""Compares the kilometer-by-kilometer driver search with the single-shot one.
+
+Run from src/main:
+
+    python -m benchmarks.driver_search_benchmark --drivers 20000 --latency-ms 1
+
+Every call to the position repository, session service and driver service counts as one
+database round trip and costs the given latency.
+"""
+import argparse
+import math
+import random
+import time
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Set, Tuple
+
+from carfleet.car_class import CarClass
+from geolocation.distance import Distance
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.nearest_k_selector import NearestKSelector
+from tracking.driver_ping import DriverPing
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
+from tracking.driver_position_index import DriverPositionIndex
+from tracking.driver_tracking_service import DriverTrackingService
+
+CITY_CENTER: Tuple[float, float] = (52.2297, 21.0122)
+MAX_DISTANCE_TO_CHECK_IN_KM: int = 19
+PINGS_PER_DRIVER: int = 5
+
+
+class RoundTrips:
+    count: int
+    latency: float
+
+    def __init__(self, latency: float):
+        self.count = 0
+        self.latency = latency
+
+    def hit(self) -> None:
+        self.count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakePositionRepository:
+    def __init__(self, pings: List[DriverPing], round_trips: RoundTrips):
+        self.pings = pings
+        self.round_trips = round_trips
+
+    def find_all_pings_since(self, latitude_min, latitude_max, longitude_min, longitude_max, date) -> List[DriverPing]:
+        self.round_trips.hit()
+        return self.__pings_within(latitude_min, latitude_max, longitude_min, longitude_max, date)
+
+    def find_average_driver_position_since(self, latitude_min, latitude_max, longitude_min, longitude_max, date):
+        # Same semantics as the SQL aggregate: the box filter comes before the average.
+        self.round_trips.hit()
+        by_driver: Dict[int, List[DriverPing]] = {}
+        for ping in self.__pings_within(latitude_min, latitude_max, longitude_min, longitude_max, date):
+            by_driver.setdefault(ping.driver_id, []).append(ping)
+        return [
+            DriverPositionDTOV2(
+                driver_id=driver_id,
+                latitude=sum(ping.latitude for ping in pings) / len(pings),
+                longitude=sum(ping.longitude for ping in pings) / len(pings),
+                seen_at=max(ping.seen_at for ping in pings)
+            )
+            for driver_id, pings in by_driver.items()
+        ]
+
+    def __pings_within(self, latitude_min, latitude_max, longitude_min, longitude_max, date) -> List[DriverPing]:
+        return [
+            ping for ping in self.pings
+            if latitude_min <= ping.latitude <= latitude_max
+            and longitude_min <= ping.longitude <= longitude_max
+            and ping.seen_at >= date
+        ]
+
+
+class FakeDriverSessionService:
+    def __init__(self, logged_in: Set[int], round_trips: RoundTrips):
+        self.logged_in = logged_in
+        self.round_trips = round_trips
+
+    def find_currently_logged_driver_ids(self, drivers_ids: List[int], car_classes: List[CarClass]) -> List[int]:
+        self.round_trips.hit()
+        return [driver_id for driver_id in drivers_ids if driver_id in self.logged_in]
+
+
+class FakeDriverService:
+    def __init__(self, available: Set[int], round_trips: RoundTrips):
+        self.available = available
+        self.round_trips = round_trips
+
+    def find_available_driver_ids(self, ids: List[int]) -> Set[int]:
+        self.round_trips.hit()
+        return {driver_id for driver_id in ids if driver_id in self.available}
+
+
+class FakeGeocodingService:
+    pickup: Tuple[float, float] = CITY_CENTER
+
+    def geocode_address(self, address) -> List[float]:
+        return list(self.pickup)
+
+
+def synthetic_fleet(size: int, seed: int) -> Tuple[List[DriverPing], Set[int], Set[int]]:
+    # Drivers crowd the center and thin out towards the suburbs; each drives about a kilometer
+    # during the last few minutes, so some of them cross the edge of a searched box.
+    generator = random.Random(seed)
+    now: datetime = datetime.now()
+    pings: List[DriverPing] = []
+    for driver_id in range(1, size + 1):
+        distance_in_km: float = generator.expovariate(1 / 4)
+        bearing: float = generator.uniform(0, 2 * math.pi)
+        heading: float = generator.uniform(0, 2 * math.pi)
+        for step in range(PINGS_PER_DRIVER):
+            north_in_km: float = distance_in_km * math.cos(bearing) + step * 0.25 * math.cos(heading)
+            east_in_km: float = distance_in_km * math.sin(bearing) + step * 0.25 * math.sin(heading)
+            pings.append(DriverPing(
+                driver_id=driver_id,
+                latitude=CITY_CENTER[0] + north_in_km / 111.2,
+                longitude=CITY_CENTER[1] + east_in_km / (111.2 * math.cos(math.radians(CITY_CENTER[0]))),
+                seen_at=now - timedelta(minutes=PINGS_PER_DRIVER - step)
+            ))
+    logged_in: Set[int] = {driver_id for driver_id in range(1, size + 1) if generator.random() < 0.3}
+    available: Set[int] = {driver_id for driver_id in range(1, size + 1) if generator.random() < 0.8}
+    return pings, logged_in, available
+
+
+def pickups(count: int, seed: int) -> List[Tuple[float, float]]:
+    generator = random.Random(seed)
+    points: List[Tuple[float, float]] = []
+    for _ in range(count):
+        distance_in_km: float = generator.uniform(0, 25)
+        bearing: float = generator.uniform(0, 2 * math.pi)
+        points.append((
+            CITY_CENTER[0] + distance_in_km * math.cos(bearing) / 111.2,
+            CITY_CENTER[1] + distance_in_km * math.sin(bearing) / (111.2 * math.cos(math.radians(CITY_CENTER[0]))),
+        ))
+    return points
+
+
+def ring_by_ring(service: DriverTrackingService, address, car_classes: List[CarClass]) -> List[int]:
+    for distance_to_check in range(1, MAX_DISTANCE_TO_CHECK_IN_KM + 1):
+        found = service.find_active_drivers_nearby_by_address(address, Distance.of_km(distance_to_check), car_classes)
+        if found:
+            return [position.driver_id for position in found]
+    return []
+
+
+def single_shot(service: DriverTrackingService, address, car_classes: List[CarClass]) -> List[int]:
+    search = service.search_active_drivers_nearby_by_address(
+        address, Distance.of_km(MAX_DISTANCE_TO_CHECK_IN_KM), car_classes)
+    for distance_to_check in range(1, MAX_DISTANCE_TO_CHECK_IN_KM + 1):
+        found = search.within(Distance.of_km(distance_to_check))
+        if found:
+            return [position.driver_id for position in found]
+    return []
+
+
+def run(
+        strategy: Callable[[DriverTrackingService, object, List[CarClass]], List[int]],
+        fleet: Tuple[List[DriverPing], Set[int], Set[int]],
+        points: List[Tuple[float, float]],
+        latency: float,
+) -> Tuple[float, int, List[Set[int]]]:
+    pings, logged_in, available = fleet
+    round_trips = RoundTrips(latency)
+    geocoding_service = FakeGeocodingService()
+    service = DriverTrackingService(
+        position_repository=FakePositionRepository(pings, round_trips),
+        driver_service=FakeDriverService(available, round_trips),
+        travelled_distance_service=None,
+        driver_session_service=FakeDriverSessionService(logged_in, round_trips),
+        geocoding_service=geocoding_service,
+        nearest_k_selector=NearestKSelector(DistanceCalculator()),
+        driver_position_index=DriverPositionIndex(),
+        app_properties=SimpleNamespace(driver_position_index_enabled=False),
+        unit_of_work=None,
+    )
+    address = SimpleNamespace(to_address_entity=lambda: None)
+    results: List[Set[int]] = []
+    started: float = time.perf_counter()
+    for point in points:
+        geocoding_service.pickup = point
+        results.append(set(strategy(service, address, [CarClass.VAN])))
+    return time.perf_counter() - started, round_trips.count, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drivers", type=int, default=20000)
+    parser.add_argument("--pickups", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fleet = synthetic_fleet(args.drivers, args.seed)
+    points = pickups(args.pickups, args.seed)
+    latency: float = args.latency_ms / 1000
+
+    print(f"{args.drivers} drivers, {args.pickups} pickups, {args.latency_ms}ms per round trip")
+    ring_time, ring_round_trips, ring_results = run(ring_by_ring, fleet, points, latency)
+    print(f"ring by ring: {ring_time:8.3f}s {ring_round_trips:6d} round trips")
+    single_time, single_round_trips, single_results = run(single_shot, fleet, points, latency)
+    print(f"single shot:  {single_time:8.3f}s {single_round_trips:6d} round trips")
+    different: int = sum(1 for ring, single in zip(ring_results, single_results) if ring != single)
+    print(f"pickups with a different set of proposed drivers: {different}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compares the comparator based sort of nearby drivers with the nearest-k selector.
+
+Run from src/main:
+
+    python -m benchmarks.nearest_k_benchmark --sizes 10000 100000
+"""
+import argparse
+import functools
+import math
+import random
+import time
+from typing import Callable, List, Tuple
+
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.nearest_k_selector import NearestKSelector
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
+
+PICKUP: Tuple[float, float] = (52.2297, 21.0122)
+K: int = 20
+
+
+def comparator_sort(positions: List[DriverPositionDTOV2], latitude: float, longitude: float) -> List[DriverPositionDTOV2]:
+    # The ranking find_active_drivers_nearby used before the selector.
+    def comparator(d1, d2):
+        d1 = math.sqrt(
+            math.pow(latitude - d1.latitude, 2) + math.pow(longitude - d1.longitude, 2)
+        )
+        d2 = math.sqrt(
+            math.pow(latitude - d2.latitude, 2) + math.pow(longitude - d2.longitude, 2)
+        )
+        if d1 < d2:
+            return -1
+        if d1 > d2:
+            return 1
+        return 0
+
+    return sorted(positions, key=functools.cmp_to_key(comparator))[:K]
+
+
+def geodesic_sort(positions: List[DriverPositionDTOV2], latitude: float, longitude: float) -> List[DriverPositionDTOV2]:
+    distance_calculator = DistanceCalculator()
+    return sorted(
+        positions,
+        key=lambda position: distance_calculator.calculate_by_geo(
+            latitude, longitude, position.latitude, position.longitude)
+    )[:K]
+
+
+def selector(positions: List[DriverPositionDTOV2], latitude: float, longitude: float) -> List[DriverPositionDTOV2]:
+    return NearestKSelector(DistanceCalculator()).select(
+        positions, latitude, longitude, K, lambda position: (position.latitude, position.longitude))
+
+
+def candidates(size: int, seed: int) -> List[DriverPositionDTOV2]:
+    generator = random.Random(seed)
+    return [
+        DriverPositionDTOV2(
+            driver_id=driver_id,
+            latitude=PICKUP[0] + generator.uniform(-0.17, 0.17),
+            longitude=PICKUP[1] + generator.uniform(-0.28, 0.28),
+            seen_at=None
+        )
+        for driver_id in range(size)
+    ]
+
+
+def measure(
+        ranking: Callable[[List[DriverPositionDTOV2], float, float], List[DriverPositionDTOV2]],
+        positions: List[DriverPositionDTOV2],
+        repeats: int,
+) -> Tuple[float, List[int]]:
+    best: float = math.inf
+    found: List[DriverPositionDTOV2] = []
+    for _ in range(repeats):
+        started: float = time.perf_counter()
+        found = ranking(positions, PICKUP[0], PICKUP[1])
+        best = min(best, time.perf_counter() - started)
+    return best, [position.driver_id for position in found]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        positions = candidates(size, args.seed)
+        comparator_time, by_degrees = measure(comparator_sort, positions, args.repeats)
+        geodesic_time, by_geodesic = measure(geodesic_sort, positions, args.repeats)
+        selector_time, selected = measure(selector, positions, args.repeats)
+        print(f"{size} candidates, top {K}")
+        print(f"  comparator sort: {comparator_time * 1000:9.2f}ms")
+        print(f"  geodesic sort:   {geodesic_time * 1000:9.2f}ms")
+        print(f"  nearest-k:       {selector_time * 1000:9.2f}ms")
+        print(f"  nearest-k equals geodesic sort: {selected == by_geodesic}, "
+              f"drivers ranked differently by the comparator: {len(set(by_degrees) - set(selected))}")
+
+
+if __name__ == "__main__":
+    main()
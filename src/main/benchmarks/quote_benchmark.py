@@ -0,0 +1,126 @@
+"""Compares pricing trips one by one with the batch quote pricing.
+
+Run from src/main:
+
+    python -m benchmarks.quote_benchmark --quotes 100000 --addresses 2000
+
+One by one, every trip gets its tariff from Tariffs.choose and its price from Tariff.calculate_cost,
+which is what requesting a transit does before anything is persisted. The batch goes through
+QuoteService.quote_all with an in-memory geocoder and routing engine.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+
+from config.app_properties import AppProperties
+from geolocation.address.address import Address
+from geolocation.address.address_dto import AddressDTO
+from geolocation.distance import Distance
+from geolocation.distance_calculator import DistanceCalculator
+from pricing.tariff_schedule import TariffSchedule
+from pricing.tariffs import Tariffs
+from ride.quote_dto import QuoteRequestDTO
+from ride.quote_service import QuoteService
+
+
+class InMemoryGeocodingService:
+    locations: Dict[str, List[float]]
+
+    def __init__(self):
+        self.locations = {}
+
+    def geocode_address(self, address: Address, store: bool = True) -> List[float]:
+        if address.hash is None:
+            address.gen_hash()
+        if address.hash not in self.locations:
+            generator = random.Random(address.hash)
+            self.locations[address.hash] = [52.2297 + generator.uniform(-0.17, 0.17), 21.0122 + generator.uniform(-0.28, 0.28)]
+        return self.locations[address.hash]
+
+
+class StraightLineRouteDistanceCalculator:
+    distance_calculator: DistanceCalculator
+
+    def __init__(self):
+        self.distance_calculator = DistanceCalculator()
+
+    def calculate_by_map(
+            self,
+            address_from: Address,
+            geo_from: List[float],
+            address_to: Address,
+            geo_to: List[float],
+            when: datetime,
+            store: bool = True,
+    ) -> float:
+        return 1.3 * self.distance_calculator.calculate_by_geo(geo_from[0], geo_from[1], geo_to[0], geo_to[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--addresses", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    addresses: List[AddressDTO] = [
+        AddressDTO(country="Polska", city="Warszawa", street=f"Ulica {number}", building_number=number)
+        for number in range(args.addresses)
+    ]
+    beginning = datetime(2022, 1, 1)
+    requests: List[QuoteRequestDTO] = [
+        QuoteRequestDTO(
+            address_from=generator.choice(addresses),
+            address_to=generator.choice(addresses),
+            when=beginning + timedelta(minutes=generator.uniform(0, 365 * 24 * 60)),
+        )
+        for _ in range(args.quotes)
+    ]
+    tariffs = Tariffs(TariffSchedule(SimpleNamespace(
+        tariff_holidays=AppProperties.__fields__["tariff_holidays"].default
+    )))
+    geocoding_service = InMemoryGeocodingService()
+    route_distance_calculator = StraightLineRouteDistanceCalculator()
+    quote_service = QuoteService(
+        geocoding_service=geocoding_service,
+        route_distance_calculator=route_distance_calculator,
+        tariffs=tariffs,
+        app_properties=SimpleNamespace(quote_batch_max_size=args.quotes),
+    )
+    # Geocoding is warmed up so that both runs measure pricing only.
+    quote_service.quote_all(requests[:1])
+    for address in addresses:
+        geocoding_service.geocode_address(address.to_address_entity())
+
+    print(f"{args.quotes} quotes between {args.addresses} addresses")
+    started: float = time.perf_counter()
+    one_by_one: List[int] = []
+    for request in requests:
+        address_from = request.address_from.to_address_entity()
+        address_to = request.address_to.to_address_entity()
+        distance: float = route_distance_calculator.calculate_by_map(
+            address_from,
+            geocoding_service.geocode_address(address_from),
+            address_to,
+            geocoding_service.geocode_address(address_to),
+            request.when,
+        )
+        one_by_one.append(tariffs.choose(request.when).calculate_cost(Distance.of_km(distance)).to_int())
+    elapsed: float = time.perf_counter() - started
+    print(f"  one by one {elapsed * 1000:9.1f}ms {args.quotes / elapsed:9.0f} quotes/s")
+
+    started = time.perf_counter()
+    quotes = quote_service.quote_all(requests)
+    elapsed = time.perf_counter() - started
+    print(f"  batch      {elapsed * 1000:9.1f}ms {args.quotes / elapsed:9.0f} quotes/s")
+
+    mismatches: int = sum(1 for price, quote in zip(one_by_one, quotes) if price != int(quote.estimated_price))
+    print(f"  quotes priced differently: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Replays the route distance lookups of past transits against the route distance cache.
+
+Run from src/main:
+
+    python -m benchmarks.route_distance_cache_benchmark --transits 20000 --addresses 2000 --cache-size 1000
+    python -m benchmarks.route_distance_cache_benchmark --from-database
+
+Every transit asks for its route when it is requested and again when it is completed. The routing
+engine is a local stub that costs the given latency per call; transits are read from the TransitDetails
+table with --from-database and generated otherwise, with a few popular addresses taking most rides.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from common.metrics import Metrics
+from geolocation.address.address import Address
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.route_distance_cache import RouteDistanceCache
+from geolocation.route_distance_calculator import RouteDistanceCalculator
+
+CENTER: Tuple[float, float] = (52.2297, 21.0122)
+
+
+class StubRoutingEngine(DistanceCalculator):
+    calls: int
+    latency: float
+
+    def __init__(self, latency: float):
+        self.calls = 0
+        self.latency = latency
+
+    def calculate_by_map(
+            self, latitude_from: float, longitude_from: float, latitude_to: float, longitude_t: float) -> float:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        # Roads are roughly a third longer than the straight line.
+        return 1.3 * self.calculate_by_geo(latitude_from, longitude_from, latitude_to, longitude_t)
+
+
+class InMemoryRouteDistanceRepository:
+    distances: Dict[Tuple[str, str, int], float]
+
+    def __init__(self):
+        self.distances = {}
+
+    def find_distance(self, from_hash: str, to_hash: str, time_bucket: int) -> Optional[float]:
+        return self.distances.get((from_hash, to_hash, time_bucket))
+
+    def save(self, from_hash: str, to_hash: str, time_bucket: int, distance: float, calculated_at: datetime) -> None:
+        self.distances[(from_hash, to_hash, time_bucket)] = distance
+
+
+def generated_transits(transits: int, addresses: int, generator: random.Random) -> List[SimpleNamespace]:
+    pool: List[Address] = []
+    for number in range(addresses):
+        address = Address(country="Polska", city="Warszawa", street=f"Ulica {number}", building_number=number)
+        address.gen_hash()
+        pool.append(address)
+    weights: List[float] = [1 / (rank + 1) for rank in range(addresses)]
+    beginning = datetime(2022, 1, 3)
+    replayed: List[SimpleNamespace] = []
+    for _ in range(transits):
+        address_from, address_to = generator.choices(pool, weights, k=2)
+        date_time: datetime = beginning + timedelta(minutes=generator.uniform(0, 7 * 24 * 60))
+        replayed.append(SimpleNamespace(
+            address_from=address_from,
+            address_to=address_to,
+            date_time=date_time,
+            complete_at=date_time + timedelta(minutes=generator.uniform(5, 45)),
+        ))
+    return replayed
+
+
+def stored_transits() -> List[SimpleNamespace]:
+    from injector import Injector
+    from sqlmodel import Session
+    from core.database import DatabaseModule
+    from ride.details.transit_details import TransitDetails
+
+    return [
+        SimpleNamespace(
+            address_from=details.address_from,
+            address_to=details.address_to,
+            date_time=details.date_time or details.published_at,
+            complete_at=details.complete_at,
+        )
+        for details in Injector([DatabaseModule]).get(Session).query(TransitDetails).all()
+        if details.address_from is not None and details.address_to is not None and details.date_time is not None
+    ]
+
+
+def coordinates(address: Address) -> List[float]:
+    # Stands in for the geocoder: a fixed point around the city center per address.
+    generator = random.Random(address.hash)
+    return [CENTER[0] + generator.uniform(-0.17, 0.17), CENTER[1] + generator.uniform(-0.28, 0.28)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transits", type=int, default=20000)
+    parser.add_argument("--addresses", type=int, default=2000)
+    parser.add_argument("--cache-size", type=int, default=1000)
+    parser.add_argument("--bucket-minutes", type=int, default=60)
+    parser.add_argument("--latency-ms", type=float, default=1)
+    parser.add_argument("--from-database", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    transits: List[SimpleNamespace] = stored_transits() if args.from_database else generated_transits(
+        args.transits, args.addresses, random.Random(args.seed))
+    lookups: List[Tuple[Address, Address, datetime]] = sorted(
+        [
+            (transit.address_from, transit.address_to, moment)
+            for transit in transits
+            for moment in (transit.date_time, transit.complete_at)
+            if moment is not None
+        ],
+        key=lambda lookup: lookup[2]
+    )
+    if not lookups:
+        print("no transits to replay")
+        return
+
+    metrics = Metrics()
+    routing_engine = StubRoutingEngine(args.latency_ms / 1000)
+    properties = SimpleNamespace(
+        route_distance_cache_size=args.cache_size,
+        route_distance_time_bucket_in_minutes=args.bucket_minutes,
+    )
+    calculator = RouteDistanceCalculator(
+        distance_calculator=routing_engine,
+        route_distance_repository=InMemoryRouteDistanceRepository(),
+        route_distance_cache=RouteDistanceCache(properties, metrics),
+        app_properties=properties,
+        metrics=metrics,
+    )
+
+    started: float = time.perf_counter()
+    for address_from, address_to, moment in lookups:
+        calculator.calculate_by_map(address_from, coordinates(address_from), address_to, coordinates(address_to), moment)
+    elapsed: float = time.perf_counter() - started
+
+    hits: float = metrics.get("route_distance_cache.hits")
+    stored_hits: float = metrics.get("route_distance_cache.stored_hits")
+    print(f"{len(transits)} transits, {len(lookups)} lookups, cache of {args.cache_size}, "
+          f"{args.bucket_minutes} minute buckets, {args.latency_ms}ms per routing call")
+    print(f"  in-process hits: {hits / len(lookups):7.1%}")
+    print(f"  table hits:      {stored_hits / len(lookups):7.1%}")
+    print(f"  routing calls:   {routing_engine.calls:7d} ({routing_engine.calls / len(lookups):.1%})")
+    print(f"  evictions:       {metrics.get('route_distance_cache.evictions'):7.0f}")
+    print(f"  elapsed:         {elapsed:7.3f}s, without the cache about "
+          f"{elapsed + (len(lookups) - routing_engine.calls) * args.latency_ms / 1000:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,15 @@ import uvicorn
 from fastapi_injector import attach_injector
 from injector import Injector
 from fastapi import FastAPI
+from fastapi_utils.tasks import repeat_every
 
-from core.database import create_db_and_tables, DatabaseModule
+from common.application_event_publisher import ApplicationEventPublisher
+from common.metrics_controller import metrics_router
+from common.outbox.outbox_event_publisher import OutboxEventPublisher
+from common.outbox.outbox_worker import OutboxWorker
+from config.app_properties import AppProperties
+from core.database import create_db_and_tables, DatabaseModule, own_session
+from core.identity_map import RequestScopeMiddleware
 from party.infra.party_relationship_repository_impl import PartyRelationshipRepositoryImpl
 from party.infra.party_repository_impl import PartyRepositoryImpl
 from party.model.party.party_relationship_repository import PartyRelationshipRepository
@@ -14,13 +21,24 @@ from loyalty.awards_account_controller import awards_account_router
 from carfleet.car_type_controller import car_type_router
 from crm.claims.claim_controller import claim_router
 from crm.client_controller import client_router
+from crm.notification.driver_notification_dispatcher import DriverNotificationDispatcher
+from crm.notification.driver_notification_transport import DriverNotificationTransport, LoggingDriverNotificationTransport
 from agreements.contract_controller import contract_router
 from driverfleet.driver_controller import driver_router
 from driverfleet.driverreport.driver_report_controller import driver_report_router
+from driverfleet.driverreport.travelleddistance.travelled_distance_service import TravelledDistanceService
+from geolocation.caching_geocoding_service import CachingGeocodingService
+from geolocation.geocoding_service import GeocodingService
+from tracking.driver_position_retention_service import DriverPositionRetentionService
 from tracking.driver_session_controller import driver_session_router
+from tracking.driver_session_service import DriverSessionService
 from tracking.driver_tracking_controller import driver_tracking_router
 from crm.transitanalyzer.transit_analyzer_controller import transit_analyzer_router
+from ride.expired_driver_assignment_sweeper import ExpiredDriverAssignmentSweeper
+from ride.quote_controller import quote_router
+from ride.ride_service import RideService
 from ride.transit_controller import transit_router
+from ride.transit_view_consistency_checker import TransitViewConsistencyChecker
 
 from fastapi_events.middleware import EventHandlerASGIMiddleware
 from fastapi_events.handlers.local import local_handler
@@ -30,6 +48,9 @@ def configure(binder):
     binder.bind(AwardsService, to=AwardsServiceImpl)
     binder.bind(PartyRepository, to=PartyRepositoryImpl)
     binder.bind(PartyRelationshipRepository, to=PartyRelationshipRepositoryImpl)
+    binder.bind(DriverNotificationTransport, to=LoggingDriverNotificationTransport)
+    binder.bind(GeocodingService, to=CachingGeocodingService)
+    binder.bind(ApplicationEventPublisher, to=OutboxEventPublisher)
 
 
 class CabsApplication:
@@ -38,6 +59,10 @@ class CabsApplication:
     def __init__(self):
         a_injector = Injector([configure, DatabaseModule])
         self.app = FastAPI()
+        self.app.add_middleware(
+            RequestScopeMiddleware,
+            query_count_header=a_injector.get(AppProperties).query_count_header_enabled,
+        )
         self.app.add_middleware(EventHandlerASGIMiddleware, handlers=[local_handler])
         self.app.include_router(awards_account_router)
         self.app.include_router(car_type_router)
@@ -50,12 +75,70 @@ class CabsApplication:
         self.app.include_router(driver_tracking_router)
         self.app.include_router(transit_analyzer_router)
         self.app.include_router(transit_router)
+        self.app.include_router(quote_router)
+        self.app.include_router(metrics_router)
         self.app.state.injector = a_injector
         attach_injector(self.app, a_injector)
 
         @self.app.on_event("startup")
         def on_startup():
             create_db_and_tables()
+            a_injector.get(DriverSessionService).load_logged_in_sessions()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).travelled_distance_flush_interval_in_seconds, wait_first=True)
+        def flush_travelled_distance():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(TravelledDistanceService).flush()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).driver_position_retention_interval_in_seconds, wait_first=True)
+        def apply_driver_position_retention():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(DriverPositionRetentionService).apply_retention()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).driver_assignment_sweep_interval_in_seconds, wait_first=True)
+        def sweep_expired_driver_assignments():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(ExpiredDriverAssignmentSweeper).sweep()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).geocoding_backfill_interval_in_seconds, wait_first=True)
+        def geocode_unresolved_addresses():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(CachingGeocodingService).geocode_unresolved()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).outbox_drain_interval_in_seconds, wait_first=True)
+        def deliver_outbox_messages():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(OutboxWorker).drain()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).outbox_retention_interval_in_seconds, wait_first=True)
+        def purge_delivered_outbox_messages():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(OutboxWorker).purge_delivered()
+
+        @self.app.on_event("startup")
+        @repeat_every(seconds=a_injector.get(AppProperties).transit_view_check_interval_in_seconds, wait_first=True)
+        def check_transit_views():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(TransitViewConsistencyChecker).check()
+
+        if a_injector.get(AppProperties).batch_dispatch_enabled:
+            @self.app.on_event("startup")
+            @repeat_every(seconds=a_injector.get(AppProperties).batch_dispatch_interval_in_seconds, wait_first=True)
+            def find_drivers_for_waiting_transits():
+                with own_session(a_injector) as job_injector:
+                    job_injector.get(RideService).find_drivers_for_waiting_transits()
+
+        @self.app.on_event("shutdown")
+        def on_shutdown():
+            with own_session(a_injector) as job_injector:
+                job_injector.get(TravelledDistanceService).flush()
+            a_injector.get(DriverNotificationDispatcher).wait_until_delivered(timeout=5)
 
     @classmethod
     def create_app(cls) -> FastAPI:
@@ -0,0 +1,59 @@
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from injector import inject, singleton
+
+from carfleet.car_class import CarClass
+from common.metrics import Metrics
+from config.app_properties import AppProperties
+from core.process_local_state import register_process_local_state
+
+
+@singleton
+class ActiveCarClassesCache:
+    """Active car classes as last read from the database.
+
+    Every activation, deactivation or removal in this process bumps the version and drops the cached set.
+    Changes made by other processes are picked up once the set is older than the TTL.
+    """
+    metrics: Metrics
+    app_properties: AppProperties
+
+    __lock: threading.Lock
+    __version: int
+    __cached: Optional[Tuple[int, float, List[CarClass]]]
+
+    @inject
+    def __init__(self, metrics: Metrics, app_properties: AppProperties):
+        self.metrics = metrics
+        self.app_properties = app_properties
+        self.__lock = threading.Lock()
+        self.__version = 0
+        self.__cached = None
+        register_process_local_state(self)
+
+    def get(self, loader: Callable[[], List[CarClass]]) -> List[CarClass]:
+        with self.__lock:
+            version: int = self.__version
+            cached: Optional[Tuple[int, float, List[CarClass]]] = self.__cached
+        if cached is not None:
+            cached_version, loaded_at, car_classes = cached
+            if cached_version == version and time.monotonic() - loaded_at < self.app_properties.active_car_classes_cache_ttl_in_seconds:
+                self.metrics.increment("active_car_classes_cache.hits")
+                return list(car_classes)
+        self.metrics.increment("active_car_classes_cache.misses")
+        car_classes = list(loader())
+        with self.__lock:
+            # A set read while it was being invalidated is handed out once but never cached.
+            if self.__version == version:
+                self.__cached = (version, time.monotonic(), car_classes)
+        return list(car_classes)
+
+    def invalidate(self) -> None:
+        with self.__lock:
+            self.__version += 1
+            self.__cached = None
+
+    def clear(self) -> None:
+        self.invalidate()
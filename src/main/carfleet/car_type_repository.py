@@ -8,6 +8,7 @@ from carfleet.car_type import CarType
 from sqlmodel import Session
 
 from carfleet.car_type_active_counter import CarTypeActiveCounter
+from core.unit_of_work import flush_or_commit
 
 
 class CarTypeActiveCounterRepositoryImp:
@@ -37,8 +38,7 @@ class CarTypeActiveCounterRepositoryImp:
 
     def save(self, car_type_active_counter: CarTypeActiveCounter) -> Optional[CarTypeActiveCounter]:
         self.session.add(car_type_active_counter)
-        self.session.commit()
-        self.session.refresh(car_type_active_counter)
+        flush_or_commit(self.session, car_type_active_counter)
         return car_type_active_counter
 
 
@@ -58,8 +58,7 @@ class CarTypeRepositoryImp:
     def save(self, car_type: CarType) -> Optional[CarType]:
         self.car_type_active_counter_repository.save(CarTypeActiveCounter(car_class=car_type.car_class))
         self.session.add(car_type)
-        self.session.commit()
-        self.session.refresh(car_type)
+        flush_or_commit(self.session, car_type)
         return car_type
 
     def find_by_car_class(self, car_class: CarClass) -> Optional[CarType]:
@@ -83,7 +82,7 @@ class CarTypeRepositoryImp:
 
     def delete(self, car_type) -> None:
         self.session.delete(car_type)
-        self.session.commit()
+        flush_or_commit(self.session)
 
     def find_by_status(self, status: CarType.Status) -> List[CarType]:
         return self.session.query(CarType).where(CarType.status == status).all()
@@ -2,6 +2,7 @@ from typing import List
 
 from injector import inject
 
+from carfleet.active_car_classes_cache import ActiveCarClassesCache
 from carfleet.car_class import CarClass
 from config.app_properties import AppProperties
 from carfleet.car_type_dto import CarTypeDTO
@@ -12,15 +13,18 @@ from carfleet.car_type_repository import CarTypeRepositoryImp
 class CarTypeService:
     car_type_repository: CarTypeRepositoryImp
     app_properties: AppProperties
+    active_car_classes_cache: ActiveCarClassesCache
 
     @inject
     def __init__(
             self,
             car_type_repository: CarTypeRepositoryImp,
-            app_properties: AppProperties
+            app_properties: AppProperties,
+            active_car_classes_cache: ActiveCarClassesCache,
      ):
         self.car_type_repository = car_type_repository
         self.app_properties = app_properties
+        self.active_car_classes_cache = active_car_classes_cache
 
     # @Transactional
     def load(self, _id: int) -> CarType:
@@ -55,11 +59,13 @@ class CarTypeService:
     def activate(self, _id: int) -> None:
         car_type = self.load(_id)
         car_type.activate()
+        self.active_car_classes_cache.invalidate()
 
     # @Transactional
     def deactivate(self, _id: int) -> None:
         car_type = self.load(_id)
         car_type.deactivate()
+        self.active_car_classes_cache.invalidate()
 
     # @Transactional
     def register_car(self, car_class: CarClass) -> None:
@@ -81,10 +87,10 @@ class CarTypeService:
 
     # @Transactional
     def find_active_car_classes(self) -> List[CarClass]:
-        return list(map(
+        return self.active_car_classes_cache.get(lambda: list(map(
             lambda car_type: car_type.car_class,
             self.car_type_repository.find_by_status(CarType.Status.ACTIVE),
-        ))
+        )))
 
     def __get_min_number_of_cars(self, car_class: CarClass) -> int:
         if car_class == CarClass.ECO:
@@ -97,6 +103,7 @@ class CarTypeService:
         car_type = self.car_type_repository.find_by_car_class(car_class)
         if car_type is not None:
             self.car_type_repository.delete(car_type)
+            self.active_car_classes_cache.invalidate()
 
     def __find_by_car_class(self, car_class: CarClass) -> CarType:
         by_car_class = self.car_type_repository.find_by_car_class(car_class)
@@ -0,0 +1,51 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from injector import singleton
+
+
+@singleton
+class Metrics:
+    """Process-wide counters and timings, exposed as a flat name -> value map on /metrics."""
+    __lock: threading.Lock
+    __values: Dict[str, float]
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__values = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self.__lock:
+            self.__values[name] = self.__values.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        with self.__lock:
+            self.__values[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self.__lock:
+            self.__values[f"{name}.count"] = self.__values.get(f"{name}.count", 0) + 1
+            self.__values[f"{name}.sum"] = self.__values.get(f"{name}.sum", 0) + seconds
+            self.__values[f"{name}.max"] = max(self.__values.get(f"{name}.max", 0), seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def get(self, name: str) -> float:
+        with self.__lock:
+            return self.__values.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self.__lock:
+            return dict(sorted(self.__values.items()))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__values = {}
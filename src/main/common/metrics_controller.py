@@ -0,0 +1,18 @@
+from typing import Dict
+
+from fastapi_injector import Injected
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+
+from common.metrics import Metrics
+
+metrics_router = InferringRouter(tags=["MetricsController"])
+
+
+@cbv(metrics_router)
+class MetricsController:
+    metrics: Metrics = Injected(Metrics)
+
+    @metrics_router.get("/metrics")
+    def get_metrics(self) -> Dict[str, float]:
+        return self.metrics.snapshot()
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any
+
+from injector import inject
+
+from common.application_event_publisher import ApplicationEventPublisher
+from common.outbox.outbox_message import OutboxMessage
+from common.outbox.outbox_repository import OutboxRepository
+
+
+class OutboxEventPublisher(ApplicationEventPublisher):
+    """Writes events to the outbox in the publisher's transaction; OutboxWorker delivers them after it commits."""
+    outbox_repository: OutboxRepository
+
+    @inject
+    def __init__(self, outbox_repository: OutboxRepository):
+        self.outbox_repository = outbox_repository
+
+    def publish_event_object(self, event: Any) -> None:
+        self.outbox_repository.save(OutboxMessage.of(event, datetime.now()))
@@ -0,0 +1,45 @@
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Type, get_type_hints
+
+OutboxHandler = Callable[[List[Any]], None]
+
+
+class OutboxHandlers:
+    """Handlers of events delivered from the outbox, registered per event class.
+
+    A handler gets every due event of its class from one batch at once. Delivery is at least once,
+    so a handler may see an event again after a failure and has to be idempotent.
+    """
+    __event_types: Dict[str, type]
+    __handlers: Dict[str, List[OutboxHandler]]
+
+    def __init__(self):
+        self.__event_types = {}
+        self.__handlers = {}
+
+    def register(self, event_type: Type) -> Callable[[OutboxHandler], OutboxHandler]:
+        def decorator(handler: OutboxHandler) -> OutboxHandler:
+            self.__event_types[event_type.__name__] = event_type
+            self.__handlers.setdefault(event_type.__name__, []).append(handler)
+            return handler
+        return decorator
+
+    def handles(self, event_type: str) -> bool:
+        return bool(self.__handlers.get(event_type))
+
+    def deliver(self, event_type: str, payloads: List[str]) -> None:
+        events: List[Any] = [self.__decode(self.__event_types[event_type], payload) for payload in payloads]
+        for handler in self.__handlers[event_type]:
+            handler(events)
+
+    @staticmethod
+    def __decode(event_type: type, payload: str) -> Any:
+        hints: Dict[str, Any] = get_type_hints(event_type.__init__)
+        return event_type(**{
+            name: datetime.fromisoformat(value) if hints.get(name) is datetime and value is not None else value
+            for name, value in json.loads(payload).items()
+        })
+
+
+outbox_handlers = OutboxHandlers()
@@ -0,0 +1,42 @@
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Index
+from sqlmodel import Field
+
+from common.base_entity import BaseEntity
+
+
+class OutboxMessage(BaseEntity, table=True):
+    __table_args__ = (
+        Index('ix_outboxmessage_delivered_at_next_attempt_at', 'delivered_at', 'next_attempt_at'),
+        {'extend_existing': True},
+    )
+
+    event_type: str
+    payload: str
+    created_at: datetime
+    attempts: int = 0
+    next_attempt_at: datetime
+    delivered_at: Optional[datetime] = None
+    failed_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+    @classmethod
+    def of(cls, event: Any, now: datetime) -> 'OutboxMessage':
+        return cls(
+            event_type=type(event).__name__,
+            payload=json.dumps(vars(event), default=_encode),
+            created_at=now,
+            next_attempt_at=now,
+        )
+
+    def is_pending(self) -> bool:
+        return self.delivered_at is None and self.failed_at is None
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
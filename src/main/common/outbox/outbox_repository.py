@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+
+from injector import inject
+from sqlmodel import Session
+
+from common.outbox.outbox_message import OutboxMessage
+from core.unit_of_work import flush_or_commit
+
+
+class OutboxRepository:
+    session: Session
+
+    @inject
+    def __init__(self, session: Session):
+        self.session = session
+
+    def save(self, message: OutboxMessage) -> Optional[OutboxMessage]:
+        self.session.add(message)
+        flush_or_commit(self.session, message)
+        return message
+
+    def find_due(self, now: datetime, limit: int) -> List[OutboxMessage]:
+        return self.session.query(OutboxMessage).where(
+            OutboxMessage.delivered_at == None
+        ).where(
+            OutboxMessage.failed_at == None
+        ).where(
+            OutboxMessage.next_attempt_at <= now
+        ).order_by(OutboxMessage.id).limit(limit).all()
+
+    def count_pending(self) -> int:
+        return self.session.query(OutboxMessage).where(
+            OutboxMessage.delivered_at == None
+        ).where(
+            OutboxMessage.failed_at == None
+        ).count()
+
+    def delete_delivered_before(self, moment: datetime) -> int:
+        deleted: int = self.session.query(OutboxMessage).where(
+            OutboxMessage.delivered_at < moment
+        ).delete(synchronize_session=False)
+        flush_or_commit(self.session)
+        return deleted
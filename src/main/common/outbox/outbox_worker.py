@@ -0,0 +1,99 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from injector import inject
+from sqlmodel import Session
+
+from common.metrics import Metrics
+from common.outbox.outbox_handlers import OutboxHandlers, outbox_handlers
+from common.outbox.outbox_message import OutboxMessage
+from common.outbox.outbox_repository import OutboxRepository
+from config.app_properties import AppProperties
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    """Delivers committed outbox messages to their handlers, one batch per event type at a time.
+
+    A message is marked as delivered only after its handlers return, so a crash in between delivers it
+    again. A failed batch is retried with an exponentially growing delay until the attempts run out.
+    Delivered messages are kept for a few days and then purged; failed ones stay until someone looks at them.
+    Messages of an event type nobody handles are failed at once, so they are neither lost nor drained forever.
+    """
+    session: Session
+    outbox_repository: OutboxRepository
+    app_properties: AppProperties
+    metrics: Metrics
+    handlers: OutboxHandlers
+
+    @inject
+    def __init__(
+        self,
+        session: Session,
+        outbox_repository: OutboxRepository,
+        app_properties: AppProperties,
+        metrics: Metrics,
+    ):
+        self.session = session
+        self.outbox_repository = outbox_repository
+        self.app_properties = app_properties
+        self.metrics = metrics
+        self.handlers = outbox_handlers
+
+    def drain(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.now()
+        delivered: int = 0
+        while True:
+            due: List[OutboxMessage] = self.outbox_repository.find_due(now, self.app_properties.outbox_batch_size)
+            by_event_type: Dict[str, List[OutboxMessage]] = {}
+            for message in due:
+                by_event_type.setdefault(message.event_type, []).append(message)
+            for event_type, messages in by_event_type.items():
+                delivered += self.__deliver(event_type, messages, now)
+            self.session.commit()
+            if len(due) < self.app_properties.outbox_batch_size:
+                self.metrics.set("outbox.pending", self.outbox_repository.count_pending())
+                return delivered
+
+    def purge_delivered(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.now()
+        purged: int = self.outbox_repository.delete_delivered_before(
+            now - timedelta(days=self.app_properties.outbox_retention_in_days)
+        )
+        self.metrics.increment("outbox.purged", purged)
+        return purged
+
+    def __deliver(self, event_type: str, messages: List[OutboxMessage], now: datetime) -> int:
+        if not self.handlers.handles(event_type):
+            logger.error("No handler for %s %s events, marking them as failed", len(messages), event_type)
+            for message in messages:
+                message.last_error = f"No handler for {event_type}"
+                message.failed_at = now
+            self.metrics.increment("outbox.failed", len(messages))
+            return 0
+        try:
+            with self.metrics.timer("outbox.delivery_latency"):
+                self.handlers.deliver(event_type, [message.payload for message in messages])
+        except Exception as error:
+            logger.exception("Delivering %s %s events failed", len(messages), event_type)
+            for message in messages:
+                self.__retry_later(message, error, now)
+            return 0
+        for message in messages:
+            message.delivered_at = now
+        self.metrics.increment("outbox.delivered", len(messages))
+        return len(messages)
+
+    def __retry_later(self, message: OutboxMessage, error: Exception, now: datetime) -> None:
+        message.attempts += 1
+        message.last_error = repr(error)
+        if message.attempts >= self.app_properties.outbox_max_attempts:
+            message.failed_at = now
+            self.metrics.increment("outbox.failed")
+            return
+        message.next_attempt_at = now + timedelta(
+            seconds=self.app_properties.outbox_retry_delay_in_seconds * 2 ** (message.attempts - 1)
+        )
+        self.metrics.increment("outbox.retried")
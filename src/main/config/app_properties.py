@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import List
 
 from pydantic import BaseSettings
 
@@ -9,6 +10,36 @@ class AppProperties(BaseSettings):
     min_no_of_cars_for_eco_class: int
     miles_expiration_in_days: int = 365
     default_miles_bonus: int = 10
+    driver_position_index_enabled: bool = True
+    driver_position_index_refresh_in_seconds: float = 1
+    travelled_distance_flush_interval_in_seconds: int = 60
+    driver_position_retention_in_days: int = 90
+    driver_position_track_resolution_in_seconds: int = 30
+    driver_position_archive_directory: str = 'archive/driverposition'
+    driver_position_retention_interval_in_seconds: int = 3600
+    driver_position_retention_batch_size: int = 500
+    driver_assignment_sweep_interval_in_seconds: int = 10
+    active_car_classes_cache_ttl_in_seconds: int = 30
+    driver_session_registry_ttl_in_seconds: int = 5
+    driver_availability_snapshot_ttl_in_seconds: int = 5
+    batch_dispatch_enabled: bool = False
+    batch_dispatch_interval_in_seconds: int = 5
+    geocoding_cache_size: int = 10000
+    geocoding_failure_ttl_in_seconds: int = 300
+    geocoding_backfill_interval_in_seconds: int = 600
+    route_distance_cache_size: int = 10000
+    route_distance_time_bucket_in_minutes: int = 60
+    quote_batch_max_size: int = 1000
+    tariff_holidays: List[str] = ["12-31", "01-01 00-06"]
+    query_count_header_enabled: bool = False
+    outbox_drain_interval_in_seconds: int = 1
+    outbox_batch_size: int = 100
+    outbox_max_attempts: int = 10
+    outbox_retry_delay_in_seconds: int = 5
+    outbox_retention_in_days: int = 7
+    outbox_retention_interval_in_seconds: int = 3600
+    transit_view_check_interval_in_seconds: int = 3600
+    transit_view_check_limit: int = 5000
     sqlite_url: str
 
     class Config:
@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from contracts.legacy.user import User
 from core.database import get_session
+from core.unit_of_work import flush_or_commit
 
 
 class UserRepository:
@@ -16,8 +17,7 @@ class UserRepository:
 
     def save(self, user: User) -> Optional[User]:
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        flush_or_commit(self.session, user)
         return user
 
     def get_one(self, user_id) -> Optional[User]:
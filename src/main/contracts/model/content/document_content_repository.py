@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from contracts.model.content.document_content import DocumentContent
 from core.database import get_session
+from core.unit_of_work import flush_or_commit
 
 
 class DocumentContentRepository:
@@ -16,8 +17,7 @@ class DocumentContentRepository:
 
     def save(self, document_content: DocumentContent) -> Optional[DocumentContent]:
         self.session.add(document_content)
-        self.session.commit()
-        self.session.refresh(document_content)
+        flush_or_commit(self.session, document_content)
         return document_content
 
     def get_one(self, document_header_id) -> Optional[DocumentContent]:
@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from contracts.model.document_header import DocumentHeader
 from core.database import get_session
+from core.unit_of_work import flush_or_commit
 
 
 class DocumentHeaderRepository:
@@ -16,8 +17,7 @@ class DocumentHeaderRepository:
 
     def save(self, document_header: DocumentHeader) -> Optional[DocumentHeader]:
         self.session.add(document_header)
-        self.session.commit()
-        self.session.refresh(document_header)
+        flush_or_commit(self.session, document_header)
         return document_header
 
     def get_one(self, document_header_id) -> Optional[DocumentHeader]:
@@ -11,6 +11,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.sql.expression import Select, SelectOfScalar
 
+from core.process_local_state import clear_process_local_states
+
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,7 @@ def create_db_and_tables():
 def drop_db_and_tables():
     Session(engine).close_all()
     SQLModel.metadata.drop_all(engine)
+    clear_process_local_states()
 
 def get_engine() -> Engine:
     return engine
@@ -67,5 +70,24 @@ class DatabaseModule(injector.Module):
 
     @injector.singleton
     @injector.provider
-    def session(self) -> Session:
-        return self._session_factory()
+    def session_factory(self) -> sessionmaker:
+        return self._session_factory
+
+    @injector.singleton
+    @injector.provider
+    def session(self, session_factory: sessionmaker) -> Session:
+        return session_factory()
+
+
+@contextmanager
+def own_session(parent: injector.Injector) -> Iterator[injector.Injector]:
+    """Child injector with a Session of its own, closed when the block ends.
+
+    Background jobs run on it so that their commits and rollbacks never touch the work of requests
+    sharing the application Session. Singletons still come from the parent.
+    """
+    session: Session = parent.get(sessionmaker)()
+    try:
+        yield parent.create_child_injector([lambda binder: binder.bind(Session, to=session)])
+    finally:
+        session.close()
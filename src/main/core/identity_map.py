@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+
+T = TypeVar('T')
+
+_MISSING = object()
+
+
+class RequestScope:
+    """What one request has loaded so far and how many statements it has sent to the database.
+
+    Mutable on purpose: the scope is opened by RequestScopeMiddleware, and copies of the context made
+    for the endpoint (its task, the threadpool running sync endpoints) must see the same instance.
+    """
+    entities: Dict[Tuple[type, str, Hashable], Any]
+    queries: int
+
+    def __init__(self):
+        self.entities = {}
+        self.queries = 0
+
+    def forget_all(self) -> None:
+        self.entities.clear()
+
+
+_current_scope: ContextVar[Optional[RequestScope]] = ContextVar("request_scope", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestScope]:
+    scope = RequestScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def current_scope() -> Optional[RequestScope]:
+    return _current_scope.get()
+
+
+def cached(entity_type: type, finder: str, key: Hashable, load: Callable[[], T]) -> T:
+    """Returns what `load` found for the key earlier in the request, loading it on first use.
+
+    Outside a request scope (scheduled jobs, scripts) it always loads.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return load()
+    entity_key = (entity_type, finder, key)
+    found = scope.entities.get(entity_key, _MISSING)
+    if found is _MISSING:
+        found = load()
+        scope.entities[entity_key] = found
+    return found
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_and_forget_on_write(conn, cursor, statement: str, parameters, context, executemany) -> None:
+    scope = _current_scope.get()
+    if scope is None:
+        return
+    scope.queries += 1
+    # Any write may change what the finders returned, whether it comes from a flush or a bulk statement.
+    if statement.lstrip()[:6].upper() != "SELECT":
+        scope.forget_all()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session) -> None:
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.forget_all()
+
+
+class RequestScopeMiddleware:
+    """Opens a request scope around every HTTP request and optionally reports its query count
+    in the X-Query-Count response header."""
+
+    def __init__(self, app, query_count_header: bool = False):
+        self.app = app
+        self.query_count_header = query_count_header
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_scope() as request:
+            async def send_with_query_count(message) -> None:
+                if message["type"] == "http.response.start" and self.query_count_header:
+                    MutableHeaders(scope=message).append("X-Query-Count", str(request.queries))
+                await send(message)
+
+            await self.app(scope, receive, send_with_query_count)
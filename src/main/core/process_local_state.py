@@ -0,0 +1,18 @@
+import weakref
+from typing import TypeVar
+
+T = TypeVar('T')
+
+# In-memory read models built from database rows (indexes, registries, caches).
+# They are cleared together with the schema so they never outlive the rows they were built from.
+_states = weakref.WeakSet()
+
+
+def register_process_local_state(state: T) -> T:
+    _states.add(state)
+    return state
+
+
+def clear_process_local_states() -> None:
+    for state in list(_states):
+        state.clear()
@@ -0,0 +1,93 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+from injector import inject
+from sqlmodel import Session
+
+
+class _OpenUnit:
+    session: Session
+    after_commit: List[Callable[[], None]]
+    after_rollback: List[Callable[[], None]]
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.after_commit = []
+        self.after_rollback = []
+
+
+_open_unit: ContextVar[Optional[_OpenUnit]] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """Runs a service call as one transaction.
+
+    While a unit is open, repositories only flush what they save and the outermost unit commits once
+    at the end, or rolls everything back when the call fails. Units opened inside an open unit of the same
+    session join it.
+
+    Requests share the application Session, so outermost units on one Session take turns: a unit opened
+    by another request waits until the open one commits instead of joining its transaction. Work done
+    outside a unit still commits on that Session, so anything that must not be committed halfway runs
+    in a unit, and background jobs use a Session of their own.
+    """
+    session: Session
+
+    @inject
+    def __init__(self, session: Session):
+        self.session = session
+
+    @contextmanager
+    def begin(self) -> Iterator[None]:
+        open_unit = _open_unit.get()
+        if open_unit is not None and open_unit.session is self.session:
+            yield
+            return
+        unit = _OpenUnit(self.session)
+        with _lock_of(self.session):
+            token = _open_unit.set(unit)
+            try:
+                yield
+                self.session.commit()
+            except BaseException:
+                self.session.rollback()
+                for callback in reversed(unit.after_rollback):
+                    callback()
+                raise
+            finally:
+                _open_unit.reset(token)
+        for callback in unit.after_commit:
+            callback()
+
+
+def _lock_of(session: Session) -> threading.Lock:
+    return session.info.setdefault("unit_of_work_lock", threading.Lock())
+
+
+def flush_or_commit(session: Session, *entities) -> None:
+    """Commits and refreshes the saved entities, or only flushes them when a unit of work is open on the session."""
+    open_unit = _open_unit.get()
+    if open_unit is not None and open_unit.session is session:
+        session.flush()
+        return
+    session.commit()
+    for entity in entities:
+        session.refresh(entity)
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Runs the callback once the open unit of work commits, or right away when none is open."""
+    unit = _open_unit.get()
+    if unit is None:
+        callback()
+    else:
+        unit.after_commit.append(callback)
+
+
+def after_rollback(callback: Callable[[], None]) -> None:
+    """Runs the callback if the open unit of work rolls back; without an open unit the work is already committed."""
+    unit = _open_unit.get()
+    if unit is not None:
+        unit.after_rollback.append(callback)
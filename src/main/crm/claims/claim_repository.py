@@ -5,6 +5,7 @@ from injector import inject
 from crm.claims.claim import Claim
 from sqlalchemy import func
 from sqlmodel import Session
+from core.unit_of_work import flush_or_commit
 
 
 class ClaimRepositoryImp:
@@ -20,8 +21,7 @@ class ClaimRepositoryImp:
 
     def save(self, claim: Claim) -> Optional[Claim]:
         self.session.add(claim)
-        self.session.commit()
-        self.session.refresh(claim)
+        flush_or_commit(self.session, claim)
         return claim
 
     def get_one(self, claim_id: int) -> Optional[Claim]:
@@ -4,6 +4,7 @@ from injector import inject
 from sqlmodel import Session
 
 from crm.claims.claims_resolver import ClaimsResolver
+from core.unit_of_work import flush_or_commit
 
 
 class ClaimsResolverRepositoryImp:
@@ -15,8 +16,7 @@ class ClaimsResolverRepositoryImp:
 
     def save(self, claims_resolver: ClaimsResolver) -> Optional[ClaimsResolver]:
         self.session.add(claims_resolver)
-        self.session.commit()
-        self.session.refresh(claims_resolver)
+        flush_or_commit(self.session, claims_resolver)
         return claims_resolver
 
     def find_by_client_id(self, client_id: int):
@@ -5,6 +5,7 @@ from injector import inject
 from crm.client import Client
 from fastapi import Depends
 from sqlmodel import Session, select
+from core.unit_of_work import flush_or_commit
 
 
 class ClientRepositoryImp:
@@ -19,6 +20,5 @@ class ClientRepositoryImp:
 
     def save(self, client: Client) -> Optional[Client]:
         self.session.add(client)
-        self.session.commit()
-        self.session.refresh(client)
+        flush_or_commit(self.session, client)
         return client
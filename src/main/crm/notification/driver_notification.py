@@ -0,0 +1,13 @@
+import enum
+from typing import Any, NamedTuple
+
+
+class DriverNotification(NamedTuple):
+    class Kind(enum.Enum):
+        POSSIBLE_TRANSIT = 1
+        CHANGED_TRANSIT_ADDRESS = 2
+        CANCELLED_TRANSIT = 3
+        DETAILS_ABOUT_CLAIM = 4
+
+    kind: Kind
+    subject: Any
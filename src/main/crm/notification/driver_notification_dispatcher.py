@@ -0,0 +1,79 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Set, Tuple
+
+from injector import inject, singleton
+
+from common.metrics import Metrics
+from crm.notification.driver_notification import DriverNotification
+from crm.notification.driver_notification_transport import DriverNotificationTransport
+
+logger = logging.getLogger(__name__)
+
+
+@singleton
+class DriverNotificationDispatcher:
+    """Delivers driver notifications on a small thread pool, so callers never wait on the transport.
+
+    A notification already queued for the same driver is not queued again. When too many are queued,
+    dispatching blocks until the transport catches up instead of piling up work without bound.
+    """
+    MAX_CONCURRENT_DELIVERIES: int = 8
+    MAX_QUEUED_DELIVERIES: int = 1000
+
+    transport: DriverNotificationTransport
+    metrics: Metrics
+
+    __executor: ThreadPoolExecutor
+    __capacity: threading.BoundedSemaphore
+    __lock: threading.Lock
+    __queued: Set[Tuple[int, DriverNotification]]
+    __in_flight: Set[Future]
+
+    @inject
+    def __init__(self, transport: DriverNotificationTransport, metrics: Metrics):
+        self.transport = transport
+        self.metrics = metrics
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_DELIVERIES,
+            thread_name_prefix="driver-notifications"
+        )
+        self.__capacity = threading.BoundedSemaphore(self.MAX_QUEUED_DELIVERIES)
+        self.__lock = threading.Lock()
+        self.__queued = set()
+        self.__in_flight = set()
+
+    def dispatch(self, driver_id: int, notification: DriverNotification) -> None:
+        key: Tuple[int, DriverNotification] = (driver_id, notification)
+        with self.__lock:
+            if key in self.__queued:
+                self.metrics.increment("driver_notifications.coalesced")
+                return
+            self.__queued.add(key)
+        self.__capacity.acquire()
+        future: Future = self.__executor.submit(self.__deliver, key)
+        with self.__lock:
+            self.__in_flight.add(future)
+        future.add_done_callback(self.__done)
+
+    def wait_until_delivered(self, timeout: Optional[float] = None) -> None:
+        with self.__lock:
+            in_flight: Set[Future] = set(self.__in_flight)
+        wait(in_flight, timeout=timeout)
+
+    def __deliver(self, key: Tuple[int, DriverNotification]) -> None:
+        with self.__lock:
+            self.__queued.discard(key)
+        try:
+            with self.metrics.timer("driver_notifications.delivery"):
+                self.transport.send(*key)
+        except Exception:
+            self.metrics.increment("driver_notifications.failed")
+            logger.exception("Could not notify driver %s about %s", *key)
+        finally:
+            self.__capacity.release()
+
+    def __done(self, future: Future) -> None:
+        with self.__lock:
+            self.__in_flight.discard(future)
@@ -1,33 +1,31 @@
 from uuid import UUID
 
-from ride import transit
+from injector import inject
 
+from core.unit_of_work import after_commit
+from crm.notification.driver_notification import DriverNotification
+from crm.notification.driver_notification_dispatcher import DriverNotificationDispatcher
 
-class DriverNotificationService:
-    def notify_about_possible_transit(self, driver_id: int, transit_id) -> None:
-        # ...
-        pass
 
-    def notify_about_changed_transit_address(self, driver_id: int, transit_id) -> None:
-        # ...
-        pass
+class DriverNotificationService:
+    """Notifies drivers once the open unit of work commits, so no driver hears about a change that rolls back."""
+    driver_notification_dispatcher: DriverNotificationDispatcher
 
-    def notify_about_cancelled_transit(self, driver_id: int, transit_id) -> None:
-        # ...
-        pass
+    @inject
+    def __init__(self, driver_notification_dispatcher: DriverNotificationDispatcher):
+        self.driver_notification_dispatcher = driver_notification_dispatcher
 
     def notify_about_possible_transit(self, driver_id: int, request_id: UUID) -> None:
-        # find transit and delegate to notify_about_possible_transit(int, int)
-        pass
+        self.__dispatch(driver_id, DriverNotification(DriverNotification.Kind.POSSIBLE_TRANSIT, request_id))
 
     def notify_about_changed_transit_address(self, driver_id: int, request_id: UUID) -> None:
-        # find transit and delegate to notify_about_changed_transit_address(int, int)
-        pass
+        self.__dispatch(driver_id, DriverNotification(DriverNotification.Kind.CHANGED_TRANSIT_ADDRESS, request_id))
 
     def notify_about_cancelled_transit(self, driver_id: int, request_id: UUID) -> None:
-        # find transit and delegate to notify_about_cancelled_transit(int, int)
-        pass
+        self.__dispatch(driver_id, DriverNotification(DriverNotification.Kind.CANCELLED_TRANSIT, request_id))
+
+    def ask_driver_for_details_about_claim(self, claim_no: str, driver_id: int) -> None:
+        self.__dispatch(driver_id, DriverNotification(DriverNotification.Kind.DETAILS_ABOUT_CLAIM, claim_no))
 
-    def ask_driver_for_details_about_claim(self, claim_no: str, transit_id) -> None:
-        # ...
-        pass
+    def __dispatch(self, driver_id: int, notification: DriverNotification) -> None:
+        after_commit(lambda: self.driver_notification_dispatcher.dispatch(driver_id, notification))
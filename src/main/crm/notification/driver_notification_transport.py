@@ -0,0 +1,18 @@
+import logging
+from abc import ABCMeta, abstractmethod
+
+from crm.notification.driver_notification import DriverNotification
+
+logger = logging.getLogger(__name__)
+
+
+class DriverNotificationTransport(metaclass=ABCMeta):
+    @abstractmethod
+    def send(self, driver_id: int, notification: DriverNotification) -> None:
+        ...
+
+
+class LoggingDriverNotificationTransport(DriverNotificationTransport):
+    # Stands in for the push gateway until one is integrated.
+    def send(self, driver_id: int, notification: DriverNotification) -> None:
+        logger.info("Notifying driver %s: %s %s", driver_id, notification.kind.name, notification.subject)
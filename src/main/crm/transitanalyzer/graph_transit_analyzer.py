@@ -1,13 +1,12 @@
 import logging
 import sys
 from datetime import datetime
-from typing import List, Tuple
+from typing import List
 
 from neo4j import GraphDatabase, Query
 
+from common.outbox.outbox_handlers import outbox_handlers
 from ride.events.transit_completed import TransitCompleted
-from fastapi_events.handlers.local import local_handler
-from fastapi_events.typing import Event
 
 
 class GraphTransitAnalyzer:
@@ -59,25 +58,43 @@ class GraphTransitAnalyzer:
                 f"started: datetime(\"{started.isoformat()}\"),"
                 f" completeAt: datetime(\"{complete_at.isoformat()}\") }}]->(to)")))
 
-    def handle(self, event: Tuple[str, TransitCompleted]):
-        event_name: str = event[0]
-        transit_completed: TransitCompleted = event[1]
-        self.add_transit_between_addresses(
-            transit_completed.client_id,
-            transit_completed.transit_id,
-            transit_completed.address_from_hash,
-            transit_completed.address_to_hash,
-            transit_completed.started,
-            transit_completed.complete_at
+    @staticmethod
+    def _add_transits(tx, transits: List[dict]):
+        # Merged by transit id, so a transit delivered again is not added twice.
+        tx.run(
+            "UNWIND $transits AS transit "
+            "MERGE (from:Address {hash: transit.address_from_hash}) "
+            "MERGE (to:Address {hash: transit.address_to_hash}) "
+            "MERGE (from)-[t:Transit {transitId: transit.transit_id}]->(to) "
+            "SET t.clientId = transit.client_id, "
+            "t.started = datetime(transit.started), "
+            "t.completeAt = datetime(transit.complete_at)",
+            transits=transits,
         )
 
+    def add_transits_between_addresses(self, transits: List[TransitCompleted]):
+        with self.graph_db.session() as session:
+            session.execute_write(self._add_transits, [
+                {
+                    "client_id": transit.client_id,
+                    "transit_id": transit.transit_id,
+                    "address_from_hash": int(transit.address_from_hash),
+                    "address_to_hash": int(transit.address_to_hash),
+                    "started": transit.started.isoformat() if transit.started else None,
+                    "complete_at": transit.complete_at.isoformat(),
+                }
+                for transit in transits
+            ])
+
     def on_close(self):
         if self.graph_db is not None:
             self.graph_db.close()
 
 
-@local_handler.register(event_name="add_transit_between_addresses")
-def handle_add_transit_between_addresses(event: Event):
+@outbox_handlers.register(TransitCompleted)
+def handle_add_transits_between_addresses(transits: List[TransitCompleted]):
     graph_transit_analyzer = GraphTransitAnalyzer()
-    graph_transit_analyzer.handle(event)
-    graph_transit_analyzer.on_close()
+    try:
+        graph_transit_analyzer.add_transits_between_addresses(transits)
+    finally:
+        graph_transit_analyzer.on_close()
@@ -5,6 +5,7 @@ from injector import inject
 from sqlmodel import Session
 
 from driverfleet.driver_attribute import DriverAttribute
+from core.unit_of_work import flush_or_commit
 
 
 class DriverAttributeRepositoryImp:
@@ -16,6 +17,5 @@ class DriverAttributeRepositoryImp:
 
     def save(self, driver_attribute: DriverAttribute) -> Optional[DriverAttribute]:
         self.session.add(driver_attribute)
-        self.session.commit()
-        self.session.refresh(driver_attribute)
+        flush_or_commit(self.session, driver_attribute)
         return driver_attribute
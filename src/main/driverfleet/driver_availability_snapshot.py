@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from injector import singleton
+
+from core.process_local_state import register_process_local_state
+from driverfleet.driver import Driver
+
+
+class DriverAvailability:
+    __slots__ = ("status", "occupied")
+
+    status: Driver.Status
+    occupied: bool
+
+    def __init__(self, status: Driver.Status, occupied: bool):
+        self.status = status
+        self.occupied = occupied
+
+    def is_available(self) -> bool:
+        return self.status == Driver.Status.ACTIVE and not self.occupied
+
+
+@singleton
+class DriverAvailabilitySnapshot:
+    """Status and occupation of drivers, the only columns dispatch looks at.
+
+    Drivers are added the first time they are asked about and kept current by the driver service once its
+    changes commit; changes made by other processes are picked up when the snapshot is rebuilt after its TTL.
+    Every local change bumps the version, so a rebuild read while a change was being made is not applied.
+    """
+    __lock: threading.RLock
+    __drivers: Dict[int, DriverAvailability]
+    __version: int
+    __rebuilt_at: float
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        self.__drivers = {}
+        self.__version = 0
+        self.__rebuilt_at = time.monotonic()
+        register_process_local_state(self)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__drivers = {}
+            self.__version += 1
+            self.__rebuilt_at = time.monotonic()
+
+    def is_older_than(self, seconds: float) -> bool:
+        return time.monotonic() - self.__rebuilt_at >= seconds
+
+    def version(self) -> int:
+        return self.__version
+
+    def driver_ids(self) -> List[int]:
+        with self.__lock:
+            return list(self.__drivers)
+
+    def rebuild(self, availabilities: Iterable[Tuple[int, Driver.Status, Optional[bool]]], version: int) -> None:
+        with self.__lock:
+            if version != self.__version:
+                return
+            self.__drivers = {
+                driver_id: DriverAvailability(status, bool(occupied)) for driver_id, status, occupied in availabilities
+            }
+            self.__rebuilt_at = time.monotonic()
+
+    def put(self, driver_id: int, status: Driver.Status, occupied: Optional[bool]) -> None:
+        with self.__lock:
+            self.__version += 1
+            self.__drivers[driver_id] = DriverAvailability(status, bool(occupied))
+
+    def put_all(self, availabilities: Iterable[Tuple[int, Driver.Status, Optional[bool]]]) -> None:
+        # Drivers read while missing; a change put meanwhile is newer than the read, so it is kept.
+        with self.__lock:
+            for driver_id, status, occupied in availabilities:
+                self.__drivers.setdefault(driver_id, DriverAvailability(status, bool(occupied)))
+
+    def missing(self, driver_ids: Iterable[int]) -> List[int]:
+        with self.__lock:
+            return [driver_id for driver_id in set(driver_ids) if driver_id not in self.__drivers]
+
+    def find_available(self, driver_ids: Iterable[int]) -> Set[int]:
+        with self.__lock:
+            return {
+                driver_id for driver_id in driver_ids
+                if driver_id in self.__drivers and self.__drivers[driver_id].is_available()
+            }
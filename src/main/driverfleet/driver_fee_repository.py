@@ -5,6 +5,7 @@ from injector import inject
 from sqlmodel import Session
 
 from driverfleet.driver_fee import DriverFee
+from core.unit_of_work import flush_or_commit
 
 
 class DriverFeeRepositoryImp:
@@ -19,6 +20,5 @@ class DriverFeeRepositoryImp:
 
     def save(self, driver_fee: DriverFee) -> Optional[DriverFee]:
         self.session.add(driver_fee)
-        self.session.commit()
-        self.session.refresh(driver_fee)
+        flush_or_commit(self.session, driver_fee)
         return driver_fee
@@ -1,9 +1,11 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from injector import inject
 
 from sqlmodel import Session
 
+from core.identity_map import cached
+from core.unit_of_work import flush_or_commit
 from driverfleet.driver import Driver
 
 
@@ -16,17 +18,23 @@ class DriverRepositoryImp:
 
     def save(self, driver: Driver) -> Optional[Driver]:
         self.session.add(driver)
-        self.session.commit()
-        self.session.refresh(driver)
+        flush_or_commit(self.session, driver)
         return driver
 
     def get_one(self, driver_id: int) -> Optional[Driver]:
-        statement = self.session.query(Driver).where(Driver.id == driver_id)
-        results = self.session.exec(statement)
-        return results.scalar_one_or_none()
+        def load() -> Optional[Driver]:
+            statement = self.session.query(Driver).where(Driver.id == driver_id)
+            results = self.session.exec(statement)
+            return results.scalar_one_or_none()
+        return cached(Driver, "id", driver_id, load)
 
     def find_all_by_id(self, ids: List[int]) -> List[Driver]:
-        return self.session.query(Driver).where(
+        return list(cached(Driver, "ids", frozenset(ids), lambda: self.session.query(Driver).where(
+            Driver.id.in_(ids)
+        ).all()))
+
+    def find_availabilities_by_id(self, ids: List[int]) -> List[Tuple[int, Driver.Status, Optional[bool]]]:
+        return self.session.query(Driver.id, Driver.status, Driver.is_occupied).where(
             Driver.id.in_(ids)
         ).all()
 
@@ -7,9 +7,12 @@ from typing import Dict, List, Set
 
 from injector import inject
 
+from config.app_properties import AppProperties
+from core.unit_of_work import after_commit
 from driverfleet.driver import Driver
 from driverfleet.driver_attribute import DriverAttribute
 from driverfleet.driver_attribute_name import DriverAttributeName
+from driverfleet.driver_availability_snapshot import DriverAvailabilitySnapshot
 from driverfleet.driver_dto import DriverDTO
 from driverfleet.driver_license import DriverLicense
 
@@ -34,6 +37,8 @@ class DriverService:
     driver_attribute_repository: DriverAttributeRepositoryImp
     transit_details_facade: TransitDetailsFacade
     driver_fee_service: DriverFeeService
+    driver_availability_snapshot: DriverAvailabilitySnapshot
+    app_properties: AppProperties
 
     @inject
     def __init__(
@@ -42,11 +47,15 @@ class DriverService:
             driver_attribute_repository: DriverAttributeRepositoryImp,
             transit_details_facade: TransitDetailsFacade,
             driver_fee_service: DriverFeeService,
+            driver_availability_snapshot: DriverAvailabilitySnapshot,
+            app_properties: AppProperties,
     ):
         self.driver_repository = driver_repository
         self.driver_attribute_repository = driver_attribute_repository
         self.transit_details_facade = transit_details_facade
         self.driver_fee_service = driver_fee_service
+        self.driver_availability_snapshot = driver_availability_snapshot
+        self.app_properties = app_properties
 
     def create_driver(
             self,
@@ -72,7 +81,10 @@ class DriverService:
                 driver.photo = photo
             else:
                 raise AttributeError("Illegal photo in base64")
-        return self.driver_repository.save(driver)
+        driver = self.driver_repository.save(driver)
+        driver_id, occupied = driver.id, driver.is_occupied
+        after_commit(lambda: self.driver_availability_snapshot.put(driver_id, status, occupied))
+        return driver
 
     def change_license_number(self, new_license: str, driver_id: int) -> None:
         driver = self.driver_repository.get_one(driver_id)
@@ -95,7 +107,9 @@ class DriverService:
             except AttributeError as exception:
                 raise ValueError(exception)
         driver.status = status
+        occupied = driver.is_occupied
         self.driver_repository.save(driver)
+        after_commit(lambda: self.driver_availability_snapshot.put(driver_id, status, occupied))
 
     def change_photo(self, driver_id: int, photo: str) -> None:
         driver = self.driver_repository.get_one(driver_id)
@@ -148,6 +162,23 @@ class DriverService:
             self.driver_repository.find_all_by_id(ids)
         ))
 
+    def find_available_driver_ids(self, ids: List[int]) -> Set[int]:
+        self.__reconcile_availability_snapshot()
+        missing: List[int] = self.driver_availability_snapshot.missing(ids)
+        if missing:
+            self.driver_availability_snapshot.put_all(self.driver_repository.find_availabilities_by_id(missing))
+        return self.driver_availability_snapshot.find_available(ids)
+
+    def __reconcile_availability_snapshot(self) -> None:
+        if self.driver_availability_snapshot.is_older_than(
+                self.app_properties.driver_availability_snapshot_ttl_in_seconds):
+            version: int = self.driver_availability_snapshot.version()
+            driver_ids: List[int] = self.driver_availability_snapshot.driver_ids()
+            self.driver_availability_snapshot.rebuild(
+                self.driver_repository.find_availabilities_by_id(driver_ids) if driver_ids else [],
+                version
+            )
+
     def add_attribute(self, driver_id: int, attr: DriverAttributeName, value: str) -> None:
         driver = self.driver_repository.get_one(driver_id)
         if driver is None:
@@ -160,7 +191,11 @@ class DriverService:
     def mark_occupied(self, driver_id: int) -> None:
         driver: Driver = self.driver_repository.get_one(driver_id)
         driver.is_occupied = True
+        status: Driver.Status = driver.status
+        after_commit(lambda: self.driver_availability_snapshot.put(driver_id, status, True))
 
     def mark_not_occupied(self, driver_id: int) -> None:
         driver: Driver = self.driver_repository.get_one(driver_id)
         driver.is_occupied = False
+        status: Driver.Status = driver.status
+        after_commit(lambda: self.driver_availability_snapshot.put(driver_id, status, False))
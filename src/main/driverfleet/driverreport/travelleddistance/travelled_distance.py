@@ -13,6 +13,11 @@ from common.base_entity import new_uuid
 from geolocation.distance import Distance
 
 
+def as_stored(moment: datetime) -> datetime:
+    # Slots and positions are stored by their wall-clock time without the zone, so they are looked up the same way.
+    return moment.replace(tzinfo=None)
+
+
 class TimeSlot(BaseModel):
     @classmethod
     @property
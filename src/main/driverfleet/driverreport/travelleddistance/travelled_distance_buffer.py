@@ -0,0 +1,153 @@
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from injector import singleton
+
+from core.process_local_state import register_process_local_state
+from driverfleet.driverreport.travelleddistance.travelled_distance import TimeSlot
+from geolocation.distance import Distance
+
+
+class BufferedTravelledDistance:
+    driver_id: int
+    time_slot: TimeSlot
+    last_latitude: float
+    last_longitude: float
+    distance: float
+    persisted_distance: float
+    stored: bool
+    dirty: bool
+
+    def __init__(
+            self,
+            driver_id: int,
+            time_slot: TimeSlot,
+            last_latitude: float,
+            last_longitude: float,
+            distance: float = 0,
+            stored: bool = False,
+    ):
+        self.driver_id = driver_id
+        self.time_slot = time_slot
+        self.last_latitude = last_latitude
+        self.last_longitude = last_longitude
+        self.distance = distance
+        self.persisted_distance = distance if stored else 0
+        self.stored = stored
+        self.dirty = not stored
+
+    def contains(self, timestamp: datetime) -> bool:
+        return self.time_slot.contains(timestamp)
+
+    def ends_at(self, instant: datetime) -> bool:
+        return self.time_slot.ends_at(instant)
+
+    def is_before(self, now: datetime) -> bool:
+        return self.time_slot.is_before(now)
+
+    def add_distance(self, travelled: Distance, latitude: float, longitude: float) -> None:
+        self.distance = self.distance + travelled.to_km_in_float()
+        self.last_latitude = latitude
+        self.last_longitude = longitude
+        self.dirty = True
+
+    def move_to(self, latitude: float, longitude: float) -> None:
+        self.last_latitude = latitude
+        self.last_longitude = longitude
+        self.dirty = True
+
+
+@singleton
+class TravelledDistanceBuffer:
+    """Travelled distance per driver and five minute slot, kept in memory until it is written back.
+
+    Keys are wall-clock slot beginnings, which is how the slots are compared in the database.
+    """
+    __lock: threading.RLock
+    __slots: Dict[Tuple[int, datetime], BufferedTravelledDistance]
+    __stale: Dict[int, Set[datetime]]
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        self.__slots = {}
+        self.__stale = {}
+        register_process_local_state(self)
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self.__lock
+
+    def get(self, driver_id: int, time_slot: TimeSlot) -> Optional[BufferedTravelledDistance]:
+        return self.__slots.get((driver_id, time_slot.beginning))
+
+    def put(self, slot: BufferedTravelledDistance) -> BufferedTravelledDistance:
+        self.__slots[(slot.driver_id, slot.time_slot.beginning)] = slot
+        return slot
+
+    def dirty(self, driver_id: Optional[int] = None, ended_by: Optional[datetime] = None) -> List[BufferedTravelledDistance]:
+        with self.__lock:
+            return [
+                slot for slot in self.__slots.values()
+                if slot.dirty
+                and (driver_id is None or slot.driver_id == driver_id)
+                and (ended_by is None or slot.time_slot.end <= ended_by)
+            ]
+
+    def mark_written(
+            self, slots: List[BufferedTravelledDistance], ended_by: Optional[datetime] = None
+    ) -> Callable[[], None]:
+        # Returns what puts the slots back as they were, for a write that is rolled back after all.
+        with self.__lock:
+            written: List[Tuple[BufferedTravelledDistance, float, bool]] = [
+                (slot, slot.persisted_distance, slot.stored) for slot in slots
+            ]
+            for slot in slots:
+                slot.persisted_distance = slot.distance
+                slot.stored = True
+                slot.dirty = False
+            # Slots that cannot get any more pings are not needed once they are in the database.
+            for key, slot in list(self.__slots.items()):
+                if not slot.dirty and (ended_by is None or slot.time_slot.end <= ended_by):
+                    del self.__slots[key]
+
+        def restore() -> None:
+            with self.__lock:
+                for written_slot, persisted_distance, stored in written:
+                    written_slot.persisted_distance = persisted_distance
+                    written_slot.stored = stored
+                    written_slot.dirty = True
+                    self.__slots.setdefault((written_slot.driver_id, written_slot.time_slot.beginning), written_slot)
+        return restore
+
+    def pending_distance(self, driver_id: int, beginning: datetime, end: datetime) -> float:
+        with self.__lock:
+            return sum(
+                slot.distance - slot.persisted_distance
+                for slot in self.__slots.values()
+                if slot.driver_id == driver_id
+                and slot.time_slot.beginning >= beginning
+                and slot.time_slot.end <= end
+            )
+
+    def mark_stale(self, driver_id: int, time_slot: TimeSlot) -> None:
+        with self.__lock:
+            self.__stale.setdefault(driver_id, set()).add(time_slot.beginning)
+
+    def take_stale(self, driver_id: Optional[int] = None) -> Dict[int, List[TimeSlot]]:
+        # Slots waiting for a replay are handed out once, however many late positions touched them.
+        with self.__lock:
+            driver_ids: List[int] = list(self.__stale) if driver_id is None else [driver_id]
+            return {
+                stale_driver_id: [
+                    TimeSlot.slot_that_contains(beginning)
+                    for beginning in sorted(self.__stale.pop(stale_driver_id))
+                ]
+                for stale_driver_id in driver_ids
+                if stale_driver_id in self.__stale
+            }
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__slots = {}
+            self.__stale = {}
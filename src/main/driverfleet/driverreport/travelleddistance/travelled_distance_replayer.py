@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+from injector import inject
+
+from driverfleet.driver import Driver
+from driverfleet.driver_repository import DriverRepositoryImp
+from driverfleet.driverreport.travelleddistance.travelled_distance import TimeSlot, as_stored
+from geolocation.distance_calculator import DistanceCalculator
+from tracking.driver_position import DriverPosition
+from tracking.driver_position_repository import DriverPositionRepositoryImp
+
+
+class ReplayedSlot(NamedTuple):
+    distance: float
+    last_latitude: float
+    last_longitude: float
+
+
+class TravelledDistanceReplayer:
+    """Recomputes slots from the stored positions of a driver.
+
+    A slot covers the path through every position seen from its beginning up to and including its end,
+    the same hops the live aggregation adds to it.
+    """
+    driver_repository: DriverRepositoryImp
+    driver_position_repository: DriverPositionRepositoryImp
+    distance_calculator: DistanceCalculator
+
+    @inject
+    def __init__(
+        self,
+        driver_repository: DriverRepositoryImp,
+        driver_position_repository: DriverPositionRepositoryImp,
+        distance_calculator: DistanceCalculator,
+    ):
+        self.driver_repository = driver_repository
+        self.driver_position_repository = driver_position_repository
+        self.distance_calculator = distance_calculator
+
+    def replay(self, driver_id: int, time_slots: List[TimeSlot]) -> Dict[datetime, ReplayedSlot]:
+        if not time_slots:
+            return {}
+        driver: Driver = self.driver_repository.get_one(driver_id)
+        if driver is None:
+            raise AttributeError(f"Driver does not exists, id = {driver_id}")
+        positions: List[DriverPosition] = self.driver_position_repository.find_by_driver_and_seen_at_between_order_by_seen_at_asc(
+            driver,
+            min(time_slot.beginning for time_slot in time_slots),
+            max(time_slot.end for time_slot in time_slots),
+        )
+        seen_at = np.array(
+            [as_stored(position.seen_at) for position in positions],
+            dtype="datetime64[us]"
+        )
+        latitudes = np.array([position.latitude for position in positions], dtype=float)
+        longitudes = np.array([position.longitude for position in positions], dtype=float)
+
+        replayed: Dict[datetime, ReplayedSlot] = {}
+        for time_slot in time_slots:
+            first: int = int(np.searchsorted(seen_at, np.datetime64(time_slot.beginning, "us"), side="left"))
+            after_last: int = int(np.searchsorted(seen_at, np.datetime64(time_slot.end, "us"), side="right"))
+            if first >= after_last:
+                continue
+            replayed[time_slot.beginning] = ReplayedSlot(
+                self.distance_calculator.calculate_path_length(
+                    latitudes[first:after_last],
+                    longitudes[first:after_last]
+                ),
+                float(latitudes[after_last - 1]),
+                float(longitudes[after_last - 1]),
+            )
+        return replayed
@@ -1,10 +1,22 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from injector import inject
-from sqlalchemy import text
+from sqlalchemy import DateTime, Enum, bindparam, func, inspect, text
 from sqlmodel import Session
-from driverfleet.driverreport.travelleddistance.travelled_distance import TravelledDistance, TimeSlot
+from core.unit_of_work import flush_or_commit
+from driverfleet.driverreport.travelleddistance.travelled_distance import TravelledDistance, TimeSlot, as_stored
+from driverfleet.driverreport.travelleddistance.travelled_distance_rollup import TravelledDistanceRollup
+
+
+class TravelledDistanceUpdate(NamedTuple):
+    driver_id: int
+    beginning: datetime
+    distance: float
+    previous_distance: float
+    last_latitude: float
+    last_longitude: float
 
 
 class TravelledDistanceRepository:
@@ -14,17 +26,6 @@ class TravelledDistanceRepository:
     def __init__(self, session: Session):
         self.session = session
 
-    def find_travelled_distance_time_slot_by_time(self, when: datetime, driver_id: int) -> Optional[TravelledDistance]:
-        stmt = text(
-            "select td.interval_id, td.driver_id, td.beginning, td.end, td.last_latitude, td.last_longitude"
-            " from TravelledDistance AS td"
-            " where td.beginning <= :when and :when < td.end and td.driver_id = :driver_id"
-        )
-        return self.session.query(TravelledDistance).from_statement(stmt).params(
-            when=when,
-            driver_id=driver_id
-        ).one_or_none()
-
     def find_travelled_distance_by_time_slot_and_driver_id(
         self,
         time_slot: TimeSlot,
@@ -39,6 +40,32 @@ class TravelledDistanceRepository:
         ).one_or_none()
 
     def calculate_distance(self, beginning: datetime, to: datetime, driver_id: int) -> Optional[float]:
+        # Whole days and hours come from the rollups, only the edges are summed slot by slot.
+        beginning = as_stored(beginning)
+        to = as_stored(to)
+        total: float = 0
+        edges: List[Tuple[datetime, datetime]] = []
+        first_day: datetime = TravelledDistanceRollup.Resolution.DAY.ceil(beginning)
+        last_day: datetime = TravelledDistanceRollup.Resolution.DAY.floor(to)
+        if first_day < last_day:
+            total += self.__sum_rollups(driver_id, TravelledDistanceRollup.Resolution.DAY, first_day, last_day)
+            edges = [(beginning, first_day), (last_day, to)]
+        else:
+            edges = [(beginning, to)]
+        for edge_beginning, edge_end in edges:
+            if edge_beginning >= edge_end:
+                continue
+            first_hour: datetime = TravelledDistanceRollup.Resolution.HOUR.ceil(edge_beginning)
+            last_hour: datetime = TravelledDistanceRollup.Resolution.HOUR.floor(edge_end)
+            if first_hour < last_hour:
+                total += self.__sum_rollups(driver_id, TravelledDistanceRollup.Resolution.HOUR, first_hour, last_hour)
+                total += self.__sum_slots(driver_id, edge_beginning, first_hour)
+                total += self.__sum_slots(driver_id, last_hour, edge_end)
+            else:
+                total += self.__sum_slots(driver_id, edge_beginning, edge_end)
+        return total
+
+    def calculate_distance_from_slots(self, beginning: datetime, to: datetime, driver_id: int) -> Optional[float]:
         stmt = text(
             "SELECT COALESCE(SUM(_inner.distance), 0) FROM "
             "((SELECT * FROM travelleddistance AS td WHERE"
@@ -46,15 +73,116 @@ class TravelledDistanceRepository:
             "AS _inner WHERE DATETIME(_inner.end) <= DATETIME(:end) "
         )
         stmt = stmt.params(
-            beginning=beginning,
-            end=to,
+            beginning=as_stored(beginning),
+            end=as_stored(to),
             driver_id=driver_id,
         )
         result = self.session.execute(stmt).one_or_none()
         return result[0] if result else None
 
-    def save(self, travelled_distance: TravelledDistance) -> Optional[TravelledDistance]:
-        self.session.add(travelled_distance)
+    def __sum_slots(self, driver_id: int, beginning: datetime, end: datetime) -> float:
+        if beginning >= end:
+            return 0
+        return self.session.query(func.coalesce(func.sum(TravelledDistance.distance), 0)).where(
+            TravelledDistance.driver_id == driver_id
+        ).where(
+            TravelledDistance.beginning >= beginning
+        ).where(
+            TravelledDistance.end <= end
+        ).scalar()
+
+    def __sum_rollups(
+        self,
+        driver_id: int,
+        resolution: TravelledDistanceRollup.Resolution,
+        beginning: datetime,
+        end: datetime
+    ) -> float:
+        return self.session.query(func.coalesce(func.sum(TravelledDistanceRollup.distance), 0)).where(
+            TravelledDistanceRollup.driver_id == driver_id
+        ).where(
+            TravelledDistanceRollup.resolution == resolution
+        ).where(
+            TravelledDistanceRollup.beginning >= beginning
+        ).where(
+            TravelledDistanceRollup.beginning < end
+        ).scalar()
+
+    def save_all_and_update(
+        self,
+        travelled_distances: List[TravelledDistance],
+        updates: List[TravelledDistanceUpdate],
+    ) -> None:
+        # Updates are matched by driver and slot beginning, without loading the rows first, and add
+        # only what this process measured, the same deltas the rollups get.
+        self.__add_to_rollups(
+            [(td.driver_id, td.beginning, _unsaved_distance(td)) for td in travelled_distances]
+            + [(update.driver_id, update.beginning, update.distance - update.previous_distance) for update in updates]
+        )
+        self.session.add_all(travelled_distances)
+        if updates:
+            table = TravelledDistance.__table__
+            self.session.execute(
+                table.update().where(
+                    table.c.driver_id == bindparam("b_driver_id")
+                ).where(
+                    table.c.beginning == bindparam("b_beginning")
+                ).values(
+                    distance=table.c.distance + bindparam("b_delta"),
+                    last_latitude=bindparam("b_last_latitude"),
+                    last_longitude=bindparam("b_last_longitude"),
+                ),
+                [
+                    {
+                        "b_driver_id": update.driver_id,
+                        "b_beginning": update.beginning,
+                        "b_delta": update.distance - update.previous_distance,
+                        "b_last_latitude": update.last_latitude,
+                        "b_last_longitude": update.last_longitude,
+                    }
+                    for update in updates
+                ]
+            )
+        flush_or_commit(self.session)
+
+    def rebuild_rollups(self) -> None:
+        self.session.query(TravelledDistanceRollup).delete()
+        self.__add_to_rollups(
+            self.session.query(
+                TravelledDistance.driver_id,
+                TravelledDistance.beginning,
+                TravelledDistance.distance
+            ).all()
+        )
         self.session.commit()
-        self.session.refresh(travelled_distance)
-        return travelled_distance
+
+    def __add_to_rollups(self, distances: List[Tuple[int, datetime, float]]) -> None:
+        totals: Dict[Tuple[int, TravelledDistanceRollup.Resolution, datetime], float] = defaultdict(float)
+        for driver_id, beginning, distance in distances:
+            if not distance:
+                continue
+            for resolution in TravelledDistanceRollup.Resolution:
+                totals[(driver_id, resolution, resolution.floor(as_stored(beginning)))] += distance
+        if not totals:
+            return
+        stmt = text(
+            "INSERT INTO travelleddistancerollup (driver_id, resolution, beginning, distance)"
+            " VALUES (:driver_id, :resolution, :beginning, :distance)"
+            " ON CONFLICT (driver_id, resolution, beginning)"
+            " DO UPDATE SET distance = travelleddistancerollup.distance + excluded.distance"
+        ).bindparams(
+            bindparam("resolution", type_=Enum(TravelledDistanceRollup.Resolution)),
+            bindparam("beginning", type_=DateTime),
+        )
+        self.session.execute(stmt, [
+            {"driver_id": driver_id, "resolution": resolution, "beginning": beginning, "distance": distance}
+            for (driver_id, resolution, beginning), distance in totals.items()
+        ])
+
+
+def _unsaved_distance(travelled_distance: TravelledDistance) -> float:
+    history = inspect(travelled_distance).attrs.distance.history
+    if not history.has_changes():
+        return 0
+    previous: float = history.deleted[0] if history.deleted else 0
+    return (travelled_distance.distance or 0) - (previous or 0)
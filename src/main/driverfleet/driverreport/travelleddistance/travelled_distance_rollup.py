@@ -0,0 +1,33 @@
+import enum
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Column, DateTime, Enum
+from sqlmodel import Field, SQLModel
+
+
+class TravelledDistanceRollup(SQLModel, table=True):
+    __table_args__ = {'extend_existing': True}
+
+    class Resolution(enum.Enum):
+        HOUR = 1
+        DAY = 2
+
+        def floor(self, moment: datetime) -> datetime:
+            if self == TravelledDistanceRollup.Resolution.DAY:
+                return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+            return moment.replace(minute=0, second=0, microsecond=0)
+
+        def ceil(self, moment: datetime) -> datetime:
+            floored: datetime = self.floor(moment)
+            return floored if floored == moment else floored + self.length()
+
+        def length(self) -> relativedelta:
+            if self == TravelledDistanceRollup.Resolution.DAY:
+                return relativedelta(days=1)
+            return relativedelta(hours=1)
+
+    driver_id: int = Field(primary_key=True, nullable=False)
+    resolution: Resolution = Field(sa_column=Column(Enum(Resolution), primary_key=True, nullable=False))
+    beginning: datetime = Field(sa_column=Column(DateTime, primary_key=True, nullable=False))
+    distance: float = Field(default=0, nullable=False)
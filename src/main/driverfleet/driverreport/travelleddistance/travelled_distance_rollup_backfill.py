@@ -0,0 +1,13 @@
+from injector import Injector
+
+from core.database import DatabaseModule
+from driverfleet.driverreport.travelleddistance.travelled_distance_repository import TravelledDistanceRepository
+
+
+def main() -> None:
+    # Recomputes hourly and daily totals from the slots, e.g. after the rollup table was first deployed.
+    Injector([DatabaseModule]).get(TravelledDistanceRepository).rebuild_rollups()
+
+
+if __name__ == "__main__":
+    main()
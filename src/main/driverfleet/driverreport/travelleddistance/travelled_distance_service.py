@@ -1,62 +1,174 @@
+import math
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from injector import inject
 
+from core.unit_of_work import after_rollback
 from geolocation.distance import Distance
-from driverfleet.driverreport.travelleddistance.travelled_distance import TimeSlot, TravelledDistance
-from driverfleet.driverreport.travelleddistance.travelled_distance_repository import TravelledDistanceRepository
+from driverfleet.driverreport.travelleddistance.travelled_distance import TimeSlot, TravelledDistance, as_stored
+from driverfleet.driverreport.travelleddistance.travelled_distance_buffer import BufferedTravelledDistance, TravelledDistanceBuffer
+from driverfleet.driverreport.travelleddistance.travelled_distance_replayer import ReplayedSlot, TravelledDistanceReplayer
+from driverfleet.driverreport.travelleddistance.travelled_distance_repository import TravelledDistanceRepository, TravelledDistanceUpdate
 from geolocation.distance_calculator import DistanceCalculator
+from tracking.driver_position_dto import DriverPositionDTO
 
 
 class TravelledDistanceService:
     travelled_distance_repository: TravelledDistanceRepository
     distance_calculator: DistanceCalculator
+    travelled_distance_buffer: TravelledDistanceBuffer
+    travelled_distance_replayer: TravelledDistanceReplayer
 
     @inject
     def __init__(
         self,
         travelled_distance_repository: TravelledDistanceRepository,
         distance_calculator: DistanceCalculator,
+        travelled_distance_buffer: TravelledDistanceBuffer,
+        travelled_distance_replayer: TravelledDistanceReplayer,
     ):
         self.travelled_distance_repository = travelled_distance_repository
         self.distance_calculator = distance_calculator
+        self.travelled_distance_buffer = travelled_distance_buffer
+        self.travelled_distance_replayer = travelled_distance_replayer
 
     def calculate_distance(self, driver_id: int, from_position: datetime, to_position: datetime) -> Distance:
-        left: TimeSlot = TimeSlot.slot_that_contains(from_position)
-        right: TimeSlot = TimeSlot.slot_that_contains(to_position)
-        return Distance.of_km(self.travelled_distance_repository.calculate_distance(
-            left.beginning,
-            right.end,
-            driver_id,
-        ))
+        left: TimeSlot = TimeSlot.slot_that_contains(as_stored(from_position))
+        right: TimeSlot = TimeSlot.slot_that_contains(as_stored(to_position))
+        with self.travelled_distance_buffer.lock:
+            self.__replay_stale_slots(driver_id)
+            written: float = self.travelled_distance_repository.calculate_distance(
+                left.beginning,
+                right.end,
+                driver_id,
+            )
+            not_written_yet: float = self.travelled_distance_buffer.pending_distance(
+                driver_id,
+                left.beginning,
+                right.end,
+            )
+        return Distance.of_km(written + not_written_yet)
 
     def add_position(self, driver_id: int, latitude: float, longitude: float, seen_at: datetime) -> None:
-        matched_slot: TravelledDistance = self.travelled_distance_repository.find_travelled_distance_time_slot_by_time(
-            seen_at,
-            driver_id,
+        seen_at = as_stored(seen_at)
+        with self.travelled_distance_buffer.lock:
+            matched_slot: BufferedTravelledDistance = self.__find_slot(driver_id, TimeSlot.slot_that_contains(seen_at))
+            now = datetime.now()
+            if matched_slot:
+                if matched_slot.contains(now):
+                    self.__add_distance_to_slot(matched_slot, latitude, longitude)
+                elif matched_slot.is_before(now):
+                    self.__recalculate_distance_for(matched_slot.time_slot, driver_id, seen_at)
+            else:
+
+                current_time_slot: TimeSlot = TimeSlot.slot_that_contains(now)
+                late_slot: TimeSlot = TimeSlot.slot_that_contains(seen_at)
+                if late_slot.end <= current_time_slot.beginning:
+                    self.__recalculate_distance_for(late_slot, driver_id, seen_at)
+                    return
+                prev: TimeSlot = current_time_slot.prev()
+                prev_travelled_distance: BufferedTravelledDistance = self.__find_slot(driver_id, prev)
+                if prev_travelled_distance:
+                    if prev_travelled_distance.ends_at(seen_at):
+                        self.__add_distance_to_slot(prev_travelled_distance, latitude, longitude)
+                self.__create_slot(driver_id, current_time_slot, latitude, longitude)
+            self.__write_closed_slots(driver_id, now)
+
+    def add_positions(self, driver_id: int, positions: List[DriverPositionDTO]) -> None:
+        # Folds buffered pings of a single driver into their own slots in one pass over the ordered positions.
+        with self.travelled_distance_buffer.lock:
+            current_beginning: datetime = TimeSlot.slot_that_contains(datetime.now()).beginning
+            current: Optional[BufferedTravelledDistance] = None
+            for position in sorted(positions, key=lambda p: as_stored(p.seen_at)):
+                seen_at: datetime = as_stored(position.seen_at)
+                if current is not None and current.contains(seen_at):
+                    self.__add_distance_to_slot(current, position.latitude, position.longitude)
+                    continue
+
+                time_slot: TimeSlot = TimeSlot.slot_that_contains(seen_at)
+                previous: Optional[BufferedTravelledDistance] = current
+                if previous is None and time_slot.beginning == seen_at:
+                    previous = self.__find_slot(driver_id, time_slot.prev())
+
+                current = self.__find_slot(driver_id, time_slot)
+                if current:
+                    self.__add_distance_to_slot(current, position.latitude, position.longitude)
+                    if time_slot.end <= current_beginning:
+                        # Pings folded into a closed slot may interleave with the ones already counted.
+                        self.__recalculate_distance_for(time_slot, driver_id, seen_at)
+                else:
+                    if previous and previous.ends_at(seen_at):
+                        self.__add_distance_to_slot(previous, position.latitude, position.longitude)
+                    current = self.__create_slot(driver_id, time_slot, position.latitude, position.longitude)
+            self.__replay_stale_slots(driver_id)
+            self.__write_closed_slots(driver_id, datetime.now())
+
+    def flush(self) -> None:
+        # Writes back every slot changed in memory, also the ones still open.
+        with self.travelled_distance_buffer.lock:
+            self.__replay_stale_slots()
+            self.__write(
+                self.travelled_distance_buffer.dirty(),
+                TimeSlot.slot_that_contains(datetime.now()).beginning
+            )
+
+    def __write_closed_slots(self, driver_id: int, now: datetime) -> None:
+        current_beginning: datetime = TimeSlot.slot_that_contains(now).beginning
+        self.__write(
+            self.travelled_distance_buffer.dirty(driver_id=driver_id, ended_by=current_beginning),
+            current_beginning
         )
-        now = datetime.now()
-        if matched_slot:
-            if matched_slot.contains(now):
-                self.__add_distance_to_slot(matched_slot, latitude, longitude)
-            elif matched_slot.is_before(now):
-                self.__recalculate_distance_for(matched_slot, driver_id)
-            self.travelled_distance_repository.save(matched_slot)
-        else:
-
-            current_time_slot: TimeSlot = TimeSlot.slot_that_contains(now)
-            prev: TimeSlot = current_time_slot.prev()
-            prev_travelled_distance: TravelledDistance = \
-                self.travelled_distance_repository.find_travelled_distance_by_time_slot_and_driver_id(
-                    prev,
-                    driver_id,
+
+    def __write(self, slots: List[BufferedTravelledDistance], ended_by: datetime) -> None:
+        if not slots:
+            return
+        created: List[TravelledDistance] = []
+        updates: List[TravelledDistanceUpdate] = []
+        for slot in slots:
+            if slot.stored:
+                updates.append(TravelledDistanceUpdate(
+                    slot.driver_id,
+                    slot.time_slot.beginning,
+                    slot.distance,
+                    slot.persisted_distance,
+                    slot.last_latitude,
+                    slot.last_longitude,
+                ))
+            else:
+                travelled_distance = TravelledDistance(
+                    driver_id=slot.driver_id,
+                    time_slot=slot.time_slot,
+                    last_latitude=slot.last_latitude,
+                    last_longitude=slot.last_longitude,
                 )
-            if prev_travelled_distance:
-                if prev_travelled_distance.ends_at(seen_at):
-                    self.__add_distance_to_slot(prev_travelled_distance, latitude, longitude)
-            self.__create_slot_for_now(driver_id, current_time_slot, latitude, longitude)
+                travelled_distance.distance = slot.distance
+                created.append(travelled_distance)
+        self.travelled_distance_repository.save_all_and_update(created, updates)
+        after_rollback(self.travelled_distance_buffer.mark_written(slots, ended_by))
 
-    def __add_distance_to_slot(self, aggregated_distance: TravelledDistance, latitude: float, longitude: float) -> None:
+    def __find_slot(self, driver_id: int, time_slot: TimeSlot) -> Optional[BufferedTravelledDistance]:
+        buffered: Optional[BufferedTravelledDistance] = self.travelled_distance_buffer.get(driver_id, time_slot)
+        if buffered:
+            return buffered
+        stored: Optional[TravelledDistance] = \
+            self.travelled_distance_repository.find_travelled_distance_by_time_slot_and_driver_id(
+                time_slot,
+                driver_id,
+            )
+        if not stored:
+            return None
+        return self.travelled_distance_buffer.put(BufferedTravelledDistance(
+            driver_id,
+            time_slot,
+            stored.last_latitude,
+            stored.last_longitude,
+            distance=stored.distance,
+            stored=True,
+        ))
+
+    def __add_distance_to_slot(
+            self, aggregated_distance: BufferedTravelledDistance, latitude: float, longitude: float) -> None:
         travelled: Distance = Distance.of_km(self.distance_calculator.calculate_by_geo(
             latitude,
             longitude,
@@ -65,12 +177,38 @@ class TravelledDistanceService:
         )
         aggregated_distance.add_distance(travelled, latitude, longitude)
 
-    def __recalculate_distance_for(self, aggregated_distance: TravelledDistance, driver_id: int):
-        # TODO
-        pass
+    def __recalculate_distance_for(self, time_slot: TimeSlot, driver_id: int, seen_at: datetime) -> None:
+        # Late positions are only noted here; a burst of them is replayed once, on the next read, batch or flush.
+        self.travelled_distance_buffer.mark_stale(driver_id, time_slot)
+        if time_slot.beginning == seen_at:
+            self.travelled_distance_buffer.mark_stale(driver_id, time_slot.prev())
 
-    def __create_slot_for_now(self, driver_id: int, time_slot: TimeSlot, latitude: float, longitude: float):
-        self.travelled_distance_repository.save(
-            TravelledDistance(
-                driver_id=driver_id, time_slot=time_slot, last_latitude=latitude, last_longitude=longitude)
-        )
+    def __replay_stale_slots(self, driver_id: Optional[int] = None) -> None:
+        for stale_driver_id, time_slots in self.travelled_distance_buffer.take_stale(driver_id).items():
+            replayed: Dict[datetime, ReplayedSlot] = self.travelled_distance_replayer.replay(
+                stale_driver_id,
+                time_slots
+            )
+            changed: List[BufferedTravelledDistance] = []
+            for time_slot in time_slots:
+                replayed_slot: Optional[ReplayedSlot] = replayed.get(time_slot.beginning)
+                if replayed_slot is None:
+                    continue
+                slot: Optional[BufferedTravelledDistance] = self.__find_slot(stale_driver_id, time_slot)
+                if slot is None:
+                    slot = self.travelled_distance_buffer.put(BufferedTravelledDistance(
+                        stale_driver_id, time_slot, replayed_slot.last_latitude, replayed_slot.last_longitude))
+                elif math.isclose(slot.distance, replayed_slot.distance, abs_tol=1e-9) and not slot.dirty:
+                    continue
+                slot.distance = replayed_slot.distance
+                slot.move_to(replayed_slot.last_latitude, replayed_slot.last_longitude)
+                changed.append(slot)
+            self.__write(changed, TimeSlot.slot_that_contains(datetime.now()).beginning)
+
+    def __create_slot(
+            self, driver_id: int, time_slot: TimeSlot, latitude: float, longitude: float) -> BufferedTravelledDistance:
+        existing: Optional[BufferedTravelledDistance] = self.__find_slot(driver_id, time_slot)
+        if existing:
+            existing.move_to(latitude, longitude)
+            return existing
+        return self.travelled_distance_buffer.put(BufferedTravelledDistance(driver_id, time_slot, latitude, longitude))
@@ -20,6 +20,8 @@ class Address(BaseEntity, table=True):
     name: Optional[str]
     # @Column(unique=true)
     hash: Optional[str] = Field(sa_column=Column("hash", String, unique=True))
+    latitude: Optional[float]
+    longitude: Optional[float]
 
     def __str__(self):
         return (f"Address{{"
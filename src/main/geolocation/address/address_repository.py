@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from injector import inject
+from sqlalchemy import update
 
 from sqlmodel import Session
 
+from core.unit_of_work import flush_or_commit
 from geolocation.address.address import Address
 
 
@@ -26,8 +28,7 @@ class AddressRepositoryImp:
                 return existing_address
 
         self.session.add(address)
-        self.session.commit()
-        self.session.refresh(address)
+        flush_or_commit(self.session, address)
         return address
 
     def find_by_hash(self, value: str) -> Optional[Address]:
@@ -41,3 +42,29 @@ class AddressRepositoryImp:
 
     def get_one(self, address_id: int) -> Optional[Address]:
         return self.session.query(Address).where(Address.id == address_id).first()
+
+    def find_location_by_hash(self, value: str) -> Optional[Tuple[float, float]]:
+        location = self.session.query(Address.latitude, Address.longitude).where(
+            Address.hash == value
+        ).where(
+            Address.latitude != None
+        ).where(
+            Address.longitude != None
+        ).first()
+        return None if location is None else (location[0], location[1])
+
+    def update_location_by_hash(self, value: str, latitude: float, longitude: float) -> None:
+        result = self.session.execute(
+            update(Address).where(Address.hash == value).values(
+                latitude=latitude, longitude=longitude
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            flush_or_commit(self.session)
+
+    def find_all_by_latitude_null_and_id_after(self, last_id: int, limit: int) -> List[Address]:
+        return self.session.query(Address).where(
+            Address.latitude == None
+        ).where(
+            Address.id > last_id
+        ).order_by(Address.id).limit(limit).all()
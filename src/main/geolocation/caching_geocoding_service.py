@@ -0,0 +1,87 @@
+from typing import List, Optional, Tuple, Union
+
+from injector import inject
+
+from common.metrics import Metrics
+from geolocation.address.address import Address
+from geolocation.address.address_repository import AddressRepositoryImp
+from geolocation.geocoding_cache import GeocodingCache, GeocodingFailure
+from geolocation.geocoding_service import GeocodingService
+
+
+class CachingGeocodingService(GeocodingService):
+    """Asks the geocoder only about addresses it has not resolved before.
+
+    Results are looked up by address hash, first in the in-process cache and then in the location
+    stored on the address row; what the geocoder returns is written to both. Callers that must not
+    write anything, like quotes for trips nobody requested, only read them.
+    """
+    BATCH_SIZE: int = 500
+
+    address_repository: AddressRepositoryImp
+    geocoding_cache: GeocodingCache
+    metrics: Metrics
+
+    @inject
+    def __init__(self, address_repository: AddressRepositoryImp, geocoding_cache: GeocodingCache, metrics: Metrics):
+        self.address_repository = address_repository
+        self.geocoding_cache = geocoding_cache
+        self.metrics = metrics
+
+    def geocode_address(self, address_from, store: bool = True) -> List[Optional[float]]:
+        if address_from.hash is None:
+            address_from.gen_hash()
+        address_hash: str = str(address_from.hash)
+
+        cached: Optional[Union[Tuple[float, float], GeocodingFailure]] = self.geocoding_cache.get(address_hash)
+        if isinstance(cached, GeocodingFailure):
+            self.metrics.increment("geocoding_cache.hits")
+            raise cached.error
+        if cached is not None:
+            self.metrics.increment("geocoding_cache.hits")
+            return list(cached)
+
+        stored: Optional[Tuple[float, float]] = self.address_repository.find_location_by_hash(address_hash)
+        if stored is not None:
+            self.metrics.increment("geocoding_cache.hits")
+            if store:
+                self.geocoding_cache.put(address_hash, stored[0], stored[1])
+            return list(stored)
+
+        self.metrics.increment("geocoding_cache.misses")
+        try:
+            geocoded: List[Optional[float]] = super().geocode_address(address_from)
+        except Exception as error:
+            self.metrics.increment("geocoding_cache.failures")
+            if store:
+                self.geocoding_cache.put_failure(address_hash, error)
+            raise
+        if store and geocoded[0] is not None and geocoded[1] is not None:
+            self.geocoding_cache.put(address_hash, geocoded[0], geocoded[1])
+            self.address_repository.update_location_by_hash(address_hash, geocoded[0], geocoded[1])
+        return geocoded
+
+    def geocode_unresolved(self) -> int:
+        resolved: int = 0
+        last_id: int = 0
+        while True:
+            addresses: List[Address] = self.address_repository.find_all_by_latitude_null_and_id_after(
+                last_id, self.BATCH_SIZE
+            )
+            if not addresses:
+                return resolved
+            for address in addresses:
+                cached = self.geocoding_cache.get(str(address.hash))
+                if isinstance(cached, tuple):
+                    # Geocoded before the address was saved, so only the in-process cache has it.
+                    self.address_repository.update_location_by_hash(str(address.hash), cached[0], cached[1])
+                    resolved += 1
+                    continue
+                try:
+                    geocoded: List[Optional[float]] = self.geocode_address(address)
+                except Exception:
+                    # Remembered as a failure; the address is tried again by a later run.
+                    continue
+                if geocoded[0] is not None and geocoded[1] is not None:
+                    resolved += 1
+            last_id = addresses[-1].id
@@ -1,34 +1,53 @@
-import math
+from typing import Sequence, Union
+
+import numpy as np
+
+Coordinates = Union[float, Sequence[float], np.ndarray]
 
 
 class DistanceCalculator:
+    # Radius of earth in kilometers. Use 3956 for miles
+    EARTH_RADIUS_IN_KM: float = 6371
+
     def calculate_by_map(
             self, latitude_from: float, longitude_from: float, latitude_to: float, longitude_t: float) -> float:
         # ...
 
         return 42
 
-    def calculate_by_geo(self, latitude_from: float, longitude_from: float, latitude_to: float, longitude_to: float):
+    def calculate_by_geo(
+            self, latitude_from: float, longitude_from: float, latitude_to: float, longitude_to: float) -> float:
+        return float(self.calculate_by_geo_many(latitude_from, longitude_from, latitude_to, longitude_to))
+
+    def calculate_by_geo_many(
+            self,
+            latitudes_from: Coordinates,
+            longitudes_from: Coordinates,
+            latitudes_to: Coordinates,
+            longitudes_to: Coordinates,
+    ) -> np.ndarray:
         # https://www.geeksforgeeks.org/program-distance-two-points-earth/
-        # The math module contains a function
-        # named toRadians which converts from
-        #  degrees to radians.
-        lon1 = math.radians(longitude_from)
-        lon2 = math.radians(longitude_to)
-        lat1 = math.radians(latitude_from)
-        lat2 = math.radians(latitude_to)
+        # Pairwise distances in kilometers; arrays broadcast, so one point can be measured against many.
+        lon1 = np.radians(np.asarray(longitudes_from, dtype=float))
+        lon2 = np.radians(np.asarray(longitudes_to, dtype=float))
+        lat1 = np.radians(np.asarray(latitudes_from, dtype=float))
+        lat2 = np.radians(np.asarray(latitudes_to, dtype=float))
 
         # Haversine formula
         dlon = lon2 - lon1
         dlat = lat2 - lat1
-        a = math.pow(math.sin(dlat / 2), 2) + math.cos(lat1) * math.cos(lat2) * math.pow(math.sin(dlon / 2), 2)
-
-        c = 2 * math.asin(math.sqrt(a))
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
 
-        # Radius of earth in kilometers. Use 3956 for miles
-        r = 6371
+        c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
 
-        # calculate the result
-        distance_in_kmeters = c * r
+        return c * self.EARTH_RADIUS_IN_KM
 
-        return distance_in_kmeters
+    def calculate_path_length(self, latitudes: Coordinates, longitudes: Coordinates) -> float:
+        # Length in kilometers of the path going through consecutive points.
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        if latitudes.size < 2:
+            return 0.0
+        return float(np.sum(self.calculate_by_geo_many(
+            latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+        )))
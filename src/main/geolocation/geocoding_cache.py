@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
+
+from injector import inject, singleton
+
+from config.app_properties import AppProperties
+from core.process_local_state import register_process_local_state
+
+
+class GeocodingFailure:
+    error: Exception
+    expires_at: float
+
+    def __init__(self, error: Exception, expires_at: float):
+        self.error = error
+        self.expires_at = expires_at
+
+
+@singleton
+class GeocodingCache:
+    """Least recently used geocoding results, keyed by address hash.
+
+    Failures are remembered too, so an address the geocoder cannot resolve is not retried on every
+    request until the failure expires.
+    """
+    app_properties: AppProperties
+
+    __lock: threading.Lock
+    __entries: "OrderedDict[str, Union[Tuple[float, float], GeocodingFailure]]"
+
+    @inject
+    def __init__(self, app_properties: AppProperties):
+        self.app_properties = app_properties
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        register_process_local_state(self)
+
+    def get(self, address_hash: str) -> Optional[Union[Tuple[float, float], GeocodingFailure]]:
+        with self.__lock:
+            entry = self.__entries.get(address_hash)
+            if entry is None:
+                return None
+            if isinstance(entry, GeocodingFailure) and entry.expires_at <= time.monotonic():
+                del self.__entries[address_hash]
+                return None
+            self.__entries.move_to_end(address_hash)
+            return entry
+
+    def put(self, address_hash: str, latitude: float, longitude: float) -> None:
+        self.__put(address_hash, (latitude, longitude))
+
+    def put_failure(self, address_hash: str, error: Exception) -> None:
+        self.__put(address_hash, GeocodingFailure(
+            error,
+            time.monotonic() + self.app_properties.geocoding_failure_ttl_in_seconds
+        ))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries = OrderedDict()
+
+    def __put(self, address_hash: str, entry: Union[Tuple[float, float], GeocodingFailure]) -> None:
+        with self.__lock:
+            self.__entries[address_hash] = entry
+            self.__entries.move_to_end(address_hash)
+            while len(self.__entries) > self.app_properties.geocoding_cache_size:
+                self.__entries.popitem(last=False)
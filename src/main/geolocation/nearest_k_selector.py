@@ -0,0 +1,56 @@
+import heapq
+import math
+from typing import Callable, Iterable, List, Tuple, TypeVar
+
+from injector import inject
+
+from geolocation.distance_calculator import DistanceCalculator
+
+T = TypeVar('T')
+
+
+class NearestKSelector:
+    # Survivors of the flat-earth pre-selection that get the exact geodesic ranking, per requested item.
+    # The equirectangular approximation is off by far less than that within the radii we search.
+    GEODESIC_POOL_FACTOR: int = 2
+
+    distance_calculator: DistanceCalculator
+
+    @inject
+    def __init__(self, distance_calculator: DistanceCalculator):
+        self.distance_calculator = distance_calculator
+
+    def select(
+            self,
+            items: Iterable[T],
+            latitude: float,
+            longitude: float,
+            k: int,
+            position: Callable[[T], Tuple[float, float]],
+            geodesic: bool = True,
+    ) -> List[T]:
+        items = list(items)
+        if k <= 0 or not items:
+            return []
+        longitude_scale: float = math.cos(math.radians(latitude))
+        squared_distances: List[float] = []
+        for item in items:
+            item_latitude, item_longitude = position(item)
+            d_lat: float = item_latitude - latitude
+            d_lon: float = (item_longitude - longitude) * longitude_scale
+            squared_distances.append(d_lat * d_lat + d_lon * d_lon)
+
+        pool_size: int = k * self.GEODESIC_POOL_FACTOR if geodesic else k
+        survivors: List[int] = heapq.nsmallest(pool_size, range(len(items)), key=squared_distances.__getitem__)
+        if not geodesic:
+            return [items[index] for index in survivors]
+
+        survivor_positions = [position(items[index]) for index in survivors]
+        geodesic_distances = self.distance_calculator.calculate_by_geo_many(
+            latitude,
+            longitude,
+            [survivor_latitude for survivor_latitude, _ in survivor_positions],
+            [survivor_longitude for _, survivor_longitude in survivor_positions],
+        )
+        ranked: List[int] = sorted(range(len(survivors)), key=geodesic_distances.__getitem__)
+        return [items[survivors[index]] for index in ranked[:k]]
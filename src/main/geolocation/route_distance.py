@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+
+class RouteDistance(SQLModel, table=True):
+    __table_args__ = {'extend_existing': True}
+
+    from_hash: str = Field(primary_key=True, nullable=False)
+    to_hash: str = Field(primary_key=True, nullable=False)
+    time_bucket: int = Field(primary_key=True, nullable=False)
+    distance: float = Field(nullable=False)
+    calculated_at: datetime = Field(sa_column=Column(DateTime, nullable=False))
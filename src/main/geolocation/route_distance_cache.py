@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from injector import inject, singleton
+
+from common.metrics import Metrics
+from config.app_properties import AppProperties
+from core.process_local_state import register_process_local_state
+
+RouteKey = Tuple[str, str, int]
+
+
+@singleton
+class RouteDistanceCache:
+    """Least recently used route distances, keyed by the hashes of both addresses and the time-of-day bucket."""
+    app_properties: AppProperties
+    metrics: Metrics
+
+    __lock: threading.Lock
+    __distances: "OrderedDict[RouteKey, float]"
+
+    @inject
+    def __init__(self, app_properties: AppProperties, metrics: Metrics):
+        self.app_properties = app_properties
+        self.metrics = metrics
+        self.__lock = threading.Lock()
+        self.__distances = OrderedDict()
+        register_process_local_state(self)
+
+    def get(self, key: RouteKey) -> Optional[float]:
+        with self.__lock:
+            distance: Optional[float] = self.__distances.get(key)
+            if distance is not None:
+                self.__distances.move_to_end(key)
+            return distance
+
+    def put(self, key: RouteKey, distance: float) -> None:
+        evicted: int = 0
+        with self.__lock:
+            self.__distances[key] = distance
+            self.__distances.move_to_end(key)
+            while len(self.__distances) > self.app_properties.route_distance_cache_size:
+                self.__distances.popitem(last=False)
+                evicted += 1
+            size: int = len(self.__distances)
+        if evicted:
+            self.metrics.increment("route_distance_cache.evictions", evicted)
+        self.metrics.set("route_distance_cache.size", size)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__distances = OrderedDict()
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import List, Optional
+
+from injector import inject
+
+from common.metrics import Metrics
+from config.app_properties import AppProperties
+from geolocation.address.address import Address
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.route_distance_cache import RouteDistanceCache, RouteKey
+from geolocation.route_distance_repository import RouteDistanceRepository
+
+
+class RouteDistanceCalculator:
+    """Route distances between addresses, asking the routing engine once per pair and time of day.
+
+    Distances are looked up in the in-process cache, then in the route distance table; what the
+    routing engine returns is written to both, unless the caller asks not to store anything, in which
+    case the distance is only computed and returned.
+    """
+    distance_calculator: DistanceCalculator
+    route_distance_repository: RouteDistanceRepository
+    route_distance_cache: RouteDistanceCache
+    app_properties: AppProperties
+    metrics: Metrics
+
+    @inject
+    def __init__(
+        self,
+        distance_calculator: DistanceCalculator,
+        route_distance_repository: RouteDistanceRepository,
+        route_distance_cache: RouteDistanceCache,
+        app_properties: AppProperties,
+        metrics: Metrics,
+    ):
+        self.distance_calculator = distance_calculator
+        self.route_distance_repository = route_distance_repository
+        self.route_distance_cache = route_distance_cache
+        self.app_properties = app_properties
+        self.metrics = metrics
+
+    def calculate_by_map(
+        self,
+        address_from: Address,
+        geo_from: List[float],
+        address_to: Address,
+        geo_to: List[float],
+        when: datetime,
+        store: bool = True,
+    ) -> float:
+        key: RouteKey = (self.__hash_of(address_from), self.__hash_of(address_to), self.time_bucket(when))
+
+        distance: Optional[float] = self.route_distance_cache.get(key)
+        if distance is not None:
+            self.metrics.increment("route_distance_cache.hits")
+            return distance
+
+        distance = self.route_distance_repository.find_distance(*key)
+        if distance is not None:
+            self.metrics.increment("route_distance_cache.stored_hits")
+            if store:
+                self.route_distance_cache.put(key, distance)
+            return distance
+
+        self.metrics.increment("route_distance_cache.misses")
+        distance = float(self.distance_calculator.calculate_by_map(geo_from[0], geo_from[1], geo_to[0], geo_to[1]))
+        if store:
+            self.route_distance_cache.put(key, distance)
+            self.route_distance_repository.save(*key, distance, when)
+        return distance
+
+    def time_bucket(self, when: datetime) -> int:
+        return (when.hour * 60 + when.minute) // self.app_properties.route_distance_time_bucket_in_minutes
+
+    @staticmethod
+    def __hash_of(address: Address) -> str:
+        if address.hash is None:
+            address.gen_hash()
+        return str(address.hash)
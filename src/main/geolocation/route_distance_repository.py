@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+from injector import inject
+from sqlalchemy import DateTime, bindparam, text
+from sqlmodel import Session
+
+from core.unit_of_work import flush_or_commit
+from geolocation.route_distance import RouteDistance
+
+
+class RouteDistanceRepository:
+    session: Session
+
+    @inject
+    def __init__(self, session: Session):
+        self.session = session
+
+    def find_distance(self, from_hash: str, to_hash: str, time_bucket: int) -> Optional[float]:
+        route: Optional[RouteDistance] = self.session.get(RouteDistance, (from_hash, to_hash, time_bucket))
+        return None if route is None else route.distance
+
+    def save(self, from_hash: str, to_hash: str, time_bucket: int, distance: float, calculated_at: datetime) -> None:
+        # Another process may have stored the same route in the meantime; the distance it stored is kept.
+        stmt = text(
+            "INSERT INTO routedistance (from_hash, to_hash, time_bucket, distance, calculated_at)"
+            " VALUES (:from_hash, :to_hash, :time_bucket, :distance, :calculated_at)"
+            " ON CONFLICT (from_hash, to_hash, time_bucket) DO NOTHING"
+        ).bindparams(
+            bindparam("calculated_at", type_=DateTime),
+        )
+        self.session.execute(stmt, {
+            "from_hash": from_hash,
+            "to_hash": to_hash,
+            "time_bucket": time_bucket,
+            "distance": distance,
+            "calculated_at": calculated_at,
+        })
+        flush_or_commit(self.session)
@@ -2,6 +2,7 @@ from typing import Optional
 
 from injector import inject
 
+from core.unit_of_work import flush_or_commit
 from invocing.invoice import Invoice
 from sqlmodel import Session
 
@@ -15,6 +16,5 @@ class InvoiceRepositoryImp:
 
     def save(self, invoice: Invoice) -> Optional[Invoice]:
         self.session.add(invoice)
-        self.session.commit()
-        self.session.refresh(invoice)
+        flush_or_commit(self.session, invoice)
         return invoice
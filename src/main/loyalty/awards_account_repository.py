@@ -2,6 +2,7 @@ from typing import Optional, List
 
 from injector import inject
 
+from core.unit_of_work import flush_or_commit
 from crm.client import Client
 from loyalty.awarded_miles import AwardedMiles
 from loyalty.awards_account import AwardsAccount
@@ -25,6 +26,5 @@ class AwardsAccountRepositoryImp:
 
     def save(self, awards_account: AwardsAccount) -> Optional[AwardsAccount]:
         self.session.add(awards_account)
-        self.session.commit()
-        self.session.refresh(awards_account)
+        flush_or_commit(self.session, awards_account)
         return awards_account
@@ -10,6 +10,7 @@ from party.api.party_id import PartyId
 from party.model.party.party import Party
 from party.model.party.party_relationship import PartyRelationship
 from party.model.party.party_relationship_repository import PartyRelationshipRepository
+from core.unit_of_work import flush_or_commit
 
 
 class PartyRelationshipRepositoryImpl(PartyRelationshipRepository):
@@ -49,8 +50,7 @@ class PartyRelationshipRepositoryImpl(PartyRelationshipRepository):
         else:
             relationship = PartyRelationship()
             self.session.add(relationship)
-            self.session.commit()
-            self.session.refresh(relationship)
+            flush_or_commit(self.session, relationship)
 
         relationship.name = party_relationship
         relationship.party_a = party_a
@@ -59,8 +59,7 @@ class PartyRelationshipRepositoryImpl(PartyRelationshipRepository):
         relationship.role_b = party_b_role
 
         self.session.add(relationship)
-        self.session.commit()
-        self.session.refresh(relationship)
+        flush_or_commit(self.session, relationship)
 
         return relationship
 
@@ -6,6 +6,7 @@ from sqlmodel import Session
 from core.database import get_session
 from party.model.party.party import Party
 from party.model.party.party_repository import PartyRepository
+from core.unit_of_work import flush_or_commit
 
 
 class PartyRepositoryImpl(PartyRepository):
@@ -20,7 +21,6 @@ class PartyRepositoryImpl(PartyRepository):
             party = Party()
             party.id = party_id
             self.session.add(party)
-            self.session.commit()
-            self.session.refresh(party)
+            flush_or_commit(self.session, party)
 
         return party
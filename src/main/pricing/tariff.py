@@ -3,20 +3,29 @@ from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
+import numpy as np
+
 from geolocation.distance import Distance
 from money import Money
 
 
 class Tariff:
+    """Rates of a tariff; instances are shared between transits and quotes, so they cannot be changed."""
     BASE_FEE: int = 8
     km_rate: float
     name: str
     base_fee: int
 
     def __init__(self, km_rate: float, name: str, base_fee: int):
-        self.name = name
-        self.km_rate = km_rate
-        self.base_fee = base_fee
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "km_rate", km_rate)
+        object.__setattr__(self, "base_fee", base_fee)
+
+    def __setattr__(self, key: str, value: object) -> None:
+        raise AttributeError(f"Tariff cannot be changed, name = {self.name}")
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError(f"Tariff cannot be changed, name = {self.name}")
 
     @classmethod
     def of_time(cls, time: datetime) -> 'Tariff':
@@ -44,3 +53,18 @@ class Tariff:
         ).quantize(Decimal('.01'), rounding=ROUND_HALF_UP)
         final_price: int = int(str(price_big_decimal).replace(".", ""))
         return Money(final_price)
+
+    @staticmethod
+    def calculate_cost_many(distances_in_km: np.ndarray, km_rates: np.ndarray, base_fees: np.ndarray) -> np.ndarray:
+        # Costs in cents, rounded half up the way calculate_cost rounds them.
+        costs: np.ndarray = (
+            np.asarray(distances_in_km, dtype=float) * np.asarray(km_rates, dtype=float)
+            + np.asarray(base_fees, dtype=float)
+        )
+        cents: np.ndarray = costs * 100
+        rounded: np.ndarray = np.floor(cents + 0.5)
+        # Scaling by 100 is inexact, so costs that land next to half a cent are rounded again on their exact value.
+        near_half: np.ndarray = np.abs(cents - np.floor(cents) - 0.5) <= 1e-6 * np.maximum(1, np.abs(cents))
+        for index in np.flatnonzero(near_half):
+            rounded[index] = int(Decimal(float(costs[index])).quantize(Decimal('.01'), rounding=ROUND_HALF_UP) * 100)
+        return rounded.astype(np.int64)
@@ -0,0 +1,76 @@
+import calendar
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from injector import inject, singleton
+
+from config.app_properties import AppProperties
+from pricing.tariff import Tariff
+
+HOURS_IN_DAY: int = 24
+
+
+@singleton
+class TariffSchedule:
+    """Tariffs compiled into a table with one entry per weekday and hour.
+
+    Holidays override the table for a whole day or for a range of hours. A calendar entry is either
+    yearly ("MM-DD") or for one date only ("YYYY-MM-DD"), optionally followed by the hours it covers
+    ("01-01 00-06"). The same Tariff instances are handed out to every caller.
+    """
+    STANDARD: Tariff = Tariff(1.0, "Standard", Tariff.BASE_FEE + 1)
+    WEEKEND: Tariff = Tariff(1.5, "Weekend", Tariff.BASE_FEE)
+    WEEKEND_PLUS: Tariff = Tariff(2.5, "Weekend+", Tariff.BASE_FEE + 2)
+    HOLIDAY: Tariff = Tariff(3.50, "Sylwester", Tariff.BASE_FEE + 3)
+
+    # piątek i sobota po 17 do 6 następnego dnia, pozostałe godziny weekendu
+    WEEKLY_RULES: List[Tuple[Tariff, int, int, int]] = [
+        (WEEKEND_PLUS, calendar.FRIDAY, 17, 23),
+        (WEEKEND_PLUS, calendar.SATURDAY, 0, 6),
+        (WEEKEND, calendar.SATURDAY, 7, 16),
+        (WEEKEND_PLUS, calendar.SATURDAY, 17, 23),
+        (WEEKEND_PLUS, calendar.SUNDAY, 0, 6),
+        (WEEKEND, calendar.SUNDAY, 7, 23),
+    ]
+
+    __weekly: List[List[Tariff]]
+    __yearly: Dict[Tuple[int, int], List[Optional[Tariff]]]
+    __dated: Dict[date, List[Optional[Tariff]]]
+
+    @inject
+    def __init__(self, app_properties: AppProperties):
+        self.__weekly = [[self.STANDARD] * HOURS_IN_DAY for _ in range(7)]
+        for tariff, weekday, first_hour, last_hour in self.WEEKLY_RULES:
+            for hour in range(first_hour, last_hour + 1):
+                self.__weekly[weekday][hour] = tariff
+        self.__yearly = {}
+        self.__dated = {}
+        for holiday in app_properties.tariff_holidays:
+            self.__add_holiday(holiday)
+
+    def tariff_at(self, local_time: datetime) -> Tariff:
+        if self.__dated:
+            hours: Optional[List[Optional[Tariff]]] = self.__dated.get(local_time.date())
+            if hours is not None and hours[local_time.hour] is not None:
+                return hours[local_time.hour]
+        hours = self.__yearly.get((local_time.month, local_time.day))
+        if hours is not None and hours[local_time.hour] is not None:
+            return hours[local_time.hour]
+        return self.__weekly[local_time.weekday()][local_time.hour]
+
+    def __add_holiday(self, holiday: str) -> None:
+        day, _, hours = holiday.strip().partition(" ")
+        first_hour, last_hour = (int(hour) for hour in hours.split("-")) if hours else (0, HOURS_IN_DAY - 1)
+        if not 0 <= first_hour <= last_hour < HOURS_IN_DAY:
+            raise ValueError(f"Illegal holiday hours, holiday = {holiday}")
+        parts: List[int] = [int(part) for part in day.split("-")]
+        if len(parts) == 3:
+            overridden: List[Optional[Tariff]] = self.__dated.setdefault(date(*parts), [None] * HOURS_IN_DAY)
+        elif len(parts) == 2:
+            # Validated against a leap year, so that 02-29 is accepted.
+            date(2000, *parts)
+            overridden = self.__yearly.setdefault((parts[0], parts[1]), [None] * HOURS_IN_DAY)
+        else:
+            raise ValueError(f"Illegal holiday, holiday = {holiday}")
+        for hour in range(first_hour, last_hour + 1):
+            overridden[hour] = self.HOLIDAY
@@ -1,13 +1,36 @@
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from dateutil.tz import tzlocal
+from injector import inject
 
 from pricing.tariff import Tariff
+from pricing.tariff_schedule import TariffSchedule
 
 
 class Tariffs:
+    tariff_schedule: TariffSchedule
+
+    @inject
+    def __init__(self, tariff_schedule: TariffSchedule):
+        self.tariff_schedule = tariff_schedule
 
     def choose(self, when: datetime) -> Tariff:
         if not when:
             when = datetime.now()
-        return Tariff.of_time(when.astimezone(tzlocal()))
+        return self.tariff_schedule.tariff_at(when.astimezone(tzlocal()))
+
+    def choose_many(self, timestamps: List[Optional[datetime]]) -> List[Tariff]:
+        # Time zone offsets are whole quarters of an hour, so every moment of a quarter gets the same local hour.
+        now: datetime = datetime.now()
+        chosen: Dict[datetime, Tariff] = {}
+        tariffs: List[Tariff] = []
+        for when in timestamps:
+            quarter: datetime = (when or now).replace(second=0, microsecond=0)
+            quarter = quarter.replace(minute=quarter.minute - quarter.minute % 15)
+            tariff: Optional[Tariff] = chosen.get(quarter)
+            if tariff is None:
+                tariff = self.choose(quarter)
+                chosen[quarter] = tariff
+            tariffs.append(tariff)
+        return tariffs
@@ -1,4 +1,4 @@
-import math
+from datetime import datetime
 from typing import List
 from uuid import UUID
 
@@ -9,12 +9,14 @@ from geolocation.address.address_repository import AddressRepositoryImp
 from geolocation.distance import Distance
 from geolocation.distance_calculator import DistanceCalculator
 from geolocation.geocoding_service import GeocodingService
+from geolocation.route_distance_calculator import RouteDistanceCalculator
 from ride.transit_demand import TransitDemand
 from ride.transit_demand_repository import TransitDemandRepository
 
 
 class ChangePickupService:
     distance_calculator: DistanceCalculator
+    route_distance_calculator: RouteDistanceCalculator
     geocoding_service: GeocodingService
     address_repository: AddressRepositoryImp
     transit_demand_repository: TransitDemandRepository
@@ -23,11 +25,13 @@ class ChangePickupService:
     def __init__(
         self,
         distance_calculator: DistanceCalculator,
+        route_distance_calculator: RouteDistanceCalculator,
         geocoding_service: GeocodingService,
         address_repository: AddressRepositoryImp,
         transit_demand_repository: TransitDemandRepository,
     ):
         self.distance_calculator = distance_calculator
+        self.route_distance_calculator = route_distance_calculator
         self.geocoding_service = geocoding_service
         self.address_repository = address_repository
         self.transit_demand_repository = transit_demand_repository
@@ -43,34 +47,20 @@ class ChangePickupService:
         geo_from_new: List[float] = self.geocoding_service.geocode_address(new_address)
         geo_from_old: List[float] = self.geocoding_service.geocode_address(old_address)
 
-        # https://www.geeksforgeeks.org/program-distance-two-points-earth/
-        # The math module contains a function
-        # named toRadians which converts from
-        # degrees to radians.
-        lon1: float = math.radians(geo_from_new[1])
-        lon2: float = math.radians(geo_from_old[1])
-        lat1: float = math.radians(geo_from_new[0])
-        lat2: float = math.radians(geo_from_old[0])
-
-        # Haversine formula
-        dlon: float = lon2 - lon1
-        dlat: float = lat2 - lat1
-        a: float = math.pow(math.sin(dlat / 2), 2) + math.cos(lat1) * math.cos(lat2) * math.pow(math.sin(dlon / 2), 2)
-
-        c = 2 * math.asin(math.sqrt(a))
-
-        # Radius of earth in kilometers. Use 3956 for miles
-        r = 6371
-
-        # calculate the result
-        distance_in_kmeters = c * r
+        distance_in_kmeters: float = self.distance_calculator.calculate_by_geo(
+            geo_from_new[0],
+            geo_from_new[1],
+            geo_from_old[0],
+            geo_from_old[1]
+        )
 
         new_distance = Distance.of_km(float(
-            self.distance_calculator.calculate_by_map(
-                geo_from_new[0],
-                geo_from_new[1],
-                geo_from_old[0],
-                geo_from_old[1]
+            self.route_distance_calculator.calculate_by_map(
+                new_address,
+                geo_from_new,
+                old_address,
+                geo_from_old,
+                datetime.now()
             )
         ))
         transit_demand.change_pickup(distance_in_kmeters)
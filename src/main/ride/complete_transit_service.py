@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 from uuid import UUID
 
@@ -5,8 +6,8 @@ from injector import inject
 
 from geolocation.address.address import Address
 from geolocation.distance import Distance
-from geolocation.distance_calculator import DistanceCalculator
 from geolocation.geocoding_service import GeocodingService
+from geolocation.route_distance_calculator import RouteDistanceCalculator
 from money import Money
 from ride.transit import Transit
 from ride.transit_repository import TransitRepositoryImp
@@ -14,18 +15,18 @@ from ride.transit_repository import TransitRepositoryImp
 
 class CompleteTransitService:
     transit_repository: TransitRepositoryImp
-    distance_calculator: DistanceCalculator
+    route_distance_calculator: RouteDistanceCalculator
     geocoding_service: GeocodingService
 
     @inject
     def __init__(
         self,
         transit_repository: TransitRepositoryImp,
-        distance_calculator: DistanceCalculator,
+        route_distance_calculator: RouteDistanceCalculator,
         geocoding_service: GeocodingService,
     ):
         self.transit_repository = transit_repository
-        self.distance_calculator = distance_calculator
+        self.route_distance_calculator = route_distance_calculator
         self.geocoding_service = geocoding_service
 
     def complete_transit(
@@ -43,11 +44,12 @@ class CompleteTransitService:
         # FIXME later: add some exceptions handling
         geo_from: List[float] = self.geocoding_service.geocode_address(address_from)
         geo_to: List[float] = self.geocoding_service.geocode_address(destination_address)
-        distance: Distance = Distance.of_km(self.distance_calculator.calculate_by_map(
-            geo_from[0],
-            geo_from[1],
-            geo_to[0],
-            geo_to[1]
+        distance: Distance = Distance.of_km(self.route_distance_calculator.calculate_by_map(
+            address_from,
+            geo_from,
+            destination_address,
+            geo_to,
+            datetime.now()
         ))
         final_price: Money = transit.complete_ride_at(distance)
         self.transit_repository.save(transit)
@@ -30,6 +30,12 @@ class TransitDetailsFacade:
     def find_by_uuid(self, request_id: UUID) -> TransitDetailsDTO:
         return TransitDetailsDTO(self.load_by_uuid(request_id))
 
+    def find_by_uuids(self, request_ids: List[UUID]) -> List[TransitDetailsDTO]:
+        return [
+            TransitDetailsDTO(transit_details)
+            for transit_details in self.transit_details_repository.find_all_by_request_uuids(request_ids)
+        ]
+
     def find(self, transit_id: int):
         return TransitDetailsDTO(transit_details=self.load(transit_id))
 
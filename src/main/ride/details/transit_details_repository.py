@@ -6,6 +6,10 @@ from injector import inject
 from sqlalchemy import text
 from sqlmodel import Session
 
+from assignment.assignment_status import AssignmentStatus
+from assignment.driver_assignment import DriverAssignment
+from core.identity_map import cached
+from core.unit_of_work import flush_or_commit
 from ride.details.status import Status
 from ride.details.transit_details import TransitDetails
 
@@ -18,10 +22,31 @@ class TransitDetailsRepository:
         self.session = session
 
     def find_by_request_uuid(self, request_uuid: UUID) -> Optional[TransitDetails]:
-        return self.session.query(TransitDetails).where(TransitDetails.request_uuid == request_uuid).first()
+        return cached(TransitDetails, "request_uuid", request_uuid, lambda: self.session.query(
+            TransitDetails
+        ).where(TransitDetails.request_uuid == request_uuid).first())
+
+    def find_all_by_request_uuids(self, request_uuids: List[UUID]) -> List[TransitDetails]:
+        return self.session.query(TransitDetails).where(TransitDetails.request_uuid.in_(request_uuids)).all()
+
+    def driver_assignment_failed_for_all(self, request_uuids: List[UUID]) -> int:
+        # Only transits whose assignment really failed; one accepted in the meantime keeps its status.
+        return self.session.query(TransitDetails).where(
+            TransitDetails.request_uuid.in_(request_uuids)
+        ).where(
+            TransitDetails.request_uuid.in_(self.session.query(DriverAssignment.request_uuid).where(
+                DriverAssignment.request_uuid.in_(request_uuids)
+            ).where(
+                DriverAssignment.status == AssignmentStatus.DRIVER_ASSIGNMENT_FAILED
+            ))
+        ).where(
+            TransitDetails.status.in_([Status.WAITING_FOR_DRIVER_ASSIGNMENT, Status.TRANSIT_TO_PASSENGER])
+        ).update({TransitDetails.status: Status.DRIVER_ASSIGNMENT_FAILED}, synchronize_session=False)
 
     def find_by_transit_id(self, transit_id: int) -> Optional[TransitDetails]:
-        return self.session.query(TransitDetails).where(TransitDetails.transit_id == transit_id).first()
+        return cached(TransitDetails, "transit_id", transit_id, lambda: self.session.query(
+            TransitDetails
+        ).where(TransitDetails.transit_id == transit_id).first())
 
     def find_by_client_id(self, client_id: int) -> List[TransitDetails]:
         return self.session.query(TransitDetails).where(TransitDetails.client_id == client_id).all()
@@ -48,6 +73,5 @@ class TransitDetailsRepository:
 
     def save(self, transit_details: TransitDetails) -> Optional[TransitDetails]:
         self.session.add(transit_details)
-        self.session.commit()
-        self.session.refresh(transit_details)
+        flush_or_commit(self.session, transit_details)
         return transit_details
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from injector import inject
+from sqlmodel import Session
+
+from assignment.driver_assignment_repository import DriverAssignmentRepository
+from common.metrics import Metrics
+from ride.details.transit_details_repository import TransitDetailsRepository
+from ride.transit_view_projection import TransitViewProjection
+
+
+class ExpiredDriverAssignmentSweeper:
+    """Fails assignments nobody accepted within the waiting window, together with their transit details.
+
+    Each tick is one UPDATE per table, and one DELETE of the stale transit views, in a single transaction;
+    anything above the batch size waits for the next tick. The UPDATEs re-check status and expiry themselves,
+    so an assignment accepted after the ids were selected is left alone.
+    """
+    WAITING_WINDOW: timedelta = timedelta(seconds=300)
+    BATCH_SIZE: int = 5000
+
+    session: Session
+    driver_assignment_repository: DriverAssignmentRepository
+    transit_details_repository: TransitDetailsRepository
+    transit_view_projection: TransitViewProjection
+    metrics: Metrics
+
+    @inject
+    def __init__(
+        self,
+        session: Session,
+        driver_assignment_repository: DriverAssignmentRepository,
+        transit_details_repository: TransitDetailsRepository,
+        transit_view_projection: TransitViewProjection,
+        metrics: Metrics,
+    ):
+        self.session = session
+        self.driver_assignment_repository = driver_assignment_repository
+        self.transit_details_repository = transit_details_repository
+        self.transit_view_projection = transit_view_projection
+        self.metrics = metrics
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        with self.metrics.timer("driver_assignment_sweeper.latency"):
+            deadline: datetime = (now or datetime.now()).replace(tzinfo=None) - self.WAITING_WINDOW
+            expired: List[UUID] = self.driver_assignment_repository.find_request_uuids_waiting_since_before(
+                deadline,
+                self.BATCH_SIZE
+            )
+            if not expired:
+                return 0
+            failed: int = self.driver_assignment_repository.fail_all_waiting_since_before(
+                expired,
+                deadline
+            )
+            self.transit_details_repository.driver_assignment_failed_for_all(expired)
+            self.transit_view_projection.invalidate(expired)
+            self.session.commit()
+        self.metrics.increment("driver_assignment_sweeper.failed", failed)
+        return failed
@@ -0,0 +1,23 @@
+from typing import List
+
+from fastapi import HTTPException
+from fastapi_injector import Injected
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+
+from ride.quote_dto import QuoteDTO, QuoteRequestDTO
+from ride.quote_service import QuoteService
+
+quote_router = InferringRouter(tags=["QuoteController"])
+
+
+@cbv(quote_router)
+class QuoteController:
+    quote_service: QuoteService = Injected(QuoteService)
+
+    @quote_router.post("/quotes/batch")
+    def quote_all(self, requests: List[QuoteRequestDTO]) -> List[QuoteDTO]:
+        try:
+            return self.quote_service.quote_all(requests)
+        except ValueError as error:
+            raise HTTPException(status_code=422, detail=str(error))
@@ -0,0 +1,21 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from geolocation.address.address_dto import AddressDTO
+
+
+class QuoteRequestDTO(BaseModel):
+    address_from: AddressDTO
+    address_to: AddressDTO
+    when: Optional[datetime]
+
+
+class QuoteDTO(BaseModel):
+    tariff: str
+    km_rate: float
+    base_fee: Decimal
+    distance: float
+    estimated_price: Decimal
@@ -0,0 +1,96 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from injector import inject
+
+from config.app_properties import AppProperties
+from geolocation.address.address import Address
+from geolocation.address.address_dto import AddressDTO
+from geolocation.caching_geocoding_service import CachingGeocodingService
+from geolocation.route_distance_calculator import RouteDistanceCalculator
+from pricing.tariff import Tariff
+from pricing.tariffs import Tariffs
+from ride.quote_dto import QuoteDTO, QuoteRequestDTO
+
+
+class QuoteService:
+    """Estimates prices of trips that are not requested, without writing anything to the database."""
+    geocoding_service: CachingGeocodingService
+    route_distance_calculator: RouteDistanceCalculator
+    tariffs: Tariffs
+    app_properties: AppProperties
+
+    @inject
+    def __init__(
+        self,
+        geocoding_service: CachingGeocodingService,
+        route_distance_calculator: RouteDistanceCalculator,
+        tariffs: Tariffs,
+        app_properties: AppProperties,
+    ):
+        self.geocoding_service = geocoding_service
+        self.route_distance_calculator = route_distance_calculator
+        self.tariffs = tariffs
+        self.app_properties = app_properties
+
+    def quote_all(self, requests: List[QuoteRequestDTO]) -> List[QuoteDTO]:
+        if len(requests) > self.app_properties.quote_batch_max_size:
+            raise ValueError(
+                f"Cannot quote more than {self.app_properties.quote_batch_max_size} trips at once, got {len(requests)}"
+            )
+        now: datetime = datetime.now()
+        whens: List[datetime] = [request.when or now for request in requests]
+        addresses: Dict[Tuple, Address] = {}
+        distances: np.ndarray = np.array([
+            self.__distance(
+                self.__address(request.address_from, addresses),
+                self.__address(request.address_to, addresses),
+                when
+            )
+            for request, when in zip(requests, whens)
+        ], dtype=float)
+        tariffs: List[Tariff] = self.tariffs.choose_many(whens)
+        costs: np.ndarray = Tariff.calculate_cost_many(
+            distances,
+            np.array([tariff.km_rate for tariff in tariffs], dtype=float),
+            np.array([tariff.base_fee for tariff in tariffs], dtype=float),
+        )
+        return [
+            QuoteDTO(
+                tariff=tariff.name,
+                km_rate=tariff.km_rate,
+                base_fee=Decimal(tariff.base_fee),
+                distance=distance,
+                estimated_price=Decimal(cost),
+            )
+            for tariff, distance, cost in zip(tariffs, distances.tolist(), costs.tolist())
+        ]
+
+    @staticmethod
+    def __address(address_dto: AddressDTO, addresses: Dict[Tuple, Address]) -> Address:
+        # Partners quote many trips between the same places; each distinct address becomes one entity.
+        key: Tuple = (
+            address_dto.country,
+            address_dto.district,
+            address_dto.city,
+            address_dto.street,
+            address_dto.building_number,
+            address_dto.additional_number,
+            address_dto.postal_code,
+            address_dto.name,
+        )
+        address: Optional[Address] = addresses.get(key)
+        if address is None:
+            address = address_dto.to_address_entity()
+            address.gen_hash()
+            addresses[key] = address
+        return address
+
+    def __distance(self, address_from: Address, address_to: Address, when: datetime) -> float:
+        geo_from: List[float] = self.geocoding_service.geocode_address(address_from, store=False)
+        geo_to: List[float] = self.geocoding_service.geocode_address(address_to, store=False)
+        return self.route_distance_calculator.calculate_by_map(
+            address_from, geo_from, address_to, geo_to, when, store=False
+        )
@@ -4,6 +4,8 @@ from uuid import UUID
 from injector import inject
 from sqlmodel import Session
 
+from core.identity_map import cached
+from core.unit_of_work import flush_or_commit
 from ride.request_for_transit import RequestForTransit
 
 
@@ -15,13 +17,16 @@ class RequestForTransitRepository:
         self.session = session
 
     def find_by_request_uuid(self, request_uuid: UUID) -> Optional[RequestForTransit]:
-        return self.session.query(RequestForTransit).where(RequestForTransit.request_uuid == request_uuid).first()
+        return cached(RequestForTransit, "request_uuid", request_uuid, lambda: self.session.query(
+            RequestForTransit
+        ).where(RequestForTransit.request_uuid == request_uuid).first())
 
     def save(self, request_for_transit: RequestForTransit) -> Optional[RequestForTransit]:
         self.session.add(request_for_transit)
-        self.session.commit()
-        self.session.refresh(request_for_transit)
+        flush_or_commit(self.session, request_for_transit)
         return request_for_transit
 
     def get_one(self, request_id: int) -> Optional[RequestForTransit]:
-        return self.session.query(RequestForTransit).where(RequestForTransit.id == request_id).first()
+        return cached(RequestForTransit, "id", request_id, lambda: self.session.query(
+            RequestForTransit
+        ).where(RequestForTransit.id == request_id).first())
@@ -6,8 +6,8 @@ from injector import inject
 
 from geolocation.address.address import Address
 from geolocation.distance import Distance
-from geolocation.distance_calculator import DistanceCalculator
 from geolocation.geocoding_service import GeocodingService
+from geolocation.route_distance_calculator import RouteDistanceCalculator
 from pricing.tariff import Tariff
 from pricing.tariffs import Tariffs
 from ride.request_for_transit import RequestForTransit
@@ -15,7 +15,7 @@ from ride.request_for_transit_repository import RequestForTransitRepository
 
 
 class RequestTransitService:
-    distance_calculator: DistanceCalculator
+    route_distance_calculator: RouteDistanceCalculator
     geocoding_service: GeocodingService
     request_for_transit_repository: RequestForTransitRepository
     tariffs: Tariffs
@@ -23,12 +23,12 @@ class RequestTransitService:
     @inject
     def __init__(
         self,
-        distance_calculator: DistanceCalculator,
+        route_distance_calculator: RouteDistanceCalculator,
         geocoding_service: GeocodingService,
         request_for_transit_repository: RequestForTransitRepository,
         tariffs: Tariffs,
     ):
-        self.distance_calculator = distance_calculator
+        self.route_distance_calculator = route_distance_calculator
         self.geocoding_service = geocoding_service
         self.request_for_transit_repository = request_for_transit_repository
         self.tariffs = tariffs
@@ -37,13 +37,14 @@ class RequestTransitService:
         # FIXME later: add some exceptions handling
         geo_from: List[float] = self.geocoding_service.geocode_address(address_from)
         geo_to: List[float] = self.geocoding_service.geocode_address(address_to)
-        distance: Distance = Distance.of_km((self.distance_calculator.calculate_by_map(
-            geo_from[0],
-            geo_from[1],
-            geo_to[0],
-            geo_to[1]
-        )))
         now: datetime = datetime.now()
+        distance: Distance = Distance.of_km(self.route_distance_calculator.calculate_by_map(
+            address_from,
+            geo_from,
+            address_to,
+            geo_to,
+            now
+        ))
         tariff: Tariff = self.choose_tariff(now)
         return self.request_for_transit_repository.save(RequestForTransit(tariff=tariff, distance=distance))
 
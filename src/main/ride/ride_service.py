@@ -1,16 +1,17 @@
 import math
 from datetime import datetime
-from typing import List, Set
+from typing import Dict, List
 from uuid import UUID
 
 from injector import inject
 
+from assignment.dispatch_request import DispatchRequest
 from assignment.driver_assignment_facade import DriverAssignmentFacade
 from assignment.involved_drivers_summary import InvolvedDriversSummary
 from carfleet.car_class import CarClass
 from common.application_event_publisher import ApplicationEventPublisher
+from core.unit_of_work import UnitOfWork
 from crm.client import Client
-from driverfleet.driver_dto import DriverDTO
 from driverfleet.driver_service import DriverService
 from geolocation.address.address import Address
 from geolocation.distance import Distance
@@ -30,7 +31,7 @@ from ride.transit import Transit
 from ride.transit_demand import TransitDemand
 from ride.transit_demand_repository import TransitDemandRepository
 from ride.transit_dto import TransitDTO
-from fastapi_events.dispatcher import dispatch
+from ride.transit_view_projection import TransitViewProjection
 
 from ride.events.transit_completed import TransitCompleted
 from money import Money
@@ -64,6 +65,8 @@ class RideService:
     events_publisher: ApplicationEventPublisher
     driver_assignment_facade: DriverAssignmentFacade
     driver_service: DriverService
+    unit_of_work: UnitOfWork
+    transit_view_projection: TransitViewProjection
 
     @inject
     def __init__(
@@ -84,6 +87,8 @@ class RideService:
         events_publisher: ApplicationEventPublisher,
         driver_assignment_facade: DriverAssignmentFacade,
         driver_service: DriverService,
+        unit_of_work: UnitOfWork,
+        transit_view_projection: TransitViewProjection,
     ):
         self.request_transit_service = request_transit_service
         self.change_pickup_service = change_pickup_service
@@ -101,6 +106,8 @@ class RideService:
         self.events_publisher = events_publisher
         self.driver_assignment_facade = driver_assignment_facade
         self.driver_service = driver_service
+        self.unit_of_work = unit_of_work
+        self.transit_view_projection = transit_view_projection
 
     def create_transit(self, transit_dto: TransitDTO) -> TransitDTO:
         return self.create_transit_transaction(
@@ -131,7 +138,7 @@ class RideService:
             request_for_transit.get_estimated_price(),
             request_for_transit.get_tariff()
         )
-        return self.load_transit_by_id(request_for_transit.id)
+        return self.transit_view_projection.project(request_for_transit.request_uuid)
 
     def __find_client(self, client_id: int) -> Client:
         client: Client = self.client_repository.get_one(client_id)
@@ -155,6 +162,7 @@ class RideService:
             old_address
         )
         self.transit_details_facade.pickup_changed_to(request_uuid, new_address, new_distance)
+        self.transit_view_projection.project(request_uuid)
         self.driver_assignment_facade.notify_proposed_drivers_about_changed_destination(request_uuid)
 
     def change_transit_address_to(self, request_uuid: UUID, new_address: AddressDTO) -> None:
@@ -177,6 +185,7 @@ class RideService:
 
         self.driver_assignment_facade.notify_assigned_driver_about_changed_destination(request_uuid)
         self.transit_details_facade.destination_changed(request_uuid, new_address, distance)
+        self.transit_view_projection.project(request_uuid)
 
     def cancel_transit(self, request_uuid: UUID) -> None:
         transit_details_dto: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
@@ -185,19 +194,22 @@ class RideService:
         self.demand_service.cancel_demand(request_uuid)
         self.driver_assignment_facade.cancel(request_uuid)
         self.transit_details_facade.transit_cancelled(request_uuid)
+        self.transit_view_projection.project(request_uuid)
 
     def publish_transit(self, request_uuid: UUID) -> None:
-        transit_details_dto: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
-        if transit_details_dto is None:
-            raise AttributeError(f"Transit does not exist, id = {request_uuid}")
-        self.demand_service.publish_demand(request_uuid)
-        self.driver_assignment_facade.start_assigning_drivers(
-            request_uuid,
-            transit_details_dto.address_from,
-            transit_details_dto.car_type,
-            datetime.now()
-        )
-        self.transit_details_facade.transit_published(request_uuid, datetime.now())
+        with self.unit_of_work.begin():
+            transit_details_dto: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
+            if transit_details_dto is None:
+                raise AttributeError(f"Transit does not exist, id = {request_uuid}")
+            self.demand_service.publish_demand(request_uuid)
+            self.driver_assignment_facade.start_assigning_drivers(
+                request_uuid,
+                transit_details_dto.address_from,
+                transit_details_dto.car_type,
+                datetime.now()
+            )
+            self.transit_details_facade.transit_published(request_uuid, datetime.now())
+            self.transit_view_projection.project(request_uuid)
 
     def find_drivers_for_transit(self, request_uuid: UUID) -> TransitDetailsDTO:
         transit_details_dto: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
@@ -207,18 +219,33 @@ class RideService:
             transit_details_dto.car_type
         )
         self.transit_details_facade.drivers_are_involved(request_uuid, involved_drivers_summary)
+        self.transit_view_projection.project(request_uuid)
         return self.transit_details_facade.find_by_uuid(request_uuid)
 
+    def find_drivers_for_waiting_transits(self) -> None:
+        waiting: List[TransitDetailsDTO] = self.transit_details_facade.find_by_uuids(
+            self.driver_assignment_facade.find_waiting_for_driver_assignment()
+        )
+        involved_drivers_summaries: Dict[UUID, InvolvedDriversSummary] = self.driver_assignment_facade.dispatch([
+            DispatchRequest(transit_details_dto.request_uuid, transit_details_dto.address_from, transit_details_dto.car_type)
+            for transit_details_dto in waiting
+        ])
+        with self.unit_of_work.begin():
+            for request_uuid, involved_drivers_summary in involved_drivers_summaries.items():
+                self.transit_details_facade.drivers_are_involved(request_uuid, involved_drivers_summary)
+            self.transit_view_projection.invalidate(list(involved_drivers_summaries))
+
     def accept_transit(self, driver_id: int, request_uuid: UUID):
         if not self.driver_service.exists(driver_id) :
             raise AttributeError(f"Driver does not exist, id = {driver_id}")
-        else:
+        with self.unit_of_work.begin():
             if self.driver_assignment_facade.is_driver_assigned(request_uuid):
                 raise AttributeError(f"Driver already assigned, requestUUID = {request_uuid}")
             self.demand_service.accept_demand(request_uuid)
             self.driver_assignment_facade.accept_transit(request_uuid, driver_id)
             self.driver_service.mark_occupied(driver_id)
             self.transit_details_facade.transit_accepted(request_uuid, driver_id, datetime.now())
+            self.transit_view_projection.project(request_uuid)
 
     def start_transit(self, driver_id: int, request_uuid: UUID):
         if not self.driver_service.exists(driver_id):
@@ -233,61 +260,56 @@ class RideService:
         now: datetime = datetime.now()
         transit: Transit = self.start_transit_service.start(request_uuid)
         self.transit_details_facade.transit_started(request_uuid, transit.id, now)
+        self.transit_view_projection.project(request_uuid)
 
     def reject_transit(self, driver_id: int, request_uuid: UUID):
         if not self.driver_service.exists(driver_id):
             raise AttributeError(f"driver_does_not_exist, id = {driver_id}")
         self.driver_assignment_facade.reject_transit(request_uuid, driver_id)
+        self.transit_view_projection.project(request_uuid)
 
     def complete_transit(self, driver_id: int, request_uuid: UUID, destination: AddressDTO):
         self._complete_transit(driver_id, request_uuid, destination.to_address_entity())
 
     def _complete_transit(self, driver_id: int, request_uuid: UUID, destination_address: Address):
-        destination_address = self.address_repository.save(destination_address)
-        transit_details: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
-        if not self.driver_service.exists(driver_id):
-            raise AttributeError(f"Driver does not exist, id = {driver_id}")
+        with self.unit_of_work.begin():
+            destination_address = self.address_repository.save(destination_address)
+            transit_details: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
+            if not self.driver_service.exists(driver_id):
+                raise AttributeError(f"Driver does not exist, id = {driver_id}")
 
-        address_from: Address = self.address_repository.get_by_hash(transit_details.address_from.hash)
-        address_to: Address = self.address_repository.get_by_hash(destination_address.hash)
-        final_price = self.complete_transit_service.complete_transit(
-            driver_id,
-            request_uuid,
-            address_from,
-            address_to
-        )
-        driver_fee: Money = self.driver_fee_service.calculate_driver_fee(final_price, driver_id)
-        self.driver_service.mark_not_occupied(driver_id)
-        self.transit_details_facade.transit_completed(request_uuid, datetime.now(), final_price, driver_fee)
-        self.awards_service.register_miles(transit_details.client.id, transit_details.transit_id)
-        self.invoice_generator.generate(
-            final_price.to_int(),
-            f"{transit_details.client.name} {transit_details.client.last_name}"
-        )
-        self.events_publisher.publish_event_object(TransitCompleted(
-            transit_details.client.id,
-            transit_details.transit_id,
-            transit_details.address_from.hash,
-            destination_address.hash,
-            transit_details.started,
-            datetime.now(),
-            datetime.now()
-        ))
+            address_from: Address = self.address_repository.get_by_hash(transit_details.address_from.hash)
+            address_to: Address = self.address_repository.get_by_hash(destination_address.hash)
+            final_price = self.complete_transit_service.complete_transit(
+                driver_id,
+                request_uuid,
+                address_from,
+                address_to
+            )
+            driver_fee: Money = self.driver_fee_service.calculate_driver_fee(final_price, driver_id)
+            self.driver_service.mark_not_occupied(driver_id)
+            self.transit_details_facade.transit_completed(request_uuid, datetime.now(), final_price, driver_fee)
+            self.awards_service.register_miles(transit_details.client.id, transit_details.transit_id)
+            self.invoice_generator.generate(
+                final_price.to_int(),
+                f"{transit_details.client.name} {transit_details.client.last_name}"
+            )
+            self.transit_view_projection.project(request_uuid)
+            self.events_publisher.publish_event_object(TransitCompleted(
+                transit_details.client.id,
+                transit_details.transit_id,
+                transit_details.address_from.hash,
+                destination_address.hash,
+                transit_details.started,
+                datetime.now(),
+                datetime.now()
+            ))
 
     def load_transit_by_uuid(self, request_uuid: UUID) -> TransitDTO:
-        involved_drivers_summary: InvolvedDriversSummary = self.driver_assignment_facade.load_involved_drivers_uuid(
-            request_uuid
-        )
-        transit_details: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
-        proposed_drivers: Set[DriverDTO] = self.driver_service.load_drivers(involved_drivers_summary.proposed_drivers)
-        driver_rejections: Set[DriverDTO] = self.driver_service.load_drivers(involved_drivers_summary.driver_rejections)
-
-        return TransitDTO(
-            transit_details=transit_details,
-            proposed_drivers=proposed_drivers,
-            driver_rejections=driver_rejections,
-            assigned_driver=involved_drivers_summary.assigned_driver
-        )
+        return self.transit_view_projection.assemble(request_uuid)
+
+    def load_transit_view(self, request_uuid: UUID) -> str:
+        return self.transit_view_projection.find_document(request_uuid)
 
     def load_transit_by_id(self, request_id: int) -> TransitDTO:
         request_uuid: UUID = self.get_request_uuid(request_id)
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from fastapi import Response
 from fastapi_injector import Injected
 
 from geolocation.address.address_dto import AddressDTO
@@ -14,9 +15,9 @@ transit_router = InferringRouter(tags=["TransitController"])
 class TransitController:
     ride_service: RideService = Injected(RideService)
 
-    @transit_router.get("/transits/{request_uuid}")
-    def get_transit(self, request_uuid: UUID) -> TransitDTO:
-        return self.ride_service.load_transit_by_uuid(request_uuid)
+    @transit_router.get("/transits/{request_uuid}", response_model=TransitDTO)
+    def get_transit(self, request_uuid: UUID) -> Response:
+        return Response(content=self.ride_service.load_transit_view(request_uuid), media_type="application/json")
 
     @transit_router.post("/transits/")
     def create_transit(self, transit_dto: TransitDTO) -> TransitDTO:
@@ -4,6 +4,8 @@ from uuid import UUID
 from injector import inject
 from sqlmodel import Session
 
+from core.identity_map import cached
+from core.unit_of_work import flush_or_commit
 from ride.transit_demand import TransitDemand
 
 
@@ -15,10 +17,11 @@ class TransitDemandRepository:
         self.session = session
 
     def find_by_transit_request_uuid(self, request_uuid: UUID) -> TransitDemand:
-        return self.session.query(TransitDemand).where(TransitDemand.transit_request_uuid == request_uuid).first()
+        return cached(TransitDemand, "transit_request_uuid", request_uuid, lambda: self.session.query(
+            TransitDemand
+        ).where(TransitDemand.transit_request_uuid == request_uuid).first())
 
     def save(self, transit_demand: TransitDemand) -> Optional[TransitDemand]:
         self.session.add(transit_demand)
-        self.session.commit()
-        self.session.refresh(transit_demand)
+        flush_or_commit(self.session, transit_demand)
         return transit_demand
@@ -62,7 +62,7 @@ class TransitDTO(BaseModel):
                 lambda driver: driver.id == assigned_driver,
                 proposed_drivers
             ), None)
-            self.proposed_drivers = list(proposed_drivers)
+            self.proposed_drivers = sorted(proposed_drivers, key=lambda driver: driver.id)
 
         if transit_details is not None:
             if hasattr(transit_details, "transit_id"):
@@ -5,6 +5,8 @@ from uuid import UUID
 from injector import inject
 from sqlalchemy import desc, text
 
+from core.identity_map import cached
+from core.unit_of_work import flush_or_commit
 from crm.client import Client
 from driverfleet.driver import Driver
 from sqlmodel import Session
@@ -22,10 +24,14 @@ class TransitRepositoryImp:
         self.session = session
 
     def get_one(self, transit_id: int) -> Optional[Transit]:
-        return self.session.query(Transit).where(Transit.id == transit_id).first()
+        return cached(Transit, "id", transit_id, lambda: self.session.query(
+            Transit
+        ).where(Transit.id == transit_id).first())
 
     def find_by_transit_request_uuid(self, transit_request_uuid: UUID) -> Optional[Transit]:
-        return self.session.query(Transit).where(Transit.transit_request_uuid == transit_request_uuid).first()
+        return cached(Transit, "transit_request_uuid", transit_request_uuid, lambda: self.session.query(
+            Transit
+        ).where(Transit.transit_request_uuid == transit_request_uuid).first())
 
     def find_by_client_id(self, client_id: int) -> List[Transit]:
         stmt = text(
@@ -38,6 +44,5 @@ class TransitRepositoryImp:
 
     def save(self, transit: Transit) -> Optional[Transit]:
         self.session.add(transit)
-        self.session.commit()
-        self.session.refresh(transit)
+        flush_or_commit(self.session, transit)
         return transit
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Column, Enum
+from sqlmodel import Field, SQLModel
+
+from ride.details.status import Status
+
+
+class TransitView(SQLModel, table=True):
+    """One row per transit request with the TransitDTO document served by GET /transits/{uuid}."""
+    __tablename__ = "transit_view"
+    __table_args__ = {'extend_existing': True}
+
+    request_uuid: UUID = Field(primary_key=True)
+    transit_id: Optional[int] = Field(default=None, index=True)
+    client_id: Optional[int] = Field(default=None, index=True)
+    status: Optional[Status] = Field(sa_column=Column(Enum(Status), index=True))
+    document: str
+    updated_at: datetime
@@ -0,0 +1,93 @@
+import json
+import logging
+from typing import List, Optional
+from uuid import UUID
+
+from injector import inject, singleton
+
+from common.metrics import Metrics
+from config.app_properties import AppProperties
+from core.process_local_state import register_process_local_state
+from ride.details.status import Status
+from ride.transit_view import TransitView
+from ride.transit_view_projection import TransitViewProjection
+from ride.transit_view_repository import TransitViewRepository
+
+logger = logging.getLogger(__name__)
+
+
+@singleton
+class TransitViewCheckCursor:
+    """Request uuid of the last view checked, so the next check carries on where the previous one stopped."""
+    request_uuid: Optional[UUID]
+
+    def __init__(self):
+        self.request_uuid = None
+        register_process_local_state(self)
+
+    def clear(self) -> None:
+        self.request_uuid = None
+
+
+class TransitViewConsistencyChecker:
+    """Compares transit_view rows with the transits assembled from the normalized tables and repairs the
+    rows that drifted.
+
+    Only transits that can still change are checked, at most transit_view_check_limit of them per check;
+    the next check goes on from the cursor and starts over once it reaches the end.
+    The document is compared as it is served, with its drivers read live.
+    """
+    BATCH_SIZE: int = 500
+    UNFINISHED: List[Status] = [
+        Status.DRAFT,
+        Status.WAITING_FOR_DRIVER_ASSIGNMENT,
+        Status.TRANSIT_TO_PASSENGER,
+        Status.IN_TRANSIT,
+    ]
+
+    transit_view_repository: TransitViewRepository
+    transit_view_projection: TransitViewProjection
+    transit_view_check_cursor: TransitViewCheckCursor
+    app_properties: AppProperties
+    metrics: Metrics
+
+    @inject
+    def __init__(
+        self,
+        transit_view_repository: TransitViewRepository,
+        transit_view_projection: TransitViewProjection,
+        transit_view_check_cursor: TransitViewCheckCursor,
+        app_properties: AppProperties,
+        metrics: Metrics,
+    ):
+        self.transit_view_repository = transit_view_repository
+        self.transit_view_projection = transit_view_projection
+        self.transit_view_check_cursor = transit_view_check_cursor
+        self.app_properties = app_properties
+        self.metrics = metrics
+
+    def check(self) -> int:
+        repaired: int = 0
+        left: int = self.app_properties.transit_view_check_limit
+        while left > 0:
+            views: List[TransitView] = self.transit_view_repository.find_all_in_status_after(
+                self.UNFINISHED,
+                self.transit_view_check_cursor.request_uuid,
+                min(self.BATCH_SIZE, left)
+            )
+            if not views:
+                self.transit_view_check_cursor.request_uuid = None
+                break
+            for view in views:
+                expected: str = self.transit_view_projection.document_of(
+                    self.transit_view_projection.assemble(view.request_uuid)
+                )
+                served: str = self.transit_view_projection.with_live_drivers(view.document)
+                if json.loads(served) != json.loads(expected):
+                    logger.warning("Transit view of %s differs from its transit, repairing it", view.request_uuid)
+                    self.transit_view_projection.project(view.request_uuid)
+                    repaired += 1
+            self.transit_view_check_cursor.request_uuid = views[-1].request_uuid
+            left -= len(views)
+        self.metrics.increment("transit_view.repaired", repaired)
+        return repaired
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Set
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from injector import inject
+
+from assignment.driver_assignment_facade import DriverAssignmentFacade
+from assignment.involved_drivers_summary import InvolvedDriversSummary
+from driverfleet.driver_dto import DriverDTO
+from driverfleet.driver_service import DriverService
+from ride.details.transit_details_dto import TransitDetailsDTO
+from ride.details.transit_details_facade import TransitDetailsFacade
+from ride.transit_dto import TransitDTO
+from ride.transit_view import TransitView
+from ride.transit_view_repository import TransitViewRepository
+
+
+class TransitViewProjection:
+    """Keeps transit_view in step with the transit lifecycle.
+
+    Every lifecycle step stores the TransitDTO assembled from the normalized tables, so reading a transit
+    is a single row lookup. Bulk changes drop the affected rows instead and the next read assembles them again.
+    Drivers change outside the transit lifecycle, so a stored document is served with its drivers read live.
+    """
+    driver_assignment_facade: DriverAssignmentFacade
+    transit_details_facade: TransitDetailsFacade
+    driver_service: DriverService
+    transit_view_repository: TransitViewRepository
+
+    @inject
+    def __init__(
+        self,
+        driver_assignment_facade: DriverAssignmentFacade,
+        transit_details_facade: TransitDetailsFacade,
+        driver_service: DriverService,
+        transit_view_repository: TransitViewRepository,
+    ):
+        self.driver_assignment_facade = driver_assignment_facade
+        self.transit_details_facade = transit_details_facade
+        self.driver_service = driver_service
+        self.transit_view_repository = transit_view_repository
+
+    def assemble(self, request_uuid: UUID) -> TransitDTO:
+        involved_drivers_summary: InvolvedDriversSummary = self.driver_assignment_facade.load_involved_drivers_uuid(
+            request_uuid
+        )
+        transit_details: TransitDetailsDTO = self.transit_details_facade.find_by_uuid(request_uuid)
+        proposed_drivers: Set[DriverDTO] = self.driver_service.load_drivers(involved_drivers_summary.proposed_drivers)
+        driver_rejections: Set[DriverDTO] = self.driver_service.load_drivers(involved_drivers_summary.driver_rejections)
+
+        return TransitDTO(
+            transit_details=transit_details,
+            proposed_drivers=proposed_drivers,
+            driver_rejections=driver_rejections,
+            assigned_driver=involved_drivers_summary.assigned_driver
+        )
+
+    def project(self, request_uuid: UUID) -> TransitDTO:
+        transit: TransitDTO = self.assemble(request_uuid)
+        self.store(request_uuid, transit)
+        return transit
+
+    def store(self, request_uuid: UUID, transit: TransitDTO) -> str:
+        document: str = self.document_of(transit)
+        self.transit_view_repository.save(TransitView(
+            request_uuid=request_uuid,
+            transit_id=transit.id,
+            client_id=transit.client_dto.id if transit.client_dto else None,
+            status=transit.status,
+            document=document,
+            updated_at=datetime.now(),
+        ))
+        return document
+
+    def find_document(self, request_uuid: UUID) -> str:
+        document = self.transit_view_repository.find_document(request_uuid)
+        if document is None:
+            return self.store(request_uuid, self.assemble(request_uuid))
+        return self.with_live_drivers(document)
+
+    def with_live_drivers(self, document: str) -> str:
+        transit: Dict[str, Any] = json.loads(document)
+        involved: List[Dict[str, Any]] = (transit.get("proposed_drivers") or []) + [transit.get("driver") or {}]
+        ids: List[int] = list({driver["id"] for driver in involved if driver.get("id") is not None})
+        if not ids:
+            return document
+        drivers: Dict[int, Any] = {
+            driver.id: jsonable_encoder(driver) for driver in self.driver_service.load_drivers(ids)
+        }
+        transit["proposed_drivers"] = [
+            drivers.get(driver["id"], driver) for driver in transit.get("proposed_drivers") or []
+        ]
+        if transit.get("driver"):
+            transit["driver"] = drivers.get(transit["driver"]["id"], transit["driver"])
+        return json.dumps(transit)
+
+    def invalidate(self, request_uuids: List[UUID]) -> None:
+        self.transit_view_repository.delete_all_by_request_uuids(request_uuids)
+
+    @staticmethod
+    def document_of(transit: TransitDTO) -> str:
+        return json.dumps(jsonable_encoder(transit))
@@ -0,0 +1,45 @@
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from injector import inject
+from sqlalchemy import or_
+from sqlmodel import Session
+
+from core.unit_of_work import flush_or_commit
+from ride.details.status import Status
+from ride.transit_view import TransitView
+
+
+class TransitViewRepository:
+    session: Session
+
+    @inject
+    def __init__(self, session: Session):
+        self.session = session
+
+    def find_document(self, request_uuid: UUID) -> Optional[str]:
+        document = self.session.query(TransitView.document).where(TransitView.request_uuid == request_uuid).first()
+        return None if document is None else document[0]
+
+    def find_all_in_status_after(
+        self,
+        statuses: Iterable[Status],
+        request_uuid: Optional[UUID],
+        limit: int
+    ) -> List[TransitView]:
+        query = self.session.query(TransitView).where(
+            or_(TransitView.status.is_(None), TransitView.status.in_(list(statuses)))
+        )
+        if request_uuid is not None:
+            query = query.where(TransitView.request_uuid > request_uuid)
+        return query.order_by(TransitView.request_uuid).limit(limit).all()
+
+    def save(self, transit_view: TransitView) -> None:
+        self.session.merge(transit_view)
+        flush_or_commit(self.session)
+
+    def delete_all_by_request_uuids(self, request_uuids: List[UUID]) -> int:
+        # Left uncommitted, so callers can drop the views in the transaction that made them stale.
+        return self.session.query(TransitView).where(
+            TransitView.request_uuid.in_(request_uuids)
+        ).delete(synchronize_session=False)
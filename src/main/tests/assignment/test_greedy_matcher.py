@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+import numpy as np
+
+from assignment.greedy_matcher import GreedyMatcher
+
+
+class TestGreedyMatcher(TestCase):
+
+    def setUp(self):
+        self.matcher = GreedyMatcher()
+
+    def test_cheapest_pair_is_matched_first(self):
+        # given
+        costs = np.array([
+            [1.0, 2.0],
+            [0.5, 5.0],
+        ])
+
+        # expect
+        self.assertEqual([(1, 0), (0, 1)], self.matcher.match(costs))
+
+    def test_infinite_costs_are_never_matched(self):
+        # given
+        costs = np.array([
+            [np.inf, np.inf],
+            [1.0, np.inf],
+        ])
+
+        # expect
+        self.assertEqual([(1, 0)], self.matcher.match(costs))
+        self.assertEqual([], self.matcher.match(np.zeros((3, 0))))
+
+    def test_rows_losing_their_nearest_candidates_get_further_ones(self):
+        # given
+        self.matcher.CANDIDATES_PER_ROW = 2
+        costs = np.array([
+            [1.0, 2.0, 9.0],
+            [1.5, 2.5, 8.0],
+            [1.2, 2.2, 7.0],
+        ])
+
+        # when
+        matched = self.matcher.match(costs)
+
+        # then
+        self.assertEqual([(0, 0), (2, 1), (1, 2)], matched)
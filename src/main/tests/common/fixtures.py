@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any, Dict, Type, TypeVar
+from typing import Any, Dict, List, Tuple, Type, TypeVar
 
-from injector import Injector, inject
+from injector import Injector, inject, singleton
 
 from carfleet.car_class import CarClass
 from carfleet.car_type_dto import CarTypeDTO
@@ -9,6 +9,8 @@ from common.application_event_publisher import ApplicationEventPublisher
 from core.database import DatabaseModule
 from crm.claims.claim import Claim
 from crm.client import Client
+from crm.notification.driver_notification import DriverNotification
+from crm.notification.driver_notification_transport import DriverNotificationTransport
 from driverfleet.driver import Driver
 from driverfleet.driver_attribute_name import DriverAttributeName
 from driverfleet.driver_fee import DriverFee
@@ -45,6 +47,16 @@ class DefaultFakeApplicationEventPublisher(ApplicationEventPublisher):
         ...
 
 
+class FakeDriverNotificationTransport(DriverNotificationTransport):
+    sent: List[Tuple[int, DriverNotification]]
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, driver_id: int, notification: DriverNotification) -> None:
+        self.sent.append((driver_id, notification))
+
+
 class DependencyResolver:
     injector: Injector
     dependency_cache: Dict[str, Any]
@@ -56,6 +68,7 @@ class DependencyResolver:
             binder.bind(PartyRepository, to=PartyRepositoryImpl)
             binder.bind(PartyRelationshipRepository, to=PartyRelationshipRepositoryImpl)
             binder.bind(ApplicationEventPublisher, to=DefaultFakeApplicationEventPublisher)
+            binder.bind(DriverNotificationTransport, to=FakeDriverNotificationTransport, scope=singleton)
 
         self.injector = Injector([configure, DatabaseModule])
 
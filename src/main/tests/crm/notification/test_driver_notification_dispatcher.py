@@ -0,0 +1,68 @@
+import threading
+import time
+from unittest import TestCase
+
+from common.metrics import Metrics
+from crm.notification.driver_notification import DriverNotification
+from crm.notification.driver_notification_dispatcher import DriverNotificationDispatcher
+from crm.notification.driver_notification_transport import DriverNotificationTransport
+
+
+class BlockingTransport(DriverNotificationTransport):
+
+    def __init__(self):
+        self.released = threading.Event()
+        self.sent = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.lock = threading.Lock()
+
+    def send(self, driver_id: int, notification: DriverNotification) -> None:
+        with self.lock:
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        self.released.wait(5)
+        with self.lock:
+            self.concurrent -= 1
+            self.sent.append((driver_id, notification))
+
+
+class TestDriverNotificationDispatcher(TestCase):
+    POSSIBLE_TRANSIT = DriverNotification(DriverNotification.Kind.POSSIBLE_TRANSIT, "request")
+
+    def setUp(self):
+        self.transport = BlockingTransport()
+        self.dispatcher = DriverNotificationDispatcher(self.transport, Metrics())
+
+    def test_dispatch_does_not_wait_for_delivery(self):
+        # when
+        started = time.perf_counter()
+        for driver_id in range(20):
+            self.dispatcher.dispatch(driver_id, self.POSSIBLE_TRANSIT)
+        dispatched_in = time.perf_counter() - started
+
+        # then
+        self.assertLess(dispatched_in, 1)
+        self.assertEqual([], self.transport.sent)
+        # and
+        self.transport.released.set()
+        self.dispatcher.wait_until_delivered(5)
+        self.assertEqual(20, len(self.transport.sent))
+        self.assertLessEqual(self.transport.max_concurrent, DriverNotificationDispatcher.MAX_CONCURRENT_DELIVERIES)
+
+    def test_coalesces_notifications_queued_for_same_driver(self):
+        # given
+        for driver_id in range(DriverNotificationDispatcher.MAX_CONCURRENT_DELIVERIES):
+            self.dispatcher.dispatch(driver_id, DriverNotification(DriverNotification.Kind.CANCELLED_TRANSIT, "busy"))
+
+        # when
+        self.dispatcher.dispatch(100, self.POSSIBLE_TRANSIT)
+        self.dispatcher.dispatch(100, self.POSSIBLE_TRANSIT)
+        self.dispatcher.dispatch(101, self.POSSIBLE_TRANSIT)
+
+        # then
+        self.transport.released.set()
+        self.dispatcher.wait_until_delivered(5)
+        self.assertEqual(1, self.transport.sent.count((100, self.POSSIBLE_TRANSIT)))
+        self.assertEqual(1, self.transport.sent.count((101, self.POSSIBLE_TRANSIT)))
+        self.assertEqual(1, self.dispatcher.metrics.get("driver_notifications.coalesced"))
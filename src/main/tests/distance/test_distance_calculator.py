@@ -0,0 +1,81 @@
+import math
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from geolocation.distance_calculator import DistanceCalculator
+
+
+def haversine(latitude_from: float, longitude_from: float, latitude_to: float, longitude_to: float) -> float:
+    lon1 = math.radians(longitude_from)
+    lon2 = math.radians(longitude_to)
+    lat1 = math.radians(latitude_from)
+    lat2 = math.radians(latitude_to)
+    a = math.pow(math.sin((lat2 - lat1) / 2), 2) + \
+        math.cos(lat1) * math.cos(lat2) * math.pow(math.sin((lon2 - lon1) / 2), 2)
+    return 2 * math.asin(math.sqrt(a)) * 6371
+
+
+class TestDistanceCalculator(TestCase):
+
+    def setUp(self):
+        self.distance_calculator = DistanceCalculator()
+
+    def test_calculates_distance_between_two_points(self):
+        # expect
+        self.assertAlmostEqual(
+            2.004, self.distance_calculator.calculate_by_geo(53.32055555555556, -1.7297222222222221,
+                                                             53.31861111111111, -1.6997222222222223), 3)
+        self.assertEqual(0.0, self.distance_calculator.calculate_by_geo(52.0, 21.0, 52.0, 21.0))
+        self.assertIsInstance(self.distance_calculator.calculate_by_geo(52.0, 21.0, 53.0, 22.0), float)
+
+    def test_calculates_known_distances(self):
+        # expect
+        self.assertAlmostEqual(math.pi * 6371 / 180, self.distance_calculator.calculate_by_geo(0.0, 0.0, 0.0, 1.0), 9)
+        self.assertAlmostEqual(math.pi * 6371 / 180, self.distance_calculator.calculate_by_geo(10.0, 5.0, 11.0, 5.0), 9)
+        self.assertAlmostEqual(math.pi * 6371 / 2, self.distance_calculator.calculate_by_geo(90.0, 0.0, 0.0, 42.0), 9)
+        self.assertAlmostEqual(math.pi * 6371, self.distance_calculator.calculate_by_geo(0.0, 0.0, 0.0, 180.0), 9)
+        self.assertAlmostEqual(math.pi * 6371, self.distance_calculator.calculate_by_geo(45.0, 30.0, -45.0, -150.0), 6)
+
+    def test_pairwise_distances_agree_with_scalar_formula(self):
+        # given
+        generator = random.Random(42)
+        latitudes_from = [generator.uniform(-89, 89) for _ in range(1000)]
+        longitudes_from = [generator.uniform(-180, 180) for _ in range(1000)]
+        latitudes_to = [generator.uniform(-89, 89) for _ in range(1000)]
+        longitudes_to = [generator.uniform(-180, 180) for _ in range(1000)]
+
+        # when
+        distances = self.distance_calculator.calculate_by_geo_many(
+            latitudes_from, longitudes_from, latitudes_to, longitudes_to)
+
+        # then
+        for index in range(1000):
+            self.assertAlmostEqual(
+                haversine(latitudes_from[index], longitudes_from[index], latitudes_to[index], longitudes_to[index]),
+                distances[index],
+                6
+            )
+
+    def test_can_measure_one_point_against_many(self):
+        # when
+        distances = self.distance_calculator.calculate_by_geo_many(52.0, 21.0, [52.0, 53.0], [21.0, 21.0])
+
+        # then
+        self.assertEqual(0.0, distances[0])
+        self.assertAlmostEqual(111.195, distances[1], 3)
+
+    def test_calculates_length_of_path_through_consecutive_points(self):
+        # given
+        latitudes = np.array([53.32055555555556, 53.31861111111111, 53.32055555555556])
+        longitudes = np.array([-1.7297222222222221, -1.6997222222222223, -1.7297222222222221])
+
+        # expect
+        self.assertAlmostEqual(
+            2 * haversine(latitudes[0], longitudes[0], latitudes[1], longitudes[1]),
+            self.distance_calculator.calculate_path_length(latitudes, longitudes),
+            9
+        )
+        self.assertEqual(0.0, self.distance_calculator.calculate_path_length([52.0], [21.0]))
+        self.assertEqual(0.0, self.distance_calculator.calculate_path_length([], []))
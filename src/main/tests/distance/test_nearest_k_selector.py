@@ -0,0 +1,63 @@
+import random
+from typing import List, Tuple
+from unittest import TestCase
+
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.nearest_k_selector import NearestKSelector
+
+
+class TestNearestKSelector(TestCase):
+    WARSAW: Tuple[float, float] = (52.2297, 21.0122)
+
+    def setUp(self):
+        self.distance_calculator = DistanceCalculator()
+        self.selector = NearestKSelector(self.distance_calculator)
+
+    def test_selects_k_nearest_by_geodesic_distance(self):
+        # given
+        generator = random.Random(42)
+        points: List[Tuple[float, float]] = [
+            (self.WARSAW[0] + generator.uniform(-0.2, 0.2), self.WARSAW[1] + generator.uniform(-0.3, 0.3))
+            for _ in range(5000)
+        ]
+
+        # when
+        nearest = self.selector.select(points, self.WARSAW[0], self.WARSAW[1], 20, lambda point: point)
+
+        # then
+        expected = sorted(
+            points,
+            key=lambda point: self.distance_calculator.calculate_by_geo(
+                self.WARSAW[0], self.WARSAW[1], point[0], point[1])
+        )[:20]
+        self.assertEqual(expected, nearest)
+
+    def test_ranks_longitude_shorter_than_latitude_at_high_latitudes(self):
+        # given
+        north: Tuple[float, float] = (self.WARSAW[0] + 0.01, self.WARSAW[1])
+        east: Tuple[float, float] = (self.WARSAW[0], self.WARSAW[1] + 0.012)
+
+        # when
+        nearest = self.selector.select([north, east], self.WARSAW[0], self.WARSAW[1], 1, lambda point: point)
+
+        # then
+        self.assertEqual([east], nearest)
+
+    def test_returns_all_when_fewer_than_k(self):
+        # given
+        points: List[Tuple[float, float]] = [(1.0, 1.0), (0.5, 0.5)]
+
+        # expect
+        self.assertEqual([(0.5, 0.5), (1.0, 1.0)], self.selector.select(points, 0, 0, 20, lambda point: point))
+        self.assertEqual([], self.selector.select([], 0, 0, 20, lambda point: point))
+        self.assertEqual([], self.selector.select(points, 0, 0, 0, lambda point: point))
+
+    def test_can_skip_geodesic_ranking(self):
+        # given
+        points: List[Tuple[float, float]] = [(0.3, 0.0), (0.1, 0.0), (0.2, 0.0)]
+
+        # expect
+        self.assertEqual(
+            [(0.1, 0.0), (0.2, 0.0)],
+            self.selector.select(points, 0, 0, 2, lambda point: point, geodesic=False)
+        )
@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime
+from unittest import TestCase
+
+from mockito import when, ANY, unstub
+
+from assignment.assignment_status import AssignmentStatus
+from assignment.dispatch_request import DispatchRequest
+from assignment.driver_assignment import DriverAssignment
+from assignment.driver_assignment_facade import DriverAssignmentFacade
+from carfleet.car_class import CarClass
+from crm.notification.driver_notification import DriverNotification
+from crm.notification.driver_notification_transport import DriverNotificationTransport
+from core.database import create_db_and_tables, drop_db_and_tables
+from driverfleet.driver import Driver
+from geolocation.address.address_dto import AddressDTO
+
+from tests.common.fixtures import DependencyResolver, Fixtures
+
+dependency_resolver = DependencyResolver()
+
+
+class TestBatchDispatchIntegration(TestCase):
+    driver_assignment_facade: DriverAssignmentFacade = dependency_resolver.resolve_dependency(DriverAssignmentFacade)
+    fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
+    driver_notification_transport: DriverNotificationTransport = dependency_resolver.resolve_dependency(
+        DriverNotificationTransport
+    )
+
+    def setUp(self):
+        create_db_and_tables()
+        self.fixtures.an_active_car_category(CarClass.VAN)
+
+    def test_neighbouring_transits_are_proposed_to_different_drivers(self):
+        # given
+        first_request = self.waiting_transit()
+        second_request = self.waiting_transit()
+        # and
+        when(self.driver_assignment_facade.driver_tracking_service.geocoding_service).geocode_address(
+            ANY).thenReturn([52.0, 21.0]).thenReturn([52.005, 21.0])
+        # and
+        nearest: Driver = self.fixtures.a_nearby_driver("WU1212", 52.0045, 21.0, CarClass.VAN, datetime.now(), "brand")
+        further: Driver = self.fixtures.a_nearby_driver("WU1213", 52.01, 21.0, CarClass.VAN, datetime.now(), "brand")
+
+        # when
+        summaries = self.driver_assignment_facade.dispatch([
+            DispatchRequest(first_request, AddressDTO(address=self.fixtures.an_address()), CarClass.VAN),
+            DispatchRequest(second_request, AddressDTO(address=self.fixtures.an_address()), CarClass.VAN),
+        ])
+
+        # then
+        self.assertEqual({further.id}, summaries[first_request].proposed_drivers)
+        self.assertEqual({nearest.id}, summaries[second_request].proposed_drivers)
+        self.assertEqual(
+            [first_request, second_request],
+            self.driver_assignment_facade.find_waiting_for_driver_assignment()
+        )
+        # and
+        self.driver_assignment_facade.driver_notification_service.driver_notification_dispatcher.wait_until_delivered(5)
+        self.assertIn(
+            (nearest.id, DriverNotification(DriverNotification.Kind.POSSIBLE_TRANSIT, second_request)),
+            self.driver_notification_transport.sent
+        )
+
+    def test_transit_without_any_driver_in_reach_fails(self):
+        # given
+        request = self.waiting_transit()
+        # and
+        when(self.driver_assignment_facade.driver_tracking_service.geocoding_service).geocode_address(
+            ANY).thenReturn([52.0, 21.0])
+        # and
+        self.fixtures.a_nearby_driver("WU1212", 53.0, 21.0, CarClass.VAN, datetime.now(), "brand")
+
+        # when
+        summaries = self.driver_assignment_facade.dispatch([
+            DispatchRequest(request, AddressDTO(address=self.fixtures.an_address()), CarClass.VAN),
+        ])
+
+        # then
+        self.assertEqual(AssignmentStatus.DRIVER_ASSIGNMENT_FAILED, summaries[request].status)
+
+    def waiting_transit(self) -> uuid.UUID:
+        request_uuid = uuid.uuid4()
+        self.driver_assignment_facade.driver_assignment_repository.save(DriverAssignment(request_uuid, datetime.now()))
+        return request_uuid
+
+    def tearDown(self) -> None:
+        unstub()
+        drop_db_and_tables()
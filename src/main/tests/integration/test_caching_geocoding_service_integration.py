@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+from mockito import ANY, spy2, unstub, verify, when
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from geolocation.address.address import Address
+from geolocation.address.address_repository import AddressRepositoryImp
+from geolocation.caching_geocoding_service import CachingGeocodingService
+from geolocation.geocoding_cache import GeocodingCache
+from geolocation.geocoding_service import GeocodingService
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestCachingGeocodingServiceIntegration(TestCase):
+    caching_geocoding_service: CachingGeocodingService = dependency_resolver.resolve_dependency(
+        CachingGeocodingService
+    )
+    geocoding_cache: GeocodingCache = dependency_resolver.resolve_dependency(GeocodingCache)
+    address_repository: AddressRepositoryImp = dependency_resolver.resolve_dependency(AddressRepositoryImp)
+
+    def setUp(self):
+        create_db_and_tables()
+
+    def test_asks_geocoder_once_per_address(self):
+        # given
+        when(GeocodingService).geocode_address(ANY).thenReturn([52.0, 21.0])
+
+        # when
+        first = self.caching_geocoding_service.geocode_address(self.an_address("Młynarska"))
+        second = self.caching_geocoding_service.geocode_address(self.an_address("Młynarska"))
+
+        # then
+        self.assertEqual([52.0, 21.0], first)
+        self.assertEqual([52.0, 21.0], second)
+        verify(GeocodingService, times=1).geocode_address(ANY)
+
+    def test_keeps_location_on_address_row(self):
+        # given
+        address = self.address_repository.save(self.an_address("Młynarska"))
+        when(GeocodingService).geocode_address(ANY).thenReturn([52.0, 21.0])
+        self.caching_geocoding_service.geocode_address(address)
+        # and
+        self.geocoding_cache.clear()
+        when(GeocodingService).geocode_address(ANY).thenRaise(ConnectionError())
+
+        # when
+        geocoded = self.caching_geocoding_service.geocode_address(self.an_address("Młynarska"))
+
+        # then
+        self.assertEqual([52.0, 21.0], geocoded)
+
+    def test_remembers_failures(self):
+        # given
+        when(GeocodingService).geocode_address(ANY).thenRaise(ConnectionError())
+
+        # expect
+        with self.assertRaises(ConnectionError):
+            self.caching_geocoding_service.geocode_address(self.an_address("Młynarska"))
+        with self.assertRaises(ConnectionError):
+            self.caching_geocoding_service.geocode_address(self.an_address("Młynarska"))
+        verify(GeocodingService, times=1).geocode_address(ANY)
+
+    def test_resolves_addresses_that_were_never_geocoded(self):
+        # given
+        when(GeocodingService).geocode_address(ANY).thenReturn([52.0, 21.0])
+        # and
+        self.caching_geocoding_service.geocode_address(self.an_address("Młynarska"))
+        self.address_repository.save(self.an_address("Młynarska"))
+        self.address_repository.save(self.an_address("Puławska"))
+        spy2(AddressRepositoryImp.update_location_by_hash)
+
+        # when
+        resolved = self.caching_geocoding_service.geocode_unresolved()
+
+        # then
+        self.assertEqual(2, resolved)
+        self.assertEqual(
+            (52.0, 21.0), self.address_repository.find_location_by_hash(self.an_address("Młynarska").hash))
+        self.assertEqual(
+            (52.0, 21.0), self.address_repository.find_location_by_hash(self.an_address("Puławska").hash))
+        self.assertEqual(0, self.caching_geocoding_service.geocode_unresolved())
+        verify(AddressRepositoryImp, times=2).update_location_by_hash(...)
+
+    def an_address(self, street: str) -> Address:
+        address = Address(country="Polska", city="Warszawa", street=street, building_number=20)
+        address.gen_hash()
+        return address
+
+    def tearDown(self) -> None:
+        unstub()
+        drop_db_and_tables()
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from unittest import TestCase
 
 import pytz
@@ -8,8 +8,15 @@ from freezegun import freeze_time
 
 from core.database import create_db_and_tables, drop_db_and_tables
 from driverfleet.driver import Driver
+from driverfleet.driverreport.travelleddistance.travelled_distance import TimeSlot, TravelledDistance
+from driverfleet.driverreport.travelleddistance.travelled_distance_repository import (
+    TravelledDistanceRepository,
+    TravelledDistanceUpdate,
+)
+from driverfleet.driverreport.travelleddistance.travelled_distance_rollup import TravelledDistanceRollup
 from driverfleet.driverreport.travelleddistance.travelled_distance_service import TravelledDistanceService
 from tracking.driver_position import DriverPosition
+from tracking.driver_position_dto import DriverPositionDTO
 
 from tests.common.fixtures import DependencyResolver, Fixtures
 
@@ -25,6 +32,10 @@ class TestCalculateDriverTravelledDistanceIntegration(TestCase):
         TravelledDistanceService
     )
 
+    travelled_distance_repository: TravelledDistanceRepository = dependency_resolver.resolve_dependency(
+        TravelledDistanceRepository
+    )
+
     fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
 
     def setUp(self):
@@ -122,6 +133,114 @@ class TestCalculateDriverTravelledDistanceIntegration(TestCase):
         # then
         self.assertEqual("12.026km", distance.print_in("km"))
 
+    def test_range_spanning_days_sums_the_same_as_slots(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        # and
+        self.drive_every_day(driver, 3)
+
+        # when
+        self.travelled_distance_service.flush()
+
+        # then
+        for beginning, to in [
+            (self.NOON - relativedelta(days=1), self.NOON + relativedelta(days=4)),
+            (self.NOON, self.NOON + relativedelta(days=2, minutes=5)),
+            (self.NOON + relativedelta(minutes=5), self.NOON + relativedelta(days=2, hours=1)),
+            (self.NOON + relativedelta(hours=-1), self.NOON + relativedelta(hours=1)),
+        ]:
+            self.assertAlmostEqual(
+                self.travelled_distance_repository.calculate_distance_from_slots(beginning, to, driver.id),
+                self.travelled_distance_repository.calculate_distance(beginning, to, driver.id),
+                9
+            )
+        self.assertEqual(
+            "12.026km",
+            self.travelled_distance_service.calculate_distance(
+                driver.id, self.NOON, self.NOON + relativedelta(days=2, minutes=5)).print_in("km")
+        )
+
+    def test_rollups_can_be_rebuilt_from_slots(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        # and
+        self.drive_every_day(driver, 2)
+        self.travelled_distance_service.flush()
+        # and
+        self.travelled_distance_repository.session.query(TravelledDistanceRollup).delete()
+        self.travelled_distance_repository.session.commit()
+
+        # when
+        self.travelled_distance_repository.rebuild_rollups()
+
+        # then
+        distance = self.travelled_distance_service.calculate_distance(
+            driver.id, self.NOON - relativedelta(days=1), self.NOON + relativedelta(days=3))
+        self.assertEqual("8.017km", distance.print_in("km"))
+
+    def test_range_given_in_another_zone_is_read_by_wall_clock(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        noon_in_warsaw = self.NOON.replace(tzinfo=timezone(timedelta(hours=2)))
+        # and
+        with freeze_time(self.NOON):
+            self.travelled_distance_service.add_positions(driver.id, [
+                self.a_position(driver, 53.32055555555556, -1.7297222222222221, noon_in_warsaw),
+                self.a_position(driver, 53.31861111111111, -1.6997222222222223, noon_in_warsaw),
+                self.a_position(driver, 53.32055555555556, -1.7297222222222221, noon_in_warsaw),
+            ])
+            self.travelled_distance_service.flush()
+
+        # when
+        distance = self.travelled_distance_service.calculate_distance(
+            driver.id, noon_in_warsaw - relativedelta(hours=1), noon_in_warsaw + relativedelta(hours=1))
+
+        # then
+        self.assertEqual("4.009km", distance.print_in("km"))
+        self.assertAlmostEqual(
+            4.009,
+            self.travelled_distance_repository.calculate_distance_from_slots(
+                noon_in_warsaw - relativedelta(hours=1), noon_in_warsaw + relativedelta(hours=1), driver.id),
+            3
+        )
+
+    def test_writers_updating_same_slot_add_up_their_distances(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        slot: TimeSlot = TimeSlot.slot_that_contains(self.NOON)
+        stored = TravelledDistance(driver_id=driver.id, time_slot=slot, last_latitude=53.32, last_longitude=-1.72)
+        stored.distance = 1
+        self.travelled_distance_repository.save_all_and_update([stored], [])
+
+        # when
+        self.travelled_distance_repository.save_all_and_update(
+            [], [TravelledDistanceUpdate(driver.id, slot.beginning, 3, 1, 53.31, -1.69)])
+        # and
+        self.travelled_distance_repository.save_all_and_update(
+            [], [TravelledDistanceUpdate(driver.id, slot.beginning, 2, 1, 53.32, -1.72)])
+
+        # then
+        self.assertEqual(
+            4,
+            self.travelled_distance_repository.calculate_distance_from_slots(slot.beginning, slot.end, driver.id)
+        )
+        self.assertEqual(
+            4,
+            self.travelled_distance_repository.calculate_distance(
+                slot.beginning - relativedelta(days=1), slot.end + relativedelta(days=1), driver.id)
+        )
+
+    def a_position(self, driver: Driver, latitude: float, longitude: float, seen_at: datetime) -> DriverPositionDTO:
+        return DriverPositionDTO(driver_id=driver.id, latitude=latitude, longitude=longitude, seen_at=seen_at)
+
+    def drive_every_day(self, driver: Driver, days: int) -> None:
+        for day in range(days):
+            moment = self.NOON + relativedelta(days=day)
+            with freeze_time(moment):
+                self.travelled_distance_service.add_position(driver.id, 53.32055555555556, -1.7297222222222221, moment)
+                self.travelled_distance_service.add_position(driver.id, 53.31861111111111, -1.6997222222222223, moment)
+                self.travelled_distance_service.add_position(driver.id, 53.32055555555556, -1.7297222222222221, moment)
+
     def tearDown(self) -> None:
         drop_db_and_tables()
 
@@ -71,6 +71,32 @@ class TestCarTypeUpdateIntegration(TestCase):
         loaded = self.load(created.id)
         self.assertEqual(current_active_cars_count - 1, loaded.active_cars_counter)
 
+    def test_active_car_classes_are_cached_until_car_type_changes(self):
+        # given
+        created = self.create_car_class("duże i dobre", CarClass.VAN)
+        for _ in range(created.min_no_of_cars_to_activate_class):
+            self.car_type_service.register_car(CarClass.VAN)
+        self.car_type_service.activate(created.id)
+        # and
+        metrics = self.car_type_service.active_car_classes_cache.metrics
+        misses = metrics.get("active_car_classes_cache.misses")
+        hits = metrics.get("active_car_classes_cache.hits")
+
+        # when
+        self.assertEqual([CarClass.VAN], self.car_type_service.find_active_car_classes())
+        self.assertEqual([CarClass.VAN], self.car_type_service.find_active_car_classes())
+
+        # then
+        self.assertEqual(misses + 1, metrics.get("active_car_classes_cache.misses"))
+        self.assertEqual(hits + 1, metrics.get("active_car_classes_cache.hits"))
+
+        # when
+        self.car_type_service.deactivate(created.id)
+
+        # then
+        self.assertEqual([], self.car_type_service.find_active_car_classes())
+        self.assertEqual(misses + 2, metrics.get("active_car_classes_cache.misses"))
+
     def register_active_car(self, car_class: CarClass):
         self.car_type_service.register_active_car(car_class)
 
@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime
+from unittest import TestCase
+
+from sqlalchemy import text
+
+from assignment.driver_assignment import DriverAssignment
+from assignment.driver_assignment_facade import DriverAssignmentFacade
+from assignment.driver_assignment_repository import DriverAssignmentRepository
+from core.database import create_db_and_tables, drop_db_and_tables
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestDriverAssignmentRepositoryIntegration(TestCase):
+    DRIVER: int = 1
+    SECOND_DRIVER: int = 2
+
+    driver_assignment_repository: DriverAssignmentRepository = dependency_resolver.resolve_dependency(
+        DriverAssignmentRepository
+    )
+    driver_assignment_facade: DriverAssignmentFacade = dependency_resolver.resolve_dependency(
+        DriverAssignmentFacade
+    )
+
+    def setUp(self):
+        create_db_and_tables()
+
+    def test_proposals_and_rejections_survive_reload(self):
+        # given
+        request_uuid = uuid.uuid4()
+        assignment = DriverAssignment(request_uuid, datetime.now())
+        assignment.propose_to(self.DRIVER)
+        assignment.propose_to(self.SECOND_DRIVER)
+        self.driver_assignment_repository.save(assignment)
+        # and
+        assignment.reject_by(self.SECOND_DRIVER)
+        self.driver_assignment_repository.save(assignment)
+        self.driver_assignment_repository.session.expunge_all()
+
+        # when
+        loaded = self.driver_assignment_repository.find_by_request_uuid(request_uuid)
+
+        # then
+        self.assertEqual({self.DRIVER, self.SECOND_DRIVER}, loaded.get_proposed_drivers())
+        self.assertEqual({self.SECOND_DRIVER}, loaded.get_driver_rejections())
+        self.assertFalse(loaded.can_propose_to(self.SECOND_DRIVER))
+
+    def test_rejection_through_facade_survives_reload(self):
+        # given
+        request_uuid = uuid.uuid4()
+        assignment = DriverAssignment(request_uuid, datetime.now())
+        assignment.propose_to(self.DRIVER)
+        self.driver_assignment_repository.save(assignment)
+
+        # when
+        self.driver_assignment_facade.reject_transit(request_uuid, self.DRIVER)
+
+        # then
+        self.driver_assignment_repository.session.expunge_all()
+        loaded = self.driver_assignment_repository.find_by_request_uuid(request_uuid)
+        self.assertEqual({self.DRIVER}, loaded.get_driver_rejections())
+        self.assertFalse(loaded.can_propose_to(self.DRIVER))
+
+    def test_backfills_involvements_from_legacy_json_columns(self):
+        # given
+        request_uuid = uuid.uuid4()
+        self.driver_assignment_repository.save(DriverAssignment(request_uuid, datetime.now()))
+        # and
+        session = self.driver_assignment_repository.session
+        session.execute(text("ALTER TABLE driverassignment ADD COLUMN proposed_drivers VARCHAR"))
+        session.execute(text("ALTER TABLE driverassignment ADD COLUMN drivers_rejections VARCHAR"))
+        session.execute(
+            text("UPDATE driverassignment SET proposed_drivers = '[1, 2]', drivers_rejections = '[2]'")
+        )
+        session.commit()
+
+        # when
+        self.driver_assignment_repository.backfill_involvements_from_json_columns()
+        self.driver_assignment_repository.backfill_involvements_from_json_columns()
+
+        # then
+        session.expunge_all()
+        loaded = self.driver_assignment_repository.find_by_request_uuid(request_uuid)
+        self.assertEqual({self.DRIVER, self.SECOND_DRIVER}, loaded.get_proposed_drivers())
+        self.assertEqual({self.SECOND_DRIVER}, loaded.get_driver_rejections())
+
+    def test_finds_waiting_assignments_involving_driver(self):
+        # given
+        involving = DriverAssignment(uuid.uuid4(), datetime.now())
+        involving.propose_to(self.DRIVER)
+        self.driver_assignment_repository.save(involving)
+        # and
+        cancelled = DriverAssignment(uuid.uuid4(), datetime.now())
+        cancelled.propose_to(self.DRIVER)
+        cancelled.cancel()
+        self.driver_assignment_repository.save(cancelled)
+        # and
+        other = DriverAssignment(uuid.uuid4(), datetime.now())
+        other.propose_to(self.SECOND_DRIVER)
+        self.driver_assignment_repository.save(other)
+
+        # when
+        found = self.driver_assignment_repository.find_all_waiting_involving(self.DRIVER)
+
+        # then
+        self.assertEqual([involving.request_uuid], [assignment.request_uuid for assignment in found])
+
+    def tearDown(self) -> None:
+        drop_db_and_tables()
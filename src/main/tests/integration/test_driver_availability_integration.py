@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+from sqlalchemy import update
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from driverfleet.driver import Driver
+from driverfleet.driver_availability_snapshot import DriverAvailabilitySnapshot
+from driverfleet.driver_service import DriverService
+
+from tests.common.fixtures import DependencyResolver, Fixtures
+
+dependency_resolver = DependencyResolver()
+
+
+class TestDriverAvailabilityIntegration(TestCase):
+    driver_service: DriverService = dependency_resolver.resolve_dependency(DriverService)
+    driver_availability_snapshot: DriverAvailabilitySnapshot = dependency_resolver.resolve_dependency(
+        DriverAvailabilitySnapshot
+    )
+    fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
+
+    def setUp(self):
+        create_db_and_tables()
+        self.original_ttl = self.driver_service.app_properties.driver_availability_snapshot_ttl_in_seconds
+
+    def test_follows_occupation_and_status_changes(self):
+        # given
+        free = self.fixtures.an_active_regular_driver()
+        occupied = self.fixtures.an_active_regular_driver()
+        inactive = self.fixtures.an_active_regular_driver()
+        released = self.fixtures.an_active_regular_driver()
+
+        # when
+        self.driver_service.mark_occupied(occupied.id)
+        self.driver_service.change_driver_status(inactive.id, Driver.Status.INACTIVE)
+        self.driver_service.mark_occupied(released.id)
+        self.driver_service.mark_not_occupied(released.id)
+
+        # then
+        self.assertEqual(
+            {free.id, released.id},
+            self.driver_service.find_available_driver_ids([free.id, occupied.id, inactive.id, released.id])
+        )
+
+    def test_loads_drivers_it_has_not_seen_yet(self):
+        # given
+        free = self.fixtures.an_active_regular_driver()
+        occupied = self.fixtures.an_active_regular_driver()
+        self.driver_service.mark_occupied(occupied.id)
+        # and
+        self.driver_availability_snapshot.clear()
+
+        # when
+        available = self.driver_service.find_available_driver_ids([free.id, occupied.id, 404])
+
+        # then
+        self.assertEqual({free.id}, available)
+
+    def test_picks_up_changes_of_other_processes_after_ttl(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        self.assertEqual({driver.id}, self.driver_service.find_available_driver_ids([driver.id]))
+        # and
+        session = self.driver_service.driver_repository.session
+        session.execute(update(Driver).where(Driver.id == driver.id).values(is_occupied=True))
+        session.commit()
+
+        # expect
+        self.driver_service.app_properties.driver_availability_snapshot_ttl_in_seconds = 3600
+        self.assertEqual({driver.id}, self.driver_service.find_available_driver_ids([driver.id]))
+        # and
+        self.driver_service.app_properties.driver_availability_snapshot_ttl_in_seconds = 0
+        self.assertEqual(set(), self.driver_service.find_available_driver_ids([driver.id]))
+
+    def tearDown(self) -> None:
+        self.driver_service.app_properties.driver_availability_snapshot_ttl_in_seconds = self.original_ttl
+        drop_db_and_tables()
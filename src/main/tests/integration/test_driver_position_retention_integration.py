@@ -0,0 +1,131 @@
+import csv
+import gzip
+import shutil
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+from dateutil.relativedelta import relativedelta
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from tracking.driver_position import DriverPosition
+from tracking.driver_position_repository import DriverPositionRepositoryImp
+from tracking.driver_position_retention_service import DriverPositionRetentionService
+from tracking.driver_position_track import DriverPositionTrack
+
+from tests.common.fixtures import DependencyResolver, Fixtures
+
+dependency_resolver = DependencyResolver()
+
+
+class TestDriverPositionRetentionIntegration(TestCase):
+    NOW = datetime(1990, 6, 1, 12, 0)
+
+    retention_service: DriverPositionRetentionService = dependency_resolver.resolve_dependency(
+        DriverPositionRetentionService
+    )
+    driver_position_repository: DriverPositionRepositoryImp = dependency_resolver.resolve_dependency(
+        DriverPositionRepositoryImp
+    )
+    fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
+
+    def setUp(self):
+        create_db_and_tables()
+        self.archive_directory = tempfile.mkdtemp()
+        self.original_archive_directory = self.retention_service.app_properties.driver_position_archive_directory
+        self.retention_service.app_properties.driver_position_archive_directory = self.archive_directory
+        self.original_batch_size = self.retention_service.app_properties.driver_position_retention_batch_size
+
+    def test_archives_and_downsamples_positions_older_than_retention(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        old_day = self.NOW - relativedelta(days=100)
+        # and
+        self.driver_position_repository.save_all([
+            DriverPosition(driver_id=driver.id, latitude=52.0 + second / 1000, longitude=21.0,
+                           seen_at=old_day + relativedelta(seconds=second))
+            for second in range(0, 120, 10)
+        ])
+        # and
+        self.driver_position_repository.save(
+            DriverPosition(driver_id=driver.id, latitude=52.0, longitude=21.0, seen_at=self.NOW))
+
+        # when
+        archived = self.retention_service.apply_retention(self.NOW)
+
+        # then
+        self.assertEqual(12, archived)
+        self.assertEqual(
+            [self.NOW],
+            [position.seen_at for position in self.driver_position_repository.find_all_by_seen_at_after(old_day)]
+        )
+        # and
+        track = self.driver_position_repository.session.query(DriverPositionTrack).order_by(
+            DriverPositionTrack.seen_at).all()
+        self.assertEqual(
+            [old_day + relativedelta(seconds=second) for second in (0, 30, 60, 90)],
+            [point.seen_at for point in track]
+        )
+        # and
+        with gzip.open(self.retention_service.archive_path(old_day), "rt", newline="") as archive:
+            rows = list(csv.reader(archive))
+        self.assertEqual(list(DriverPositionRetentionService.ARCHIVE_COLUMNS), rows[0])
+        self.assertEqual(12, len(rows) - 1)
+
+    def test_archives_day_batch_by_batch_of_drivers(self):
+        # given
+        first = self.fixtures.an_active_regular_driver()
+        second = self.fixtures.an_active_regular_driver()
+        old_day = self.NOW - relativedelta(days=100)
+        # and
+        self.driver_position_repository.save_all([
+            DriverPosition(driver_id=driver.id, latitude=52.0, longitude=21.0,
+                           seen_at=old_day + relativedelta(seconds=second))
+            for driver in (first, second)
+            for second in (0, 40)
+        ])
+        # and
+        self.driver_position_repository.session.add(
+            DriverPositionTrack(driver_id=second.id, seen_at=old_day, latitude=52.0, longitude=21.0))
+        self.driver_position_repository.session.commit()
+        # and
+        self.retention_service.app_properties.driver_position_retention_batch_size = 1
+
+        # when
+        archived = self.retention_service.apply_retention(self.NOW)
+
+        # then
+        self.assertEqual(4, archived)
+        self.assertEqual([], self.driver_position_repository.find_all_by_seen_at_after(old_day))
+        # and
+        track = self.driver_position_repository.session.query(DriverPositionTrack).order_by(
+            DriverPositionTrack.driver_id, DriverPositionTrack.seen_at).all()
+        self.assertEqual(
+            [(driver.id, old_day + relativedelta(seconds=second)) for driver in (first, second) for second in (0, 40)],
+            [(point.driver_id, point.seen_at) for point in track]
+        )
+        # and
+        with gzip.open(self.retention_service.archive_path(old_day), "rt", newline="") as archive:
+            rows = list(csv.reader(archive))
+        self.assertEqual(4, len([row for row in rows if row != list(DriverPositionRetentionService.ARCHIVE_COLUMNS)]))
+
+    def test_keeps_positions_within_retention(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+        # and
+        self.driver_position_repository.save(DriverPosition(
+            driver_id=driver.id, latitude=52.0, longitude=21.0, seen_at=self.NOW - relativedelta(days=89)))
+
+        # when
+        archived = self.retention_service.apply_retention(self.NOW)
+
+        # then
+        self.assertEqual(0, archived)
+        self.assertEqual(
+            1, len(self.driver_position_repository.find_all_by_seen_at_after(self.NOW - relativedelta(days=90))))
+
+    def tearDown(self) -> None:
+        self.retention_service.app_properties.driver_position_archive_directory = self.original_archive_directory
+        self.retention_service.app_properties.driver_position_retention_batch_size = self.original_batch_size
+        shutil.rmtree(self.archive_directory)
+        drop_db_and_tables()
@@ -0,0 +1,101 @@
+from datetime import datetime
+from unittest import TestCase
+
+from dateutil.relativedelta import relativedelta
+from freezegun import freeze_time
+
+from carfleet.car_class import CarClass
+from core.database import create_db_and_tables, drop_db_and_tables
+from core.unit_of_work import UnitOfWork
+from tracking.driver_session import DriverSession
+from tracking.driver_session_registry import DriverSessionRegistry
+from tracking.driver_session_service import DriverSessionService
+
+from tests.common.fixtures import DependencyResolver, Fixtures
+
+dependency_resolver = DependencyResolver()
+
+
+class TestDriverSessionRegistryIntegration(TestCase):
+    driver_session_service: DriverSessionService = dependency_resolver.resolve_dependency(DriverSessionService)
+    driver_session_registry: DriverSessionRegistry = dependency_resolver.resolve_dependency(DriverSessionRegistry)
+    unit_of_work: UnitOfWork = dependency_resolver.resolve_dependency(UnitOfWork)
+    fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
+
+    def setUp(self):
+        create_db_and_tables()
+        self.fixtures.an_active_car_category(CarClass.VAN)
+        self.fixtures.an_active_car_category(CarClass.PREMIUM)
+
+    def test_follows_log_ins_and_log_outs(self):
+        # given
+        van_driver = self.fixtures.an_active_regular_driver()
+        premium_driver = self.fixtures.an_active_regular_driver()
+        logged_out_driver = self.fixtures.an_active_regular_driver()
+        # and
+        self.driver_session_service.log_in(van_driver.id, "WU1212", CarClass.VAN, "BRAND")
+        self.driver_session_service.log_in(premium_driver.id, "WU1213", CarClass.PREMIUM, "BRAND")
+        session = self.driver_session_service.log_in(logged_out_driver.id, "WU1214", CarClass.VAN, "BRAND")
+        # and
+        self.driver_session_service.log_out(session.id)
+        self.driver_session_service.log_out_current_session(premium_driver.id)
+
+        # when
+        logged = self.driver_session_service.find_currently_logged_car_classes(
+            [van_driver.id, premium_driver.id, logged_out_driver.id], [CarClass.VAN, CarClass.PREMIUM])
+
+        # then
+        self.assertEqual({van_driver.id: CarClass.VAN}, logged)
+
+    def test_is_rebuilt_from_sessions_that_are_still_open(self):
+        # given
+        van_driver = self.fixtures.an_active_regular_driver()
+        premium_driver = self.fixtures.an_active_regular_driver()
+        self.driver_session_service.log_in(van_driver.id, "WU1212", CarClass.VAN, "BRAND")
+        session = self.driver_session_service.log_in(premium_driver.id, "WU1213", CarClass.PREMIUM, "BRAND")
+        self.driver_session_service.log_out(session.id)
+        # and
+        self.driver_session_registry.clear()
+
+        # when
+        logged = self.driver_session_service.find_currently_logged_driver_ids(
+            [van_driver.id, premium_driver.id], [CarClass.VAN, CarClass.PREMIUM])
+
+        # then
+        self.assertTrue(self.driver_session_registry.is_loaded())
+        self.assertEqual([van_driver.id], logged)
+
+    def test_picks_up_sessions_of_other_processes_after_ttl(self):
+        # given
+        van_driver = self.fixtures.an_active_regular_driver()
+        self.driver_session_service.load_logged_in_sessions()
+        # and
+        self.driver_session_service.driver_session_repository.save(DriverSession(
+            driver_id=van_driver.id, logged_at=datetime.now(), car_class=CarClass.VAN,
+            plates_number="WU1212", car_brand="BRAND"))
+
+        # when
+        with freeze_time(datetime.now() + relativedelta(
+                seconds=self.driver_session_service.app_properties.driver_session_registry_ttl_in_seconds)):
+            logged = self.driver_session_service.find_currently_logged_driver_ids([van_driver.id], [CarClass.VAN])
+
+        # then
+        self.assertEqual([van_driver.id], logged)
+
+    def test_log_in_rolled_back_is_never_seen(self):
+        # given
+        van_driver = self.fixtures.an_active_regular_driver()
+        self.driver_session_service.load_logged_in_sessions()
+
+        # when
+        with self.assertRaises(AttributeError):
+            with self.unit_of_work.begin():
+                self.driver_session_service.log_in(van_driver.id, "WU1212", CarClass.VAN, "BRAND")
+                raise AttributeError("Driver does not exists, id = 1")
+
+        # then
+        self.assertEqual(
+            [], self.driver_session_service.find_currently_logged_driver_ids([van_driver.id], [CarClass.VAN]))
+
+    def tearDown(self) -> None:
+        drop_db_and_tables()
@@ -1,13 +1,25 @@
 from datetime import datetime
+from typing import Dict, List, Tuple
 from unittest import TestCase
 
 import pytz
 from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
+from mockito import when, ANY, spy2, verify, unstub
+from sqlalchemy import event
 
+from carfleet.car_class import CarClass
 from core.database import create_db_and_tables, drop_db_and_tables
+from core.unit_of_work import UnitOfWork
 from geolocation.distance import Distance
 from driverfleet.driver import Driver
+from driverfleet.driverreport.travelleddistance.travelled_distance import TimeSlot
+from driverfleet.driverreport.travelleddistance.travelled_distance_repository import TravelledDistanceRepository
+from driverfleet.driverreport.travelleddistance.travelled_distance_service import TravelledDistanceService
+from geolocation.address.address_dto import AddressDTO
+from tracking.driver_position import DriverPosition
+from tracking.driver_position_dto import DriverPositionDTO
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
 from tracking.driver_tracking_service import DriverTrackingService
 from tests.common.fixtures import DependencyResolver, Fixtures
 
@@ -17,11 +29,19 @@ dependency_resolver = DependencyResolver()
 class TestDriverTrackingServiceIntegration(TestCase):
     NOON = datetime(1989, 12, 12, 12, 12).astimezone(pytz.utc)
     NOON_FIVE = NOON + relativedelta(minutes=5)
+    NOON_TEN = NOON + relativedelta(minutes=10)
 
     driver_tracking_service: DriverTrackingService = dependency_resolver.resolve_dependency(
         DriverTrackingService
     )
 
+    travelled_distance_service: TravelledDistanceService = dependency_resolver.resolve_dependency(
+        TravelledDistanceService
+    )
+    travelled_distance_repository: TravelledDistanceRepository = dependency_resolver.resolve_dependency(
+        TravelledDistanceRepository
+    )
+
     fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
 
     def setUp(self):
@@ -44,5 +64,288 @@ class TestDriverTrackingServiceIntegration(TestCase):
             # then
             self.assertEqual("4.009km", distance.print_in("km"))
 
+    def test_can_calculate_travelled_distance_from_batch_of_positions(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        with freeze_time(self.NOON):
+            # and
+            self.driver_tracking_service.register_positions([
+                DriverPositionDTO(
+                    driver_id=driver.id, latitude=53.31861111111111, longitude=-1.6997222222222223, seen_at=self.NOON),
+                DriverPositionDTO(
+                    driver_id=driver.id, latitude=53.32055555555556, longitude=-1.7297222222222221, seen_at=self.NOON),
+                DriverPositionDTO(
+                    driver_id=driver.id, latitude=53.32055555555556, longitude=-1.7297222222222221, seen_at=self.NOON),
+            ])
+
+            # when
+            distance: Distance = self.driver_tracking_service.calculate_travelled_distance(
+                driver.id, self.NOON, self.NOON_FIVE)
+
+            # then
+            self.assertEqual("2.004km", distance.print_in("km"))
+
+    def test_travelled_distance_of_open_slot_is_written_on_flush(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        with freeze_time(self.NOON):
+            self.driver_tracking_service.register_position(driver.id, 53.32055555555556, -1.7297222222222221, self.NOON)
+            self.driver_tracking_service.register_position(driver.id, 53.31861111111111, -1.6997222222222223, self.NOON)
+
+            # expect
+            self.assertEqual(0, self.written_distance(driver))
+            self.assertEqual("2.004km", self.driver_tracking_service.calculate_travelled_distance(
+                driver.id, self.NOON, self.NOON_FIVE).print_in("km"))
+
+            # when
+            self.travelled_distance_service.flush()
+
+            # then
+            self.assertAlmostEqual(2.004, self.written_distance(driver), 3)
+            self.assertEqual("2.004km", self.driver_tracking_service.calculate_travelled_distance(
+                driver.id, self.NOON, self.NOON_FIVE).print_in("km"))
+
+    def test_travelled_distance_is_written_when_slot_closes(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        with freeze_time(self.NOON):
+            self.driver_tracking_service.register_position(driver.id, 53.32055555555556, -1.7297222222222221, self.NOON)
+            self.driver_tracking_service.register_position(driver.id, 53.31861111111111, -1.6997222222222223, self.NOON)
+
+        # when
+        with freeze_time(self.NOON_FIVE):
+            self.driver_tracking_service.register_position(
+                driver.id, 53.32055555555556, -1.7297222222222221, self.NOON_FIVE)
+
+            # then
+            self.assertAlmostEqual(2.004, self.written_distance(driver), 3)
+            self.assertEqual("2.004km", self.driver_tracking_service.calculate_travelled_distance(
+                driver.id, self.NOON, self.NOON_FIVE).print_in("km"))
+
+    def test_late_positions_are_replayed_into_closed_slot(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        with freeze_time(self.NOON):
+            self.driver_tracking_service.register_position(driver.id, 53.32055555555556, -1.7297222222222221, self.NOON)
+            self.driver_tracking_service.register_position(driver.id, 53.31861111111111, -1.6997222222222223, self.NOON)
+        # and
+        with freeze_time(self.NOON_TEN):
+            self.driver_tracking_service.register_position(
+                driver.id, 53.31861111111111, -1.6997222222222223, self.NOON_TEN)
+
+            # when
+            replayer = self.driver_tracking_service.travelled_distance_service.travelled_distance_replayer
+            spy2(replayer.replay)
+            self.driver_tracking_service.register_position(
+                driver.id, 53.32055555555556, -1.7297222222222221, self.NOON + relativedelta(minutes=1))
+            self.driver_tracking_service.register_position(
+                driver.id, 53.31861111111111, -1.6997222222222223, self.NOON + relativedelta(minutes=2))
+
+            # then
+            self.assertEqual("6.013km", self.driver_tracking_service.calculate_travelled_distance(
+                driver.id, self.NOON, self.NOON_TEN).print_in("km"))
+            self.assertAlmostEqual(6.013, self.written_distance(driver), 3)
+            verify(replayer, times=1).replay(ANY, ANY)
+
+    def written_distance(self, driver: Driver) -> float:
+        return self.travelled_distance_repository.calculate_distance(
+            TimeSlot.slot_that_contains(self.NOON).beginning,
+            TimeSlot.slot_that_contains(self.NOON_FIVE).end,
+            driver.id
+        )
+
+    def test_batch_of_positions_is_committed_once(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        other: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        commits: List[object] = []
+        count_commit = commits.append
+        session = self.driver_tracking_service.position_repository.session
+        event.listen(session, "after_commit", count_commit)
+
+        # when
+        with freeze_time(self.NOON_TEN):
+            self.driver_tracking_service.register_positions([
+                self.a_ping(driver, 52.05, self.NOON),
+                self.a_ping(driver, 52.06, self.NOON + relativedelta(minutes=1)),
+                self.a_ping(other, 52.05, self.NOON),
+                self.a_ping(other, 52.06, self.NOON + relativedelta(minutes=1)),
+            ])
+        event.remove(session, "after_commit", count_commit)
+
+        # then
+        self.assertEqual(1, len(commits))
+        self.assertEqual(4, session.query(DriverPosition).count())
+        self.assertAlmostEqual(1.112, self.written_distance(driver), 3)
+
+    def test_failed_batch_leaves_no_positions_behind(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        when(TravelledDistanceService).add_positions(ANY, ANY).thenRaise(ConnectionError())
+
+        # when
+        with self.assertRaises(ConnectionError):
+            self.driver_tracking_service.register_positions([self.a_ping(driver, 52.05, self.NOON)])
+
+        # then
+        self.assertEqual(0, self.driver_tracking_service.position_repository.session.query(DriverPosition).count())
+        self.assertEqual([], self.driver_tracking_service.driver_position_index.find_pings_since(
+            52.0, 52.1, 21.0, 21.1, self.NOON - relativedelta(minutes=5)))
+
+    def test_distance_written_in_rolled_back_unit_is_written_again(self):
+        # given
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        unit_of_work: UnitOfWork = dependency_resolver.resolve_dependency(UnitOfWork)
+
+        with freeze_time(self.NOON_TEN):
+            # when
+            with self.assertRaises(ConnectionError):
+                with unit_of_work.begin():
+                    self.travelled_distance_service.add_positions(driver.id, [
+                        self.a_ping(driver, 52.05, self.NOON),
+                        self.a_ping(driver, 52.06, self.NOON + relativedelta(minutes=1)),
+                    ])
+                    raise ConnectionError()
+
+            # then
+            self.assertEqual(0, self.written_distance(driver))
+            self.assertEqual("1.112km", self.driver_tracking_service.calculate_travelled_distance(
+                driver.id, self.NOON, self.NOON_FIVE).print_in("km"))
+            # and
+            self.travelled_distance_service.flush()
+            self.assertAlmostEqual(1.112, self.written_distance(driver), 3)
+
+    def test_cannot_register_batch_of_positions_for_inactive_driver(self):
+        # given
+        active: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        inactive: Driver = self.fixtures.a_driver(Driver.Status.INACTIVE, "Jan", "Nowak", "FARME100165AB5EW")
+
+        # expect
+        with self.assertRaises(AttributeError):
+            self.driver_tracking_service.register_positions([
+                DriverPositionDTO(driver_id=active.id, latitude=53.32, longitude=-1.72, seen_at=self.NOON),
+                DriverPositionDTO(driver_id=inactive.id, latitude=53.32, longitude=-1.72, seen_at=self.NOON),
+            ])
+
+    def test_can_search_drivers_in_growing_distance_from_pickup(self):
+        # given
+        when(self.driver_tracking_service.geocoding_service).geocode_address(ANY).thenReturn([52.0, 21.0])
+        # and
+        close: Driver = self.fixtures.a_nearby_driver("WU1212", 52.0045, 21.0, CarClass.VAN, datetime.now(), "brand")
+        # and
+        further: Driver = self.fixtures.a_nearby_driver("WU1213", 52.027, 21.0, CarClass.VAN, datetime.now(), "brand")
+        # and
+        not_logged_in: Driver = self.fixtures.an_active_regular_driver()
+        self.driver_tracking_service.register_position(not_logged_in.id, 52.0045, 21.001, datetime.now())
+
+        # when
+        search = self.driver_tracking_service.search_active_drivers_nearby_by_address(
+            AddressDTO(address=self.fixtures.an_address()), Distance.of_km(19), [CarClass.VAN])
+
+        # then
+        self.assertEqual([close.id], [position.driver_id for position in search.within(Distance.of_km(1))])
+        self.assertEqual([close.id], [position.driver_id for position in search.within(Distance.of_km(2))])
+        self.assertEqual(
+            [close.id, further.id],
+            [position.driver_id for position in search.within(Distance.of_km(4))]
+        )
+
+    def test_each_distance_averages_only_pings_inside_it(self):
+        # given
+        when(self.driver_tracking_service.geocoding_service).geocode_address(ANY).thenReturn([52.0, 21.0])
+        # and
+        driving_in: Driver = self.fixtures.a_nearby_driver(
+            "WU1214", 52.03, 21.0, CarClass.VAN, datetime.now() - relativedelta(minutes=1), "brand")
+        self.driver_tracking_service.register_position(driving_in.id, 52.0045, 21.0, datetime.now())
+
+        # when
+        search = self.driver_tracking_service.search_active_drivers_nearby_by_address(
+            AddressDTO(address=self.fixtures.an_address()), Distance.of_km(19), [CarClass.VAN])
+
+        # then
+        within_one_km = search.within(Distance.of_km(1))
+        self.assertEqual([driving_in.id], [position.driver_id for position in within_one_km])
+        self.assertAlmostEqual(52.0045, within_one_km[0].latitude)
+        # and
+        self.assertAlmostEqual(52.01725, search.within(Distance.of_km(4))[0].latitude)
+        # and
+        self.assertEqual(
+            [(position.driver_id, position.latitude) for position in within_one_km],
+            [
+                (position.driver_id, position.latitude)
+                for position in self.driver_tracking_service.find_active_drivers_nearby_by_address(
+                    AddressDTO(address=self.fixtures.an_address()), Distance.of_km(1), [CarClass.VAN])
+            ]
+        )
+
+    def test_index_agrees_with_database_on_drivers_straddling_box_edge(self):
+        # given
+        now: datetime = datetime.now().replace(microsecond=0)
+        inside: Driver = self.fixtures.an_active_regular_driver()
+        straddling: Driver = self.fixtures.an_active_regular_driver()
+        mostly_outside: Driver = self.fixtures.an_active_regular_driver()
+        # and
+        self.driver_tracking_service.register_positions([
+            self.a_ping(inside, 52.05, now),
+            self.a_ping(straddling, 52.09, now),
+            self.a_ping(straddling, 52.13, now + relativedelta(seconds=20)),
+            self.a_ping(mostly_outside, 52.099, now - relativedelta(minutes=1)),
+            self.a_ping(mostly_outside, 52.3, now),
+            self.a_ping(mostly_outside, 52.4, now + relativedelta(seconds=30)),
+        ])
+        since: datetime = now - relativedelta(minutes=5)
+
+        # when
+        from_index = self.driver_tracking_service.find_average_driver_position_since(52.0, 52.1, 21.0, 21.1, since)
+        from_database = self.driver_tracking_service.position_repository.find_average_driver_position_since(
+            52.0, 52.1, 21.0, 21.1, since)
+
+        # then
+        self.assertEqual(
+            {
+                inside.id: (52.05, 21.05, now),
+                straddling.id: (52.09, 21.05, now),
+                mostly_outside.id: (52.099, 21.05, now - relativedelta(minutes=1)),
+            },
+            self.averages(from_index)
+        )
+        self.assertEqual(self.averages(from_database), self.averages(from_index))
+
+    def test_index_picks_up_pings_stored_by_other_processes(self):
+        # given
+        now: datetime = datetime.now()
+        driver: Driver = self.fixtures.an_active_regular_driver()
+        self.driver_tracking_service.register_position(driver.id, 52.05, 21.05, now)
+        self.driver_tracking_service.find_average_driver_position_since(52.0, 52.1, 21.0, 21.1, now)
+        # and
+        other: Driver = self.fixtures.an_active_regular_driver()
+        self.driver_tracking_service.position_repository.save(
+            DriverPosition(driver_id=other.id, latitude=52.06, longitude=21.06, seen_at=now))
+
+        # when
+        with freeze_time(datetime.now() + relativedelta(seconds=5)):
+            found = self.driver_tracking_service.find_average_driver_position_since(
+                52.0, 52.1, 21.0, 21.1, now - relativedelta(minutes=5))
+
+        # then
+        self.assertEqual(
+            {driver.id: 52.05, other.id: 52.06},
+            {position.driver_id: position.latitude for position in found}
+        )
+
+    def a_ping(self, driver: Driver, latitude: float, seen_at: datetime) -> DriverPositionDTO:
+        return DriverPositionDTO(driver_id=driver.id, latitude=latitude, longitude=21.05, seen_at=seen_at)
+
+    def averages(self, positions: List[DriverPositionDTOV2]) -> Dict[int, Tuple[float, float, datetime]]:
+        return {position.driver_id: (position.latitude, position.longitude, position.seen_at) for position in positions}
+
     def tearDown(self) -> None:
+        unstub()
         drop_db_and_tables()
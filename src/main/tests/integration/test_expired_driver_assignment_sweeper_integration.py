@@ -0,0 +1,119 @@
+import uuid
+from datetime import datetime
+from unittest import TestCase
+
+from dateutil.relativedelta import relativedelta
+
+from assignment.assignment_status import AssignmentStatus
+from assignment.driver_assignment import DriverAssignment
+from assignment.driver_assignment_repository import DriverAssignmentRepository
+from common.metrics import Metrics
+from core.database import create_db_and_tables, drop_db_and_tables
+from ride.details.status import Status
+from ride.details.transit_details import TransitDetails
+from ride.details.transit_details_repository import TransitDetailsRepository
+from ride.expired_driver_assignment_sweeper import ExpiredDriverAssignmentSweeper
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestExpiredDriverAssignmentSweeperIntegration(TestCase):
+    NOW = datetime(1989, 12, 12, 12, 12)
+
+    sweeper: ExpiredDriverAssignmentSweeper = dependency_resolver.resolve_dependency(ExpiredDriverAssignmentSweeper)
+    driver_assignment_repository: DriverAssignmentRepository = dependency_resolver.resolve_dependency(
+        DriverAssignmentRepository
+    )
+    transit_details_repository: TransitDetailsRepository = dependency_resolver.resolve_dependency(
+        TransitDetailsRepository
+    )
+    metrics: Metrics = dependency_resolver.resolve_dependency(Metrics)
+
+    def setUp(self):
+        create_db_and_tables()
+
+    def test_fails_assignments_waiting_longer_than_five_minutes(self):
+        # given
+        expired = self.waiting_transit(self.NOW - relativedelta(minutes=6))
+        fresh = self.waiting_transit(self.NOW - relativedelta(minutes=4))
+        # and
+        failed_before = self.metrics.get("driver_assignment_sweeper.failed")
+
+        # when
+        failed = self.sweeper.sweep(self.NOW)
+
+        # then
+        self.assertEqual(1, failed)
+        self.assertEqual(1, self.metrics.get("driver_assignment_sweeper.failed") - failed_before)
+        self.assertEqual(
+            AssignmentStatus.DRIVER_ASSIGNMENT_FAILED,
+            self.driver_assignment_repository.find_by_request_uuid(expired).status
+        )
+        self.assertEqual(
+            Status.DRIVER_ASSIGNMENT_FAILED,
+            self.transit_details_repository.find_by_request_uuid(expired).status
+        )
+        # and
+        self.assertEqual(
+            AssignmentStatus.WAITING_FOR_DRIVER_ASSIGNMENT,
+            self.driver_assignment_repository.find_by_request_uuid(fresh).status
+        )
+        self.assertEqual(
+            Status.WAITING_FOR_DRIVER_ASSIGNMENT,
+            self.transit_details_repository.find_by_request_uuid(fresh).status
+        )
+        # and
+        self.assertEqual(0, self.sweeper.sweep(self.NOW))
+
+    def test_does_not_fail_assignment_accepted_after_it_was_selected(self):
+        # given
+        accepted = self.waiting_transit(self.NOW - relativedelta(minutes=6))
+        # and
+        repository = self.sweeper.driver_assignment_repository
+        find_expired = repository.find_request_uuids_waiting_since_before
+
+        def find_expired_then_accept(deadline, limit):
+            expired = find_expired(deadline, limit)
+            self.accept(accepted, 1)
+            return expired
+
+        repository.find_request_uuids_waiting_since_before = find_expired_then_accept
+
+        # when
+        try:
+            failed = self.sweeper.sweep(self.NOW)
+        finally:
+            del repository.find_request_uuids_waiting_since_before
+
+        # then
+        self.assertEqual(0, failed)
+        self.assertEqual(
+            AssignmentStatus.ON_THE_WAY,
+            self.driver_assignment_repository.find_by_request_uuid(accepted).status
+        )
+        self.assertEqual(
+            Status.TRANSIT_TO_PASSENGER,
+            self.transit_details_repository.find_by_request_uuid(accepted).status
+        )
+
+    def waiting_transit(self, published_at: datetime) -> uuid.UUID:
+        request_uuid = uuid.uuid4()
+        transit_details = TransitDetails(request_id=request_uuid, when=published_at)
+        transit_details.set_published_at(published_at)
+        self.transit_details_repository.save(transit_details)
+        self.driver_assignment_repository.save(DriverAssignment(request_uuid, published_at))
+        return request_uuid
+
+    def accept(self, request_uuid: uuid.UUID, driver_id: int) -> None:
+        driver_assignment = self.driver_assignment_repository.find_by_request_uuid(request_uuid)
+        driver_assignment.propose_to(driver_id)
+        driver_assignment.accept_by(driver_id)
+        self.driver_assignment_repository.save(driver_assignment)
+        transit_details = self.transit_details_repository.find_by_request_uuid(request_uuid)
+        transit_details.set_accepted_at(self.NOW, driver_id)
+        self.transit_details_repository.save(transit_details)
+
+    def tearDown(self) -> None:
+        drop_db_and_tables()
@@ -0,0 +1,173 @@
+import json
+from datetime import datetime, timedelta
+from typing import List
+from unittest import TestCase
+
+from sqlmodel import Session
+
+from common.event import Event
+from common.outbox.outbox_event_publisher import OutboxEventPublisher
+from common.outbox.outbox_handlers import outbox_handlers
+from common.outbox.outbox_message import OutboxMessage
+from common.outbox.outbox_worker import OutboxWorker
+from core.database import create_db_and_tables, drop_db_and_tables, own_session
+from core.unit_of_work import UnitOfWork
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class RideRated(Event):
+    transit_id: int
+    rated_at: datetime
+
+    def __init__(self, transit_id: int, rated_at: datetime):
+        self.transit_id = transit_id
+        self.rated_at = rated_at
+
+
+delivered: List[List[RideRated]] = []
+failures: List[Exception] = []
+
+
+@outbox_handlers.register(RideRated)
+def remember_ratings(events: List[RideRated]) -> None:
+    if failures:
+        raise failures.pop()
+    delivered.append(events)
+
+
+class RideTipped(Event):
+    transit_id: int
+
+    def __init__(self, transit_id: int):
+        self.transit_id = transit_id
+
+
+class TestOutboxIntegration(TestCase):
+    publisher: OutboxEventPublisher = dependency_resolver.resolve_dependency(OutboxEventPublisher)
+    worker: OutboxWorker = dependency_resolver.resolve_dependency(OutboxWorker)
+    unit_of_work: UnitOfWork = dependency_resolver.resolve_dependency(UnitOfWork)
+    session: Session = dependency_resolver.resolve_dependency(Session)
+
+    def setUp(self):
+        create_db_and_tables()
+        delivered.clear()
+        failures.clear()
+
+    def test_delivers_committed_events_in_one_batch(self):
+        # given
+        with self.unit_of_work.begin():
+            self.publisher.publish_event_object(RideRated(1, datetime(2022, 4, 1, 12, 0)))
+            self.publisher.publish_event_object(RideRated(2, datetime(2022, 4, 1, 12, 5)))
+
+        # when
+        self.worker.drain()
+
+        # then
+        self.assertEqual([[1, 2]], [[event.transit_id for event in batch] for batch in delivered])
+        self.assertEqual(datetime(2022, 4, 1, 12, 0), delivered[0][0].rated_at)
+        # and
+        self.assertEqual(0, self.worker.drain())
+        self.assertEqual(1, len(delivered))
+
+    def test_events_of_failed_transaction_are_never_delivered(self):
+        # given
+        with self.assertRaises(AttributeError):
+            with self.unit_of_work.begin():
+                self.publisher.publish_event_object(RideRated(1, datetime.now()))
+                raise AttributeError("Transit does not exist, id = 1")
+
+        # when
+        self.worker.drain()
+
+        # then
+        self.assertEqual(0, self.session.query(OutboxMessage).count())
+        self.assertEqual([], delivered)
+
+    def test_draining_in_own_session_leaves_open_unit_alone(self):
+        # given
+        with self.unit_of_work.begin():
+            self.publisher.publish_event_object(RideRated(1, datetime.now()))
+
+            # when
+            with own_session(dependency_resolver.injector) as job_injector:
+                job_injector.get(OutboxWorker).drain()
+
+            # then
+            with own_session(dependency_resolver.injector) as reader_injector:
+                self.assertEqual(0, reader_injector.get(Session).query(OutboxMessage).count())
+            self.assertEqual([], delivered)
+
+        # and
+        self.worker.drain()
+        self.assertEqual(1, len(delivered))
+
+    def test_retries_failed_delivery_later(self):
+        # given
+        self.publisher.publish_event_object(RideRated(1, datetime.now()))
+        failures.append(ConnectionError())
+        now: datetime = datetime.now()
+
+        # when
+        self.worker.drain(now)
+
+        # then
+        self.assertEqual([], delivered)
+        self.assertEqual(0, self.worker.drain(now + timedelta(seconds=1)))
+        # and
+        self.assertEqual(1, self.worker.drain(now + timedelta(minutes=1)))
+        self.assertEqual(1, len(delivered))
+        self.assertEqual(1, self.session.query(OutboxMessage).one().attempts)
+
+    def test_gives_up_after_last_attempt(self):
+        # given
+        self.publisher.publish_event_object(RideRated(1, datetime.now()))
+
+        # when
+        moment: datetime = datetime.now()
+        for _ in range(self.worker.app_properties.outbox_max_attempts):
+            failures.append(ConnectionError())
+            self.worker.drain(moment)
+            moment += timedelta(days=1)
+
+        # then
+        self.assertEqual(0, self.worker.drain(moment))
+        self.assertIsNotNone(self.session.query(OutboxMessage).one().failed_at)
+
+    def test_fails_events_nobody_handles(self):
+        # given
+        self.publisher.publish_event_object(RideTipped(1))
+
+        # when
+        delivered_count = self.worker.drain()
+
+        # then
+        self.assertEqual(0, delivered_count)
+        message: OutboxMessage = self.session.query(OutboxMessage).one()
+        self.assertIsNone(message.delivered_at)
+        self.assertIsNotNone(message.failed_at)
+        # and
+        self.assertEqual(0, self.worker.purge_delivered(datetime.now() + timedelta(days=365)))
+
+    def test_purges_only_messages_delivered_before_retention(self):
+        # given
+        self.publisher.publish_event_object(RideRated(1, datetime.now()))
+        self.worker.drain()
+        # and
+        self.publisher.publish_event_object(RideRated(2, datetime.now()))
+        failures.append(ConnectionError())
+        self.worker.drain()
+        # and
+        retention: timedelta = timedelta(days=self.worker.app_properties.outbox_retention_in_days)
+
+        # expect
+        self.assertEqual(0, self.worker.purge_delivered(datetime.now() + retention - timedelta(minutes=1)))
+        self.assertEqual(1, self.worker.purge_delivered(datetime.now() + retention + timedelta(minutes=1)))
+        self.assertEqual(
+            [2], [json.loads(message.payload)["transit_id"] for message in self.session.query(OutboxMessage).all()]
+        )
+
+    def tearDown(self) -> None:
+        drop_db_and_tables()
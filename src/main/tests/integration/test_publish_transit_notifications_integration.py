@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime
+from unittest import TestCase
+
+from mockito import when, ANY, unstub
+
+from assignment.driver_assignment_facade import DriverAssignmentFacade
+from carfleet.car_class import CarClass
+from core.database import create_db_and_tables, drop_db_and_tables
+from core.unit_of_work import UnitOfWork
+from crm.notification.driver_notification import DriverNotification
+from crm.notification.driver_notification_dispatcher import DriverNotificationDispatcher
+from crm.notification.driver_notification_transport import DriverNotificationTransport
+from driverfleet.driver import Driver
+from geolocation.address.address_dto import AddressDTO
+
+from tests.common.fixtures import DependencyResolver, Fixtures
+
+dependency_resolver = DependencyResolver()
+
+
+class TestPublishTransitNotificationsIntegration(TestCase):
+    driver_assignment_facade: DriverAssignmentFacade = dependency_resolver.resolve_dependency(DriverAssignmentFacade)
+    unit_of_work: UnitOfWork = dependency_resolver.resolve_dependency(UnitOfWork)
+    fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
+    dispatcher: DriverNotificationDispatcher = dependency_resolver.resolve_dependency(DriverNotificationDispatcher)
+    driver_notification_transport: DriverNotificationTransport = dependency_resolver.resolve_dependency(
+        DriverNotificationTransport
+    )
+
+    def setUp(self):
+        create_db_and_tables()
+        self.fixtures.an_active_car_category(CarClass.VAN)
+        self.driver_notification_transport.sent.clear()
+        when(self.driver_assignment_facade.driver_tracking_service.geocoding_service).geocode_address(
+            ANY).thenReturn([52.0, 21.0])
+        self.driver: Driver = self.fixtures.a_nearby_driver(
+            "WU1212", 52.0045, 21.0, CarClass.VAN, datetime.now(), "brand")
+
+    def test_drivers_are_notified_once_publishing_commits(self):
+        # given
+        request_uuid = uuid.uuid4()
+
+        # when
+        with self.unit_of_work.begin():
+            self.start_assigning_drivers(request_uuid)
+            self.dispatcher.wait_until_delivered(5)
+
+            # then
+            self.assertEqual([], self.driver_notification_transport.sent)
+
+        # and
+        self.dispatcher.wait_until_delivered(5)
+        self.assertEqual(
+            [(self.driver.id, DriverNotification(DriverNotification.Kind.POSSIBLE_TRANSIT, request_uuid))],
+            self.driver_notification_transport.sent
+        )
+
+    def test_failed_publishing_notifies_nobody(self):
+        # when
+        with self.assertRaises(AttributeError):
+            with self.unit_of_work.begin():
+                self.start_assigning_drivers(uuid.uuid4())
+                raise AttributeError("Transit does not exist, id = 1")
+
+        # then
+        self.dispatcher.wait_until_delivered(5)
+        self.assertEqual([], self.driver_notification_transport.sent)
+
+    def start_assigning_drivers(self, request_uuid: uuid.UUID) -> None:
+        self.driver_assignment_facade.start_assigning_drivers(
+            request_uuid, AddressDTO(address=self.fixtures.an_address()), CarClass.VAN, datetime.now()
+        )
+
+    def tearDown(self) -> None:
+        unstub()
+        drop_db_and_tables()
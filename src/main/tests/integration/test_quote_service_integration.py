@@ -0,0 +1,102 @@
+from datetime import datetime
+from decimal import Decimal
+from unittest import TestCase
+
+from mockito import ANY, unstub, when
+from sqlmodel import Session
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from geolocation.address.address import Address
+from geolocation.address.address_dto import AddressDTO
+from geolocation.distance import Distance
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.geocoding_cache import GeocodingCache
+from geolocation.geocoding_service import GeocodingService
+from geolocation.route_distance import RouteDistance
+from geolocation.route_distance_cache import RouteDistanceCache
+from pricing.tariffs import Tariffs
+from ride.quote_dto import QuoteRequestDTO
+from ride.quote_service import QuoteService
+from ride.request_for_transit import RequestForTransit
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestQuoteServiceIntegration(TestCase):
+    FRIDAY_NIGHT = datetime(2021, 4, 16, 20, 15)
+    MONDAY_NOON = datetime(2021, 4, 19, 12, 12)
+    NEW_YEARS_EVE = datetime(2021, 12, 31, 8, 30)
+
+    quote_service: QuoteService = dependency_resolver.resolve_dependency(QuoteService)
+    tariffs: Tariffs = dependency_resolver.resolve_dependency(Tariffs)
+    session: Session = dependency_resolver.resolve_dependency(Session)
+    geocoding_cache: GeocodingCache = dependency_resolver.resolve_dependency(GeocodingCache)
+    route_distance_cache: RouteDistanceCache = dependency_resolver.resolve_dependency(RouteDistanceCache)
+
+    def setUp(self):
+        create_db_and_tables()
+        when(GeocodingService).geocode_address(ANY).thenReturn([52.23, 21.01])
+        when(DistanceCalculator).calculate_by_map(ANY, ANY, ANY, ANY).thenReturn(12.345)
+
+    def test_prices_trips_like_requested_transits(self):
+        # when
+        quotes = self.quote_service.quote_all([
+            self.a_trip(self.FRIDAY_NIGHT),
+            self.a_trip(self.MONDAY_NOON),
+            self.a_trip(self.NEW_YEARS_EVE),
+        ])
+
+        # then
+        self.assertEqual(
+            ["Weekend+", "Standard", "Sylwester"],
+            [quote.tariff for quote in quotes]
+        )
+        for quote, moment in zip(quotes, [self.FRIDAY_NIGHT, self.MONDAY_NOON, self.NEW_YEARS_EVE]):
+            self.assertEqual(12.345, quote.distance)
+            self.assertEqual(
+                Decimal(self.tariffs.choose(moment).calculate_cost(Distance.of_km(12.345)).to_int()),
+                quote.estimated_price
+            )
+
+    def test_does_not_write_anything(self):
+        # when
+        self.quote_service.quote_all([self.a_trip(self.MONDAY_NOON) for _ in range(10)])
+
+        # then
+        self.assertEqual(0, self.session.query(Address).count())
+        self.assertEqual(0, self.session.query(RouteDistance).count())
+        self.assertEqual(0, self.session.query(RequestForTransit).count())
+        # and
+        trip = self.a_trip(self.MONDAY_NOON)
+        address_from = trip.address_from.to_address_entity()
+        address_from.gen_hash()
+        address_to = trip.address_to.to_address_entity()
+        address_to.gen_hash()
+        self.assertIsNone(self.geocoding_cache.get(str(address_from.hash)))
+        self.assertIsNone(self.geocoding_cache.get(str(address_to.hash)))
+        self.assertIsNone(self.route_distance_cache.get((
+            str(address_from.hash),
+            str(address_to.hash),
+            self.quote_service.route_distance_calculator.time_bucket(self.MONDAY_NOON)
+        )))
+
+    def test_refuses_batch_above_limit(self):
+        # given
+        limit = self.quote_service.app_properties.quote_batch_max_size
+
+        # expect
+        with self.assertRaises(ValueError):
+            self.quote_service.quote_all([self.a_trip(self.MONDAY_NOON) for _ in range(limit + 1)])
+
+    def a_trip(self, moment: datetime) -> QuoteRequestDTO:
+        return QuoteRequestDTO(
+            address_from=AddressDTO(country="Polska", city="Warszawa", street="Młynarska", building_number=20),
+            address_to=AddressDTO(country="Polska", city="Warszawa", street="Puławska", building_number=1),
+            when=moment,
+        )
+
+    def tearDown(self) -> None:
+        unstub()
+        drop_db_and_tables()
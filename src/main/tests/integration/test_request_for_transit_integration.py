@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from sqlmodel import Session
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from geolocation.distance import Distance
+from money import Money
+from pricing.tariff_schedule import TariffSchedule
+from ride.request_for_transit import RequestForTransit
+from ride.request_for_transit_repository import RequestForTransitRepository
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestRequestForTransitIntegration(TestCase):
+    request_for_transit_repository: RequestForTransitRepository = dependency_resolver.resolve_dependency(
+        RequestForTransitRepository
+    )
+    session: Session = dependency_resolver.resolve_dependency(Session)
+
+    def setUp(self):
+        create_db_and_tables()
+
+    def test_tariff_of_loaded_request_is_hydrated(self):
+        # given
+        request_id = self.request_for_transit_repository.save(
+            RequestForTransit(tariff=TariffSchedule.WEEKEND_PLUS, distance=Distance.of_km(3))
+        ).id
+        # and
+        self.session.expunge_all()
+
+        # when
+        loaded = self.request_for_transit_repository.get_one(request_id)
+
+        # then
+        self.assertIsNot(TariffSchedule.WEEKEND_PLUS, loaded.get_tariff())
+        self.assertEqual("Weekend+", loaded.get_tariff().name)
+        self.assertEqual(2.5, loaded.get_tariff().km_rate)
+        self.assertEqual(10, loaded.get_tariff().base_fee)
+        self.assertEqual(Distance.of_km(3), loaded.get_distance())
+        self.assertEqual(Money(1750), loaded.get_estimated_price())
+
+    def tearDown(self) -> None:
+        drop_db_and_tables()
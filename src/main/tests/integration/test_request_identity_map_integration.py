@@ -0,0 +1,74 @@
+from datetime import datetime
+from unittest import TestCase
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from core.identity_map import request_scope
+from driverfleet.driver_repository import DriverRepositoryImp
+from geolocation.distance import Distance
+from pricing.tariff import Tariff
+from ride.request_for_transit import RequestForTransit
+from ride.request_for_transit_repository import RequestForTransitRepository
+
+from tests.common.fixtures import DependencyResolver, Fixtures
+
+dependency_resolver = DependencyResolver()
+
+
+class TestRequestIdentityMapIntegration(TestCase):
+    request_for_transit_repository: RequestForTransitRepository = dependency_resolver.resolve_dependency(
+        RequestForTransitRepository
+    )
+    driver_repository: DriverRepositoryImp = dependency_resolver.resolve_dependency(DriverRepositoryImp)
+    fixtures: Fixtures = dependency_resolver.resolve_dependency(Fixtures)
+
+    def setUp(self):
+        create_db_and_tables()
+
+    def test_repeated_lookups_within_request_hit_memory(self):
+        # given
+        request_uuid = self.a_request_for_transit().request_uuid
+
+        # when
+        with request_scope() as scope:
+            first = self.request_for_transit_repository.find_by_request_uuid(request_uuid)
+            second = self.request_for_transit_repository.find_by_request_uuid(request_uuid)
+            third = self.request_for_transit_repository.find_by_request_uuid(request_uuid)
+
+        # then
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertEqual(1, scope.queries)
+
+    def test_writes_forget_what_was_loaded(self):
+        # given
+        driver = self.fixtures.an_active_regular_driver()
+
+        with request_scope() as scope:
+            self.driver_repository.get_one(driver.id)
+            # when
+            driver.last_name = "Nowak"
+            self.driver_repository.save(driver)
+            queries_before = scope.queries
+            loaded = self.driver_repository.get_one(driver.id)
+
+            # then
+            self.assertEqual("Nowak", loaded.last_name)
+            self.assertLess(queries_before, scope.queries)
+
+    def test_lookups_outside_request_are_not_remembered(self):
+        # given
+        request_uuid = self.a_request_for_transit().request_uuid
+        self.request_for_transit_repository.find_by_request_uuid(request_uuid)
+
+        # expect
+        with request_scope() as scope:
+            self.request_for_transit_repository.find_by_request_uuid(request_uuid)
+            self.assertEqual(1, scope.queries)
+
+    def a_request_for_transit(self) -> RequestForTransit:
+        return self.request_for_transit_repository.save(
+            RequestForTransit(tariff=Tariff.of_time(datetime(2021, 4, 19, 12, 12)), distance=Distance.of_km(10))
+        )
+
+    def tearDown(self) -> None:
+        drop_db_and_tables()
@@ -0,0 +1,84 @@
+from datetime import datetime
+from unittest import TestCase
+
+from mockito import ANY, unstub, verify, when
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from geolocation.address.address import Address
+from geolocation.distance_calculator import DistanceCalculator
+from geolocation.route_distance_cache import RouteDistanceCache
+from geolocation.route_distance_calculator import RouteDistanceCalculator
+from geolocation.route_distance_repository import RouteDistanceRepository
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestRouteDistanceCalculatorIntegration(TestCase):
+    NOON = datetime(1989, 12, 12, 12, 12)
+    NOON_THIRTY = datetime(1989, 12, 12, 12, 30)
+    EVENING = datetime(1989, 12, 12, 19, 12)
+
+    route_distance_calculator: RouteDistanceCalculator = dependency_resolver.resolve_dependency(
+        RouteDistanceCalculator
+    )
+    route_distance_cache: RouteDistanceCache = dependency_resolver.resolve_dependency(RouteDistanceCache)
+    route_distance_repository: RouteDistanceRepository = dependency_resolver.resolve_dependency(RouteDistanceRepository)
+
+    def setUp(self):
+        create_db_and_tables()
+        when(DistanceCalculator).calculate_by_map(ANY, ANY, ANY, ANY).thenReturn(12.5)
+
+    def test_asks_routing_engine_once_per_pair_and_time_of_day(self):
+        # when
+        first = self.distance(self.NOON)
+        second = self.distance(self.NOON_THIRTY)
+
+        # then
+        self.assertEqual(12.5, first)
+        self.assertEqual(12.5, second)
+        verify(DistanceCalculator, times=1).calculate_by_map(ANY, ANY, ANY, ANY)
+
+    def test_asks_routing_engine_again_at_other_time_of_day(self):
+        # when
+        self.distance(self.NOON)
+        self.distance(self.EVENING)
+
+        # then
+        verify(DistanceCalculator, times=2).calculate_by_map(ANY, ANY, ANY, ANY)
+
+    def test_keeps_distances_in_table(self):
+        # given
+        self.distance(self.NOON)
+        self.route_distance_cache.clear()
+
+        # when
+        distance = self.distance(self.NOON_THIRTY)
+
+        # then
+        self.assertEqual(12.5, distance)
+        verify(DistanceCalculator, times=1).calculate_by_map(ANY, ANY, ANY, ANY)
+
+    def test_route_stored_meanwhile_by_another_process_is_kept(self):
+        # given
+        self.route_distance_repository.save("from", "to", 12, 12.5, self.NOON)
+
+        # when
+        self.route_distance_repository.save("from", "to", 12, 13.0, self.NOON_THIRTY)
+
+        # then
+        self.assertEqual(12.5, self.route_distance_repository.find_distance("from", "to", 12))
+
+    def distance(self, when: datetime) -> float:
+        return self.route_distance_calculator.calculate_by_map(
+            Address(country="Polska", city="Warszawa", street="Młynarska", building_number=20),
+            [52.23, 20.98],
+            Address(country="Polska", city="Warszawa", street="Puławska", building_number=1),
+            [52.21, 21.02],
+            when
+        )
+
+    def tearDown(self) -> None:
+        unstub()
+        drop_db_and_tables()
@@ -0,0 +1,177 @@
+import json
+from unittest import TestCase
+
+from mockito import unstub, verify, when
+
+from common.base_entity import new_uuid
+from core.database import create_db_and_tables, drop_db_and_tables
+from driverfleet.driver import Driver
+from driverfleet.driver_dto import DriverDTO
+from driverfleet.driver_service import DriverService
+from ride.details.status import Status
+from ride.transit_dto import TransitDTO
+from ride.transit_view_consistency_checker import TransitViewConsistencyChecker
+from ride.transit_view_projection import TransitViewProjection
+
+from tests.common.driver_fixture import DriverFixture
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestTransitViewIntegration(TestCase):
+    transit_view_projection: TransitViewProjection = dependency_resolver.resolve_dependency(TransitViewProjection)
+    consistency_checker: TransitViewConsistencyChecker = dependency_resolver.resolve_dependency(
+        TransitViewConsistencyChecker
+    )
+    driver_service: DriverService = dependency_resolver.resolve_dependency(DriverService)
+    driver_fixture: DriverFixture = dependency_resolver.resolve_dependency(DriverFixture)
+
+    def setUp(self):
+        create_db_and_tables()
+        self.request_uuid = new_uuid()
+        self.original_check_limit = self.consistency_checker.app_properties.transit_view_check_limit
+
+    def test_reads_transit_from_one_row(self):
+        # given
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(self.a_transit(Status.DRAFT))
+
+        # when
+        first = self.transit_view_projection.find_document(self.request_uuid)
+        second = self.transit_view_projection.find_document(self.request_uuid)
+
+        # then
+        self.assertEqual(first, second)
+        self.assertEqual(Status.DRAFT.value, json.loads(first)["status"])
+        verify(TransitViewProjection, times=1).assemble(self.request_uuid)
+
+    def test_lifecycle_step_updates_view(self):
+        # given
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(
+            self.a_transit(Status.DRAFT)
+        ).thenReturn(self.a_transit(Status.WAITING_FOR_DRIVER_ASSIGNMENT))
+        self.transit_view_projection.project(self.request_uuid)
+
+        # when
+        self.transit_view_projection.project(self.request_uuid)
+
+        # then
+        self.assertEqual(
+            Status.WAITING_FOR_DRIVER_ASSIGNMENT.value,
+            json.loads(self.transit_view_projection.find_document(self.request_uuid))["status"]
+        )
+
+    def test_invalidated_view_is_assembled_again(self):
+        # given
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(
+            self.a_transit(Status.WAITING_FOR_DRIVER_ASSIGNMENT)
+        ).thenReturn(self.a_transit(Status.DRIVER_ASSIGNMENT_FAILED))
+        self.transit_view_projection.project(self.request_uuid)
+
+        # when
+        self.transit_view_projection.invalidate([self.request_uuid])
+
+        # then
+        self.assertEqual(
+            Status.DRIVER_ASSIGNMENT_FAILED.value,
+            json.loads(self.transit_view_projection.find_document(self.request_uuid))["status"]
+        )
+
+    def test_serves_drivers_as_they_are_now(self):
+        # given
+        driver = self.driver_fixture.an_active_regular_driver()
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(
+            self.a_transit(Status.TRANSIT_TO_PASSENGER, driver=self.driver_service.load_driver(driver.id))
+        )
+        self.transit_view_projection.project(self.request_uuid)
+
+        # when
+        self.driver_service.mark_occupied(driver.id)
+        self.driver_service.driver_repository.session.commit()
+
+        # then
+        transit = json.loads(self.transit_view_projection.find_document(self.request_uuid))
+        self.assertTrue(transit["driver"]["is_occupied"])
+        self.assertTrue(transit["proposed_drivers"][0]["is_occupied"])
+
+    def test_checker_repairs_views_that_drifted(self):
+        # given
+        driver = self.driver_fixture.an_active_regular_driver()
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(
+            self.a_transit(Status.TRANSIT_TO_PASSENGER, driver=self.driver_service.load_driver(driver.id))
+        )
+        self.transit_view_projection.project(self.request_uuid)
+        # and
+        self.driver_service.mark_occupied(driver.id)
+        self.driver_service.driver_repository.session.commit()
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(
+            self.a_transit(Status.TRANSIT_TO_PASSENGER, driver=self.driver_service.load_driver(driver.id))
+        )
+
+        # expect
+        self.assertEqual(0, self.consistency_checker.check())
+
+        # given
+        when(TransitViewProjection).assemble(self.request_uuid).thenReturn(
+            self.a_transit(Status.TRANSIT_TO_PASSENGER, driver=self.driver_service.load_driver(driver.id), driver_fee=5)
+        )
+
+        # expect
+        self.assertEqual(1, self.consistency_checker.check())
+        self.assertEqual(5, json.loads(self.transit_view_projection.find_document(self.request_uuid))["driver_fee"])
+        self.assertEqual(0, self.consistency_checker.check())
+
+    def test_checker_skips_finished_transits_and_goes_on_where_it_stopped(self):
+        # given
+        finished, first, second = self.request_uuid, *sorted([new_uuid(), new_uuid()])
+        when(TransitViewProjection).assemble(finished).thenReturn(
+            self.a_transit(Status.COMPLETED, request_uuid=finished)
+        )
+        when(TransitViewProjection).assemble(first).thenReturn(self.a_transit(Status.IN_TRANSIT, request_uuid=first))
+        when(TransitViewProjection).assemble(second).thenReturn(self.a_transit(Status.IN_TRANSIT, request_uuid=second))
+        for request_uuid in [finished, first, second]:
+            self.transit_view_projection.project(request_uuid)
+        # and
+        for request_uuid in [finished, first, second]:
+            when(TransitViewProjection).assemble(request_uuid).thenReturn(
+                self.a_transit(Status.CANCELLED, request_uuid=request_uuid)
+            )
+        # and
+        self.consistency_checker.app_properties.transit_view_check_limit = 1
+
+        # expect
+        self.assertEqual(1, self.consistency_checker.check())
+        self.assertEqual([Status.CANCELLED, Status.IN_TRANSIT], [self.status_of(first), self.status_of(second)])
+        # and
+        self.assertEqual(1, self.consistency_checker.check())
+        self.assertEqual(Status.CANCELLED, self.status_of(second))
+        # and
+        self.assertEqual(0, self.consistency_checker.check())
+        self.assertEqual(Status.COMPLETED, self.status_of(finished))
+
+    def status_of(self, request_uuid) -> Status:
+        return Status(json.loads(self.transit_view_projection.find_document(request_uuid))["status"])
+
+    def a_transit(self, status: Status, request_uuid=None, driver: DriverDTO = None, **data) -> TransitDTO:
+        driver = driver or DriverDTO(
+            id=7,
+            first_name="Jan",
+            last_name="Nowak",
+            driver_license="FARME100165AB5EW",
+            status=Driver.Status.ACTIVE,
+            type=Driver.Type.REGULAR,
+            is_occupied=False,
+        )
+        return TransitDTO(
+            id=1,
+            request_id=request_uuid or self.request_uuid,
+            status=status,
+            proposed_drivers={driver},
+            assigned_driver=driver.id,
+            **data
+        )
+
+    def tearDown(self) -> None:
+        self.consistency_checker.app_properties.transit_view_check_limit = self.original_check_limit
+        unstub()
+        drop_db_and_tables()
@@ -0,0 +1,99 @@
+import threading
+from decimal import Decimal
+from typing import List
+from unittest import TestCase
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from core.database import create_db_and_tables, drop_db_and_tables
+from core.unit_of_work import UnitOfWork, after_commit
+from crm.client import Client
+from crm.client_repository import ClientRepositoryImp
+from invocing.invoice import Invoice
+from invocing.invoice_repository import InvoiceRepositoryImp
+
+from tests.common.fixtures import DependencyResolver
+
+dependency_resolver = DependencyResolver()
+
+
+class TestUnitOfWorkIntegration(TestCase):
+    unit_of_work: UnitOfWork = dependency_resolver.resolve_dependency(UnitOfWork)
+    invoice_repository: InvoiceRepositoryImp = dependency_resolver.resolve_dependency(InvoiceRepositoryImp)
+    client_repository: ClientRepositoryImp = dependency_resolver.resolve_dependency(ClientRepositoryImp)
+    session: Session = dependency_resolver.resolve_dependency(Session)
+
+    def setUp(self):
+        create_db_and_tables()
+        self.commits: List[Session] = []
+        self.count_commit = self.commits.append
+        event.listen(self.session, "after_commit", self.count_commit)
+
+    def test_repositories_join_one_transaction(self):
+        # when
+        with self.unit_of_work.begin():
+            self.invoice_repository.save(self.an_invoice())
+            with self.unit_of_work.begin():
+                self.invoice_repository.save(self.an_invoice())
+            self.invoice_repository.save(self.an_invoice())
+            self.client_repository.save(Client())
+
+        # then
+        self.assertEqual(1, len(self.commits))
+        self.assertEqual(3, self.session.query(Invoice).count())
+        self.assertEqual(1, self.session.query(Client).count())
+
+    def test_unit_of_another_request_waits_for_open_one(self):
+        # given
+        finished: List[str] = []
+
+        def another_request():
+            with self.unit_of_work.begin():
+                finished.append("another")
+
+        # when
+        with self.unit_of_work.begin():
+            thread = threading.Thread(target=another_request)
+            thread.start()
+            thread.join(timeout=0.2)
+            finished.append("first")
+        thread.join()
+
+        # then
+        self.assertEqual(["first", "another"], finished)
+
+    def test_failure_leaves_nothing_behind(self):
+        # given
+        committed: List[str] = []
+
+        # when
+        with self.assertRaises(AttributeError):
+            with self.unit_of_work.begin():
+                self.invoice_repository.save(self.an_invoice())
+                after_commit(lambda: committed.append("invoice"))
+                raise AttributeError("Transit does not exist, id = 1")
+
+        # then
+        self.assertEqual(0, self.session.query(Invoice).count())
+        self.assertEqual([], committed)
+        self.assertEqual([], self.commits)
+
+    def test_saves_outside_unit_of_work_commit_right_away(self):
+        # given
+        committed: List[str] = []
+
+        # when
+        self.invoice_repository.save(self.an_invoice())
+        after_commit(lambda: committed.append("invoice"))
+
+        # then
+        self.assertEqual(1, len(self.commits))
+        self.assertEqual(["invoice"], committed)
+
+    def an_invoice(self) -> Invoice:
+        return Invoice(amount=Decimal(100), subject_name="Jan Kowalski")
+
+    def tearDown(self) -> None:
+        event.remove(self.session, "after_commit", self.count_commit)
+        drop_db_and_tables()
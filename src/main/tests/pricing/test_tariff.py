@@ -1,6 +1,9 @@
+import random
 from datetime import datetime
 from unittest import TestCase
 
+import numpy as np
+
 from geolocation.distance import Distance
 from money import Money
 from pricing.tariff import Tariff
@@ -51,3 +54,25 @@ class TestTariff(TestCase):
         self.assertEqual(Money(6000), tariff.calculate_cost(Distance.of_km(20)))
         self.assertEqual("Weekend+", tariff.name)
         self.assertEqual(2.5, tariff.km_rate)
+
+    def test_costs_of_many_distances_are_rounded_like_single_cost(self):
+        # Given
+        generator = random.Random(42)
+        tariffs = [Tariff(1.0, "Standard", 9), Tariff(1.5, "Weekend", 8), Tariff(2.5, "Weekend+", 10),
+                   Tariff(3.5, "Sylwester", 11)]
+        distances = [generator.choice([generator.uniform(0, 100), generator.randint(0, 20000) * 0.005])
+                     for _ in range(20000)]
+        chosen = [generator.choice(tariffs) for _ in distances]
+
+        # When
+        costs = Tariff.calculate_cost_many(
+            np.array(distances),
+            np.array([tariff.km_rate for tariff in chosen]),
+            np.array([tariff.base_fee for tariff in chosen]),
+        )
+
+        # Then
+        self.assertEqual(
+            [tariff.calculate_cost(Distance.of_km(distance)).to_int() for tariff, distance in zip(chosen, distances)],
+            costs.tolist()
+        )
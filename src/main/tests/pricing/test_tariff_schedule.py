@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+
+from dateutil.tz import tzlocal
+
+from pricing.tariff import Tariff
+from pricing.tariff_schedule import TariffSchedule
+from pricing.tariffs import Tariffs
+
+
+class TestTariffSchedule(TestCase):
+
+    def setUp(self):
+        self.tariffs = Tariffs(TariffSchedule(SimpleNamespace(tariff_holidays=["12-31", "01-01 00-06"])))
+
+    def test_chooses_same_tariffs_as_rules_over_full_year(self):
+        for year in (2021, 2024):
+            # given
+            moments = [datetime(year, 1, 1) + timedelta(minutes=30 * step) for step in range(366 * 48)]
+
+            # when
+            chosen = self.tariffs.choose_many(moments)
+
+            # then
+            for moment, tariff in zip(moments, chosen):
+                expected = Tariff.of_time(moment.astimezone(tzlocal()))
+                self.assertEqual(
+                    (expected.name, expected.km_rate, expected.base_fee),
+                    (tariff.name, tariff.km_rate, tariff.base_fee),
+                    moment
+                )
+                self.assertIs(self.tariffs.choose(moment), tariff)
+
+    def test_holiday_calendar_overrides_weekly_rules(self):
+        # given
+        tariffs = Tariffs(TariffSchedule(SimpleNamespace(tariff_holidays=["05-03", "2021-11-11 10-12"])))
+
+        # expect
+        self.assertEqual("Sylwester", tariffs.choose(datetime(2021, 5, 3, 8, 30)).name)
+        self.assertEqual("Sylwester", tariffs.choose(datetime(2022, 5, 3, 23, 30)).name)
+        self.assertEqual("Sylwester", tariffs.choose(datetime(2021, 11, 11, 12, 59)).name)
+        self.assertEqual("Standard", tariffs.choose(datetime(2021, 11, 11, 13, 0)).name)
+        self.assertEqual("Standard", tariffs.choose(datetime(2022, 11, 11, 11, 0)).name)
+        self.assertEqual("Standard", tariffs.choose(datetime(2021, 12, 31, 8, 30)).name)
+
+    def test_rejects_illegal_holidays(self):
+        # expect
+        for holiday in ["05-03 20-10", "05-03 20-24", "02-30", "05", "2021-05-03-01", "05-xx", "05-03 20"]:
+            with self.assertRaises(ValueError):
+                TariffSchedule(SimpleNamespace(tariff_holidays=[holiday]))
+
+    def test_shared_tariffs_cannot_be_changed(self):
+        # given
+        tariff = self.tariffs.choose(datetime(2021, 4, 19, 12, 12))
+
+        # expect
+        with self.assertRaises(AttributeError):
+            tariff.km_rate = 0
+        with self.assertRaises(AttributeError):
+            del tariff.base_fee
+        self.assertEqual((1.0, 9), (TariffSchedule.STANDARD.km_rate, TariffSchedule.STANDARD.base_fee))
@@ -0,0 +1,178 @@
+import random
+from datetime import datetime
+from unittest import TestCase
+
+from dateutil.relativedelta import relativedelta
+
+from tracking.driver_position import DriverPosition
+from tracking.driver_position_index import DriverPositionIndex
+
+
+class TestDriverPositionIndex(TestCase):
+    NOON: datetime = datetime(1989, 12, 12, 12, 12)
+
+    def setUp(self):
+        self.index = DriverPositionIndex()
+
+    def test_finds_drivers_inside_searched_box(self):
+        # given
+        self.index.update(1, 52.23, 21.01, self.NOON)
+        self.index.update(2, 52.24, 21.02, self.NOON)
+        self.index.update(3, 50.06, 19.94, self.NOON)
+
+        # when
+        found = self.index.find_average_driver_position_since(
+            52.2, 52.3, 20.9, 21.1, self.NOON - relativedelta(minutes=5))
+
+        # then
+        self.assertEqual({1, 2}, {position.driver_id for position in found})
+
+    def test_averages_positions_from_searched_period(self):
+        # given
+        self.index.update(1, 52.0, 21.0, self.NOON - relativedelta(minutes=10))
+        self.index.update(1, 52.2, 21.2, self.NOON - relativedelta(minutes=2))
+        self.index.update(1, 52.4, 21.4, self.NOON)
+
+        # when
+        found = self.index.find_average_driver_position_since(
+            51.0, 53.0, 20.0, 22.0, self.NOON - relativedelta(minutes=5))
+
+        # then
+        self.assertEqual(1, len(found))
+        self.assertAlmostEqual(52.3, found[0].latitude)
+        self.assertAlmostEqual(21.3, found[0].longitude)
+        self.assertEqual(self.NOON, found[0].seen_at)
+
+    def test_averages_only_pings_inside_searched_box(self):
+        # given
+        self.index.update(1, 52.29, 21.0, self.NOON - relativedelta(minutes=2))
+        self.index.update(1, 52.27, 21.0, self.NOON - relativedelta(minutes=1))
+        self.index.update(1, 52.5, 21.0, self.NOON)
+        self.index.update(1, 52.7, 21.0, self.NOON)
+
+        # when
+        found = self.index.find_average_driver_position_since(
+            52.2, 52.3, 20.9, 21.1, self.NOON - relativedelta(minutes=5))
+
+        # then
+        self.assertEqual(1, len(found))
+        self.assertAlmostEqual(52.28, found[0].latitude)
+        self.assertEqual(self.NOON - relativedelta(minutes=1), found[0].seen_at)
+
+    def test_covers_only_periods_it_still_has_pings_for(self):
+        # given
+        self.index.update(1, 52.23, 21.01, self.NOON - relativedelta(minutes=7))
+        self.index.update(1, 52.23, 21.01, self.NOON)
+
+        # expect
+        self.assertTrue(self.index.covers(self.NOON - relativedelta(minutes=5)))
+        self.assertFalse(self.index.covers(self.NOON - relativedelta(minutes=7)))
+
+    def test_skips_drivers_not_seen_in_searched_period(self):
+        # given
+        self.index.update(1, 52.23, 21.01, self.NOON - relativedelta(minutes=6))
+
+        # when
+        found = self.index.find_average_driver_position_since(
+            52.2, 52.3, 20.9, 21.1, self.NOON - relativedelta(minutes=5))
+
+        # then
+        self.assertEqual([], found)
+
+    def test_moves_driver_between_cells(self):
+        # given
+        self.index.update(1, 52.23, 21.01, self.NOON - relativedelta(minutes=10))
+
+        # when
+        self.index.update(1, 50.06, 19.94, self.NOON)
+
+        # then
+        self.assertEqual([], self.index.find_average_driver_position_since(
+            52.2, 52.3, 20.9, 21.1, self.NOON - relativedelta(minutes=5)))
+        self.assertEqual(1, len(self.index.find_average_driver_position_since(
+            50.0, 50.1, 19.9, 20.0, self.NOON - relativedelta(minutes=5))))
+
+    def test_drops_drivers_who_stopped_pinging(self):
+        # given
+        self.index.update(1, 52.23, 21.01, self.NOON - relativedelta(minutes=6))
+
+        # when
+        self.index.update(2, 50.06, 19.94, self.NOON)
+
+        # then
+        self.assertFalse(self.index.covers(self.NOON - relativedelta(minutes=6)))
+        self.assertTrue(self.index.covers(self.NOON - relativedelta(minutes=5)))
+        self.assertEqual([], self.index.find_pings_since(
+            52.2, 52.3, 20.9, 21.1, self.NOON - relativedelta(minutes=10)))
+
+    def test_average_agrees_with_averaging_all_pings(self):
+        # given
+        generator = random.Random(7)
+        pings = []
+        for second in range(0, 3600, 7):
+            # and some pings arrive late
+            seen_at = self.NOON + relativedelta(seconds=second - generator.choice([0, 0, 0, 13, 400]))
+            pings.append((seen_at, generator.uniform(52.2, 52.3), generator.uniform(20.9, 21.1)))
+            self.index.update(1, pings[-1][1], pings[-1][2], seen_at)
+
+            # when
+            since = self.NOON + relativedelta(seconds=second, minutes=-5, microseconds=generator.randint(0, 999999))
+            found = self.index.find_average_driver_position_since(52.0, 53.0, 20.0, 22.0, since)
+
+            # then
+            newest = max(seen for seen, _, _ in pings)
+            in_window = [
+                (latitude, longitude) for seen, latitude, longitude in pings
+                if seen >= since and seen >= newest - relativedelta(minutes=5)
+            ]
+            if not in_window:
+                self.assertEqual([], found)
+                continue
+            self.assertAlmostEqual(sum(latitude for latitude, _ in in_window) / len(in_window), found[0].latitude, 9)
+            self.assertAlmostEqual(sum(longitude for _, longitude in in_window) / len(in_window), found[0].longitude, 9)
+            self.assertEqual(newest, found[0].seen_at)
+
+    def test_can_be_rebuilt_from_stored_positions(self):
+        # given
+        positions = [
+            DriverPosition(driver_id=1, latitude=52.23, longitude=21.01, seen_at=self.NOON),
+            DriverPosition(driver_id=2, latitude=50.06, longitude=19.94, seen_at=self.NOON),
+        ]
+
+        # when
+        self.index.rebuild(positions)
+
+        # then
+        self.assertTrue(self.index.is_loaded())
+        found = self.index.find_average_driver_position_since(
+            49.0, 53.0, 19.0, 22.0, self.NOON - relativedelta(minutes=5))
+        self.assertEqual({1, 2}, {position.driver_id for position in found})
+
+    def test_refresh_skips_pings_it_already_has(self):
+        # given
+        self.index.rebuild([], self.NOON - relativedelta(minutes=5), 10)
+        self.index.update(1, 52.2, 21.0, self.NOON, 11)
+
+        # when
+        self.index.refresh([
+            DriverPosition(id=11, driver_id=1, latitude=52.2, longitude=21.0, seen_at=self.NOON),
+            DriverPosition(id=12, driver_id=1, latitude=52.3, longitude=21.0, seen_at=self.NOON),
+        ])
+
+        # then
+        found = self.index.find_average_driver_position_since(
+            52.0, 53.0, 20.0, 22.0, self.NOON - relativedelta(minutes=5))
+        self.assertAlmostEqual(52.25, found[0].latitude)
+        self.assertEqual(12, self.index.last_position_id())
+
+    def test_is_empty_after_clear(self):
+        # given
+        self.index.rebuild([DriverPosition(driver_id=1, latitude=52.23, longitude=21.01, seen_at=self.NOON)])
+
+        # when
+        self.index.clear()
+
+        # then
+        self.assertFalse(self.index.is_loaded())
+        self.assertEqual([], self.index.find_average_driver_position_since(
+            52.2, 52.3, 20.9, 21.1, self.NOON - relativedelta(minutes=5)))
@@ -0,0 +1,9 @@
+from typing import NamedTuple
+
+from carfleet.car_class import CarClass
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
+
+
+class AvailableDriver(NamedTuple):
+    position: DriverPositionDTOV2
+    car_class: CarClass
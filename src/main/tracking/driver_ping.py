@@ -0,0 +1,10 @@
+from datetime import datetime
+from typing import NamedTuple
+
+
+class DriverPing(NamedTuple):
+    """One raw position of a driver, without the entity around it."""
+    driver_id: int
+    latitude: float
+    longitude: float
+    seen_at: datetime
@@ -3,11 +3,16 @@ from typing import Optional, Any
 
 from common.base_entity import BaseEntity
 from driverfleet.driver import Driver
-from sqlalchemy import Column, DateTime, Float, Integer
+from sqlalchemy import Column, DateTime, Float, Index, Integer
 from sqlmodel import Field
 
 
 class DriverPosition(BaseEntity, table=True):
+    __table_args__ = (
+        Index('ix_driverposition_driver_id_seen_at', 'driver_id', 'seen_at'),
+        Index('ix_driverposition_seen_at_latitude_longitude', 'seen_at', 'latitude', 'longitude'),
+    )
+
     # @ManyToOne
     driver_id: Optional[int] = Field(default=0, sa_column=Column(Integer, nullable=True))
     # @Column(nullable = false)
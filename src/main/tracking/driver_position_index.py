@@ -0,0 +1,339 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from injector import singleton
+
+from core.process_local_state import register_process_local_state
+from tracking.driver_ping import DriverPing
+from tracking.driver_position import DriverPosition
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
+
+Box = Tuple[float, float, float, float]
+
+
+def _wall_clock(moment: datetime) -> datetime:
+    # Positions are compared the way the database compares them: by wall-clock time, ignoring the zone.
+    return moment.replace(tzinfo=None)
+
+
+class _Bucket:
+    index: int
+    pings: List[Tuple[datetime, float, float, Optional[int]]]
+    newest: Optional[datetime]
+    latitude_min: float
+    latitude_max: float
+    longitude_min: float
+    longitude_max: float
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pings = []
+        self.newest = None
+        self.latitude_min = math.inf
+        self.latitude_max = -math.inf
+        self.longitude_min = math.inf
+        self.longitude_max = -math.inf
+
+    def add(self, latitude: float, longitude: float, seen_at: datetime, position_id: Optional[int]) -> None:
+        self.pings.append((seen_at, latitude, longitude, position_id))
+        self.newest = seen_at if self.newest is None else max(self.newest, seen_at)
+        self.latitude_min = min(self.latitude_min, latitude)
+        self.latitude_max = max(self.latitude_max, latitude)
+        self.longitude_min = min(self.longitude_min, longitude)
+        self.longitude_max = max(self.longitude_max, longitude)
+
+    def is_outside(self, box: Box) -> bool:
+        latitude_min, latitude_max, longitude_min, longitude_max = box
+        return self.latitude_max < latitude_min or latitude_max < self.latitude_min \
+            or self.longitude_max < longitude_min or longitude_max < self.longitude_min
+
+
+class _TrackedDriver:
+    """The pings of one driver over a ring of fixed-width time buckets.
+
+    Adding a ping touches one bucket and evicts whatever bucket it reuses. Each bucket keeps the extent
+    and newest of its pings, so buckets lying wholly outside the searched box or period are skipped.
+    """
+    ring: List[Optional[_Bucket]]
+    newest: Optional[datetime]
+
+    def __init__(self, size: int):
+        self.ring = [None] * size
+        self.newest = None
+
+    def add(
+        self,
+        latitude: float,
+        longitude: float,
+        seen_at: datetime,
+        position_id: Optional[int],
+        bucket_width: timedelta,
+    ) -> Tuple[bool, List[_Bucket]]:
+        # Whether the ping was kept, and the buckets it pushed out of the ring.
+        evicted: List[_Bucket] = []
+        index: int = _bucket_index(seen_at, bucket_width)
+        if self.newest is not None:
+            newest_index: int = _bucket_index(self.newest, bucket_width)
+            if index <= newest_index - len(self.ring):
+                return False, evicted
+            self.__evict_older_than(index - len(self.ring) + 1, newest_index, evicted)
+        bucket: Optional[_Bucket] = self.ring[index % len(self.ring)]
+        if bucket is not None and bucket.index > index:
+            return False, evicted
+        if bucket is None or bucket.index < index:
+            if bucket is not None:
+                evicted.append(bucket)
+            bucket = _Bucket(index)
+            self.ring[index % len(self.ring)] = bucket
+        bucket.add(latitude, longitude, seen_at, position_id)
+        if self.newest is None or seen_at > self.newest:
+            self.newest = seen_at
+        return True, evicted
+
+    def pings_since(self, since: datetime, box: Box) -> Iterable[Tuple[datetime, float, float]]:
+        if self.newest is None or self.newest < since:
+            return
+        latitude_min, latitude_max, longitude_min, longitude_max = box
+        for bucket in self.ring:
+            if bucket is None or bucket.newest < since or bucket.is_outside(box):
+                continue
+            for seen_at, latitude, longitude, _ in bucket.pings:
+                if seen_at >= since and latitude_min <= latitude <= latitude_max \
+                        and longitude_min <= longitude <= longitude_max:
+                    yield seen_at, latitude, longitude
+
+    def __evict_older_than(self, index: int, newest_index: int, evicted: List[_Bucket]) -> None:
+        for aged in range(max(newest_index - len(self.ring) + 1, index - len(self.ring)), index):
+            bucket: Optional[_Bucket] = self.ring[aged % len(self.ring)]
+            if bucket is not None and bucket.index == aged:
+                evicted.append(bucket)
+                self.ring[aged % len(self.ring)] = None
+
+
+def _bucket_index(moment: datetime, bucket_width: timedelta) -> int:
+    return (moment - datetime.min) // bucket_width
+
+
+@singleton
+class DriverPositionIndex:
+    """Uniform grid over the recent pings of every tracked driver.
+
+    Answers the `GROUP BY driver_id` over `driverposition` rows without the database: pings inside the
+    searched box seen since the given moment, averaged per driver. A driver is listed in every cell
+    holding one of its pings, so drivers straddling the edge of the box are found the way the SQL finds them.
+
+    Pings are kept for WINDOW after the newest ping of their driver, and drivers whose newest ping is more
+    than WINDOW older than the newest ping of the index are dropped. Periods reaching further back
+    than the pings the index still has are not covered and must be answered by the database.
+    Pings stored by other processes are read by id on refresh; ids already in the index are skipped,
+    so pings of this process are not counted twice.
+    """
+    CELL_SIZE_IN_DEGREES: float = 0.01
+    WINDOW: timedelta = timedelta(minutes=5)
+    BUCKET_WIDTH: timedelta = timedelta(seconds=10)
+
+    __lock: threading.RLock
+    __drivers: Dict[int, _TrackedDriver]
+    __cells: Dict[Tuple[int, int], Dict[int, int]]
+    __complete_since: datetime
+    __newest: datetime
+    __swept_at: datetime
+    __position_ids: Set[int]
+    __last_position_id: int
+    __refreshed_at: float
+    __loaded: bool
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        self.__drivers = {}
+        self.__cells = {}
+        self.__complete_since = datetime.min
+        self.__newest = datetime.min
+        self.__swept_at = datetime.min
+        self.__position_ids = set()
+        self.__last_position_id = 0
+        self.__refreshed_at = 0
+        self.__loaded = False
+        register_process_local_state(self)
+
+    def is_loaded(self) -> bool:
+        return self.__loaded
+
+    def covers(self, date: datetime) -> bool:
+        with self.__lock:
+            return _wall_clock(date) >= self.__complete_since
+
+    def last_position_id(self) -> int:
+        return self.__last_position_id
+
+    def is_older_than(self, seconds: float) -> bool:
+        return time.monotonic() - self.__refreshed_at >= seconds
+
+    def rebuild(
+        self, positions: Iterable[DriverPosition], since: datetime = datetime.min, last_position_id: int = 0
+    ) -> None:
+        with self.__lock:
+            self.__drivers = {}
+            self.__cells = {}
+            self.__position_ids = set()
+            self.__complete_since = _wall_clock(since)
+            self.__newest = datetime.min
+            self.__swept_at = datetime.min
+            self.__last_position_id = last_position_id
+            for position in positions:
+                self.__add(position.driver_id, position.latitude, position.longitude, position.seen_at, position.id)
+            self.__refreshed_at = time.monotonic()
+            self.__loaded = True
+
+    def refresh(self, positions: Iterable[DriverPosition]) -> None:
+        with self.__lock:
+            for position in positions:
+                self.__add(position.driver_id, position.latitude, position.longitude, position.seen_at, position.id)
+                self.__last_position_id = max(self.__last_position_id, position.id)
+            self.__refreshed_at = time.monotonic()
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__drivers = {}
+            self.__cells = {}
+            self.__position_ids = set()
+            self.__complete_since = datetime.min
+            self.__newest = datetime.min
+            self.__swept_at = datetime.min
+            self.__last_position_id = 0
+            self.__refreshed_at = 0
+            self.__loaded = False
+
+    def update(
+        self, driver_id: int, latitude: float, longitude: float, seen_at: datetime, position_id: Optional[int] = None
+    ) -> None:
+        with self.__lock:
+            self.__add(driver_id, latitude, longitude, seen_at, position_id)
+
+    def find_average_driver_position_since(
+        self,
+        latitude_min: float,
+        latitude_max: float,
+        longitude_min: float,
+        longitude_max: float,
+        date: datetime
+    ) -> List[DriverPositionDTOV2]:
+        since: datetime = _wall_clock(date)
+        box: Box = (latitude_min, latitude_max, longitude_min, longitude_max)
+        found: List[DriverPositionDTOV2] = []
+        with self.__lock:
+            for driver_id in self.__candidates(latitude_min, latitude_max, longitude_min, longitude_max):
+                pings: List[Tuple[datetime, float, float]] = list(self.__drivers[driver_id].pings_since(since, box))
+                if not pings:
+                    continue
+                found.append(DriverPositionDTOV2(
+                    driver_id=driver_id,
+                    latitude=sum(latitude for _, latitude, _ in pings) / len(pings),
+                    longitude=sum(longitude for _, _, longitude in pings) / len(pings),
+                    seen_at=max(seen_at for seen_at, _, _ in pings)
+                ))
+        return found
+
+    def find_pings_since(
+        self,
+        latitude_min: float,
+        latitude_max: float,
+        longitude_min: float,
+        longitude_max: float,
+        date: datetime
+    ) -> List[DriverPing]:
+        since: datetime = _wall_clock(date)
+        box: Box = (latitude_min, latitude_max, longitude_min, longitude_max)
+        found: List[DriverPing] = []
+        with self.__lock:
+            for driver_id in self.__candidates(latitude_min, latitude_max, longitude_min, longitude_max):
+                found.extend(
+                    DriverPing(driver_id, latitude, longitude, seen_at)
+                    for seen_at, latitude, longitude in self.__drivers[driver_id].pings_since(since, box)
+                )
+        return found
+
+    def __add(
+        self, driver_id: int, latitude: float, longitude: float, seen_at: datetime, position_id: Optional[int]
+    ) -> None:
+        if position_id is not None and position_id in self.__position_ids:
+            return
+        driver: _TrackedDriver = self.__drivers.get(driver_id)
+        if driver is None:
+            driver = _TrackedDriver(self.WINDOW // self.BUCKET_WIDTH + 1)
+            self.__drivers[driver_id] = driver
+        seen_at = _wall_clock(seen_at)
+        kept, evicted = driver.add(latitude, longitude, seen_at, position_id, self.BUCKET_WIDTH)
+        if kept:
+            self.__enter(driver_id, self.__cell_of(latitude, longitude))
+            if position_id is not None:
+                self.__position_ids.add(position_id)
+        else:
+            self.__forget_up_to(seen_at)
+        for bucket in evicted:
+            self.__drop(driver_id, bucket)
+        if seen_at > self.__newest:
+            self.__newest = seen_at
+            if self.__newest - self.__swept_at >= self.BUCKET_WIDTH:
+                self.__drop_idle_drivers()
+
+    def __drop_idle_drivers(self) -> None:
+        # Drivers who stopped pinging have nothing that could be found any more, but would be kept forever.
+        self.__swept_at = self.__newest
+        for driver_id in [
+            driver_id for driver_id, driver in self.__drivers.items() if driver.newest < self.__newest - self.WINDOW
+        ]:
+            for bucket in self.__drivers.pop(driver_id).ring:
+                if bucket is not None:
+                    self.__drop(driver_id, bucket)
+
+    def __drop(self, driver_id: int, bucket: _Bucket) -> None:
+        self.__forget_up_to(bucket.newest)
+        for _, latitude, longitude, position_id in bucket.pings:
+            self.__leave(driver_id, self.__cell_of(latitude, longitude))
+            self.__position_ids.discard(position_id)
+
+    def __forget_up_to(self, seen_at: datetime) -> None:
+        # A ping dropped from the index leaves every period starting at or before it incomplete.
+        self.__complete_since = max(self.__complete_since, seen_at + timedelta(microseconds=1))
+
+    def __enter(self, driver_id: int, cell: Tuple[int, int]) -> None:
+        drivers: Dict[int, int] = self.__cells.setdefault(cell, {})
+        drivers[driver_id] = drivers.get(driver_id, 0) + 1
+
+    def __leave(self, driver_id: int, cell: Tuple[int, int]) -> None:
+        drivers: Dict[int, int] = self.__cells[cell]
+        drivers[driver_id] -= 1
+        if not drivers[driver_id]:
+            del drivers[driver_id]
+            if not drivers:
+                del self.__cells[cell]
+
+    def __candidates(
+        self,
+        latitude_min: float,
+        latitude_max: float,
+        longitude_min: float,
+        longitude_max: float,
+    ) -> Iterable[int]:
+        lat_from, lon_from = self.__cell_of(latitude_min, longitude_min)
+        lat_to, lon_to = self.__cell_of(latitude_max, longitude_max)
+        candidates: Set[int] = set()
+        if (lat_to - lat_from + 1) * (lon_to - lon_from + 1) > len(self.__cells):
+            for (lat_cell, lon_cell), driver_ids in self.__cells.items():
+                if lat_from <= lat_cell <= lat_to and lon_from <= lon_cell <= lon_to:
+                    candidates.update(driver_ids)
+            return candidates
+        for lat_cell in range(lat_from, lat_to + 1):
+            for lon_cell in range(lon_from, lon_to + 1):
+                candidates.update(self.__cells.get((lat_cell, lon_cell), ()))
+        return candidates
+
+    def __cell_of(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            math.floor(latitude / self.CELL_SIZE_IN_DEGREES),
+            math.floor(longitude / self.CELL_SIZE_IN_DEGREES),
+        )
@@ -4,10 +4,13 @@ from typing import List, Optional
 from injector import inject
 
 from driverfleet.driver import Driver
+from tracking.driver_ping import DriverPing
 from tracking.driver_position_dtov_2 import DriverPositionDTOV2
 from tracking.driver_position import DriverPosition
-from sqlalchemy import text, Float, DateTime, Integer
+from tracking.driver_position_track import DriverPositionTrack
+from sqlalchemy import text, func, Float, DateTime, Integer, bindparam
 from sqlmodel import Session
+from core.unit_of_work import flush_or_commit
 
 
 class DriverPositionRepositoryImp:
@@ -19,10 +22,14 @@ class DriverPositionRepositoryImp:
 
     def save(self, driver_position: DriverPosition) -> Optional[DriverPosition]:
         self.session.add(driver_position)
-        self.session.commit()
-        self.session.refresh(driver_position)
+        flush_or_commit(self.session, driver_position)
         return driver_position
 
+    def save_all(self, driver_positions: List[DriverPosition]) -> List[DriverPosition]:
+        self.session.add_all(driver_positions)
+        flush_or_commit(self.session)
+        return driver_positions
+
     def find_by_driver_and_seen_at_between_order_by_seen_at_asc(
             self, driver: Driver, from_position: datetime, to_position: datetime) -> List[DriverPosition]:
         return self.session.query(DriverPosition).where(
@@ -35,6 +42,105 @@ class DriverPositionRepositoryImp:
             DriverPosition.seen_at.asc()
         ).all()
 
+    def find_all_by_seen_at_after(self, date: datetime) -> List[DriverPosition]:
+        return self.session.query(DriverPosition).where(
+            DriverPosition.seen_at >= date
+        ).order_by(
+            DriverPosition.seen_at.asc()
+        ).all()
+
+    def find_all_by_id_after(self, position_id: int) -> List[DriverPosition]:
+        return self.session.query(DriverPosition).where(
+            DriverPosition.id > position_id
+        ).order_by(
+            DriverPosition.id.asc()
+        ).all()
+
+    def find_last_id(self) -> int:
+        return self.session.query(func.max(DriverPosition.id)).scalar() or 0
+
+    def find_oldest_seen_at(self) -> Optional[datetime]:
+        return self.session.query(func.min(DriverPosition.seen_at)).scalar()
+
+    def find_driver_ids_by_seen_at_between(self, from_position: datetime, to_position: datetime) -> List[int]:
+        return [
+            row[0] for row in self.session.query(DriverPosition.driver_id).where(
+                DriverPosition.seen_at >= from_position
+            ).where(
+                DriverPosition.seen_at < to_position
+            ).distinct().order_by(
+                DriverPosition.driver_id.asc()
+            ).all()
+        ]
+
+    def find_all_by_driver_ids_and_seen_at_between_order_by_driver(
+            self, driver_ids: List[int], from_position: datetime, to_position: datetime) -> List[DriverPosition]:
+        return self.session.query(DriverPosition).where(
+            DriverPosition.driver_id.in_(driver_ids)
+        ).where(
+            DriverPosition.seen_at >= from_position
+        ).where(
+            DriverPosition.seen_at < to_position
+        ).order_by(
+            DriverPosition.driver_id.asc(), DriverPosition.seen_at.asc()
+        ).all()
+
+    def replace_with_track(
+            self,
+            driver_ids: List[int],
+            from_position: datetime,
+            to_position: datetime,
+            track: List[DriverPositionTrack]
+    ) -> None:
+        # The track points and the removal of the raw rows they stand for are committed together;
+        # points already there from an earlier run are kept.
+        if track:
+            stmt = text(
+                "INSERT INTO driverpositiontrack (driver_id, seen_at, latitude, longitude)"
+                " VALUES (:driver_id, :seen_at, :latitude, :longitude)"
+                " ON CONFLICT (driver_id, seen_at) DO NOTHING"
+            ).bindparams(
+                bindparam("seen_at", type_=DateTime),
+            )
+            self.session.execute(stmt, [
+                {
+                    "driver_id": point.driver_id,
+                    "seen_at": point.seen_at,
+                    "latitude": point.latitude,
+                    "longitude": point.longitude,
+                }
+                for point in track
+            ])
+        self.session.query(DriverPosition).where(
+            DriverPosition.driver_id.in_(driver_ids)
+        ).where(
+            DriverPosition.seen_at >= from_position
+        ).where(
+            DriverPosition.seen_at < to_position
+        ).delete(synchronize_session=False)
+        self.session.commit()
+
+    def find_all_pings_since(
+        self,
+        latitude_min: float,
+        latitude_max: float,
+        longitude_min: float,
+        longitude_max: float,
+        date: datetime
+    ) -> List[DriverPing]:
+        return [
+            DriverPing(*row)
+            for row in self.session.query(
+                DriverPosition.driver_id, DriverPosition.latitude, DriverPosition.longitude, DriverPosition.seen_at
+            ).where(
+                DriverPosition.latitude.between(latitude_min, latitude_max)
+            ).where(
+                DriverPosition.longitude.between(longitude_min, longitude_max)
+            ).where(
+                DriverPosition.seen_at >= date
+            ).all()
+        ]
+
     def find_average_driver_position_since(
         self,
         latitude_min,
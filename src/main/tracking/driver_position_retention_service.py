@@ -0,0 +1,101 @@
+import csv
+import gzip
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from injector import inject
+
+from config.app_properties import AppProperties
+from tracking.driver_position import DriverPosition
+from tracking.driver_position_repository import DriverPositionRepositoryImp
+from tracking.driver_position_track import DriverPositionTrack
+
+
+class DriverPositionRetentionService:
+    """Moves raw pings older than the retention period out of the `driverposition` table.
+
+    Days are handled a batch of drivers at a time: the raw rows go to a gzipped CSV file per day,
+    a downsampled track stays in the database for reporting and the raw rows are deleted.
+    """
+    ARCHIVE_COLUMNS: Tuple[str, ...] = ("id", "driver_id", "latitude", "longitude", "seen_at")
+
+    driver_position_repository: DriverPositionRepositoryImp
+    app_properties: AppProperties
+
+    @inject
+    def __init__(
+            self,
+            driver_position_repository: DriverPositionRepositoryImp,
+            app_properties: AppProperties,
+    ):
+        self.driver_position_repository = driver_position_repository
+        self.app_properties = app_properties
+
+    def apply_retention(self, now: Optional[datetime] = None) -> int:
+        now = (now or datetime.now()).replace(tzinfo=None)
+        retained_from: datetime = _day_of(now - timedelta(days=self.app_properties.driver_position_retention_in_days))
+        oldest: Optional[datetime] = self.driver_position_repository.find_oldest_seen_at()
+        if oldest is None:
+            return 0
+        archived: int = 0
+        day: datetime = _day_of(oldest)
+        while day < retained_from:
+            archived += self.__archive_day(day)
+            day = day + timedelta(days=1)
+        return archived
+
+    def archive_path(self, day: datetime) -> str:
+        return os.path.join(
+            self.app_properties.driver_position_archive_directory,
+            f"driverposition-{day:%Y-%m-%d}.csv.gz"
+        )
+
+    def __archive_day(self, day: datetime) -> int:
+        next_day: datetime = day + timedelta(days=1)
+        driver_ids: List[int] = self.driver_position_repository.find_driver_ids_by_seen_at_between(day, next_day)
+        batch_size: int = self.app_properties.driver_position_retention_batch_size
+        archived: int = 0
+        for start in range(0, len(driver_ids), batch_size):
+            batch: List[int] = driver_ids[start:start + batch_size]
+            positions: List[DriverPosition] = \
+                self.driver_position_repository.find_all_by_driver_ids_and_seen_at_between_order_by_driver(
+                    batch, day, next_day)
+            # The file is written before the rows are deleted, so a failed run archives rows twice, never loses them.
+            self.__write_archive(day, positions)
+            self.driver_position_repository.replace_with_track(batch, day, next_day, self.__downsample(positions))
+            archived += len(positions)
+        return archived
+
+    def __write_archive(self, day: datetime, positions: List[DriverPosition]) -> None:
+        path: str = self.archive_path(day)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        is_new: bool = not os.path.exists(path)
+        with gzip.open(path, "at", newline="") as archive:
+            writer = csv.writer(archive)
+            if is_new:
+                writer.writerow(self.ARCHIVE_COLUMNS)
+            writer.writerows(
+                (position.id, position.driver_id, position.latitude, position.longitude, position.seen_at.isoformat())
+                for position in positions
+            )
+
+    def __downsample(self, positions: List[DriverPosition]) -> List[DriverPositionTrack]:
+        resolution: timedelta = timedelta(seconds=self.app_properties.driver_position_track_resolution_in_seconds)
+        first_in_bucket: Dict[Tuple[int, int], DriverPosition] = {}
+        for position in positions:
+            bucket: int = (position.seen_at.replace(tzinfo=None) - datetime.min) // resolution
+            first_in_bucket.setdefault((position.driver_id, bucket), position)
+        return [
+            DriverPositionTrack(
+                driver_id=position.driver_id,
+                seen_at=position.seen_at,
+                latitude=position.latitude,
+                longitude=position.longitude,
+            )
+            for position in first_in_bucket.values()
+        ]
+
+
+def _day_of(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
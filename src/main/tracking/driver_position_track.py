@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer
+from sqlmodel import Field, SQLModel
+
+
+class DriverPositionTrack(SQLModel, table=True):
+    """Downsampled positions kept for reporting after the raw pings are archived."""
+    __table_args__ = {'extend_existing': True}
+
+    driver_id: int = Field(sa_column=Column(Integer, primary_key=True, nullable=False))
+    seen_at: datetime = Field(sa_column=Column(DateTime, primary_key=True, nullable=False))
+    latitude: float = Field(sa_column=Column(Float, nullable=False))
+    longitude: float = Field(sa_column=Column(Float, nullable=False))
@@ -0,0 +1,100 @@
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from injector import singleton
+
+from carfleet.car_class import CarClass
+from core.process_local_state import register_process_local_state
+from tracking.driver_session import DriverSession
+
+
+class LoggedInSession(NamedTuple):
+    session_id: int
+    car_class: Optional[CarClass]
+    plates_number: str
+    car_brand: Optional[str]
+
+
+@singleton
+class DriverSessionRegistry:
+    """Sessions that are not logged out yet, per driver.
+
+    Kept next to the database by the session service, so that finding which drivers are logged in
+    does not need a query. Log ins and log outs of this process are applied once they commit; those of
+    other processes are picked up when the registry is rebuilt after its TTL. Every local change bumps
+    the version, so a rebuild read while a change was being made is not applied.
+    """
+    __lock: threading.RLock
+    __sessions: Dict[int, Dict[int, LoggedInSession]]
+    __version: int
+    __rebuilt_at: float
+    __loaded: bool
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        self.__sessions = {}
+        self.__version = 0
+        self.__rebuilt_at = 0
+        self.__loaded = False
+        register_process_local_state(self)
+
+    def is_loaded(self) -> bool:
+        return self.__loaded
+
+    def is_older_than(self, seconds: float) -> bool:
+        return time.monotonic() - self.__rebuilt_at >= seconds
+
+    def version(self) -> int:
+        return self.__version
+
+    def rebuild(self, sessions: Iterable[DriverSession], version: Optional[int] = None) -> None:
+        with self.__lock:
+            is_current: bool = version is None or version == self.__version
+            if not is_current and self.__loaded:
+                return
+            self.__sessions = {}
+            for session in sessions:
+                self.__add(session)
+            if is_current:
+                self.__rebuilt_at = time.monotonic()
+            self.__loaded = True
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__sessions = {}
+            self.__version += 1
+            self.__rebuilt_at = 0
+            self.__loaded = False
+
+    def logged_in(self, session: DriverSession) -> None:
+        with self.__lock:
+            self.__version += 1
+            self.__add(session)
+
+    def logged_out(self, session: DriverSession) -> None:
+        with self.__lock:
+            self.__version += 1
+            driver_sessions: Dict[int, LoggedInSession] = self.__sessions.get(session.driver_id, {})
+            driver_sessions.pop(session.id, None)
+            if not driver_sessions:
+                self.__sessions.pop(session.driver_id, None)
+
+    def find_logged_car_classes(self, driver_ids: List[int], car_classes: List[CarClass]) -> Dict[int, CarClass]:
+        wanted = set(car_classes)
+        found: Dict[int, CarClass] = {}
+        with self.__lock:
+            for driver_id in driver_ids:
+                for session in self.__sessions.get(driver_id, {}).values():
+                    if session.car_class in wanted:
+                        found[driver_id] = session.car_class
+                        break
+        return found
+
+    def __add(self, session: DriverSession) -> None:
+        self.__sessions.setdefault(session.driver_id, {})[session.id] = LoggedInSession(
+            session_id=session.id,
+            car_class=session.car_class,
+            plates_number=session.plates_number,
+            car_brand=session.car_brand,
+        )
@@ -5,6 +5,7 @@ from injector import inject
 from sqlalchemy import desc
 
 from carfleet.car_class import CarClass
+from core.unit_of_work import flush_or_commit
 from tracking.driver_session import DriverSession
 from sqlmodel import Session
 
@@ -31,6 +32,9 @@ class DriverSessionRepositoryImp:
             DriverSession.car_class.in_(car_classes)
         ).all()
 
+    def find_all_by_logged_out_at_null(self) -> List[DriverSession]:
+        return self.session.query(DriverSession).where(DriverSession.logged_out_at == None).all()
+
     def find_all_by_driver_and_logged_at_after(self, driver_id: int, since: datetime) -> List[DriverSession]:
         return self.session.query(
             DriverSession
@@ -38,8 +42,7 @@ class DriverSessionRepositoryImp:
 
     def save(self, driver_session: DriverSession) -> Optional[DriverSession]:
         self.session.add(driver_session)
-        self.session.commit()
-        self.session.refresh(driver_session)
+        flush_or_commit(self.session, driver_session)
         return driver_session
 
     def get_one(self, session_id) -> Optional[DriverSession]:
@@ -1,10 +1,13 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 
 from injector import inject
 
 from carfleet.car_class import CarClass
+from config.app_properties import AppProperties
+from core.unit_of_work import after_commit
 from tracking.driver_session import DriverSession
+from tracking.driver_session_registry import DriverSessionRegistry
 from tracking.driver_session_repository import DriverSessionRepositoryImp
 from carfleet.car_type_service import CarTypeService
 
@@ -12,15 +15,21 @@ from carfleet.car_type_service import CarTypeService
 class DriverSessionService:
     driver_session_repository: DriverSessionRepositoryImp
     car_type_service: CarTypeService
+    driver_session_registry: DriverSessionRegistry
+    app_properties: AppProperties
 
     @inject
     def __init__(
             self,
             driver_session_repository: DriverSessionRepositoryImp,
-            car_type_service: CarTypeService
+            car_type_service: CarTypeService,
+            driver_session_registry: DriverSessionRegistry,
+            app_properties: AppProperties,
     ):
         self.driver_session_repository = driver_session_repository
         self.car_type_service = car_type_service
+        self.driver_session_registry = driver_session_registry
+        self.app_properties = app_properties
 
     def log_in(self, driver_id: int, plates_number: str, car_class: CarClass, car_brand: str) -> DriverSession:
         session = DriverSession()
@@ -30,7 +39,9 @@ class DriverSessionService:
         session.plates_number = plates_number
         session.car_brand = car_brand
         self.car_type_service.register_active_car(session.car_class)
-        return self.driver_session_repository.save(session)
+        session = self.driver_session_repository.save(session)
+        after_commit(lambda: self.driver_session_registry.logged_in(session))
+        return session
 
     def log_out(self, session_id: int) -> None:
         session = self.driver_session_repository.get_one(session_id)
@@ -39,6 +50,7 @@ class DriverSessionService:
         self.car_type_service.unregister_car(session.car_class)
         session.logged_out_at = datetime.now()
         self.driver_session_repository.save(session)
+        after_commit(lambda: self.driver_session_registry.logged_out(session))
 
     def log_out_current_session(self, driver_id: int) -> None:
         session = self.driver_session_repository.find_top_by_driver_and_logged_out_at_is_null_order_by_logged_at_desc(
@@ -47,15 +59,28 @@ class DriverSessionService:
         if session is not None:
             session.logged_out_at = datetime.now()
             self.car_type_service.unregister_car(session.car_class)
+            self.driver_session_repository.save(session)
+            after_commit(lambda: self.driver_session_registry.logged_out(session))
 
     def find_by_driver(self, driver_id):
         return self.driver_session_repository.find_by_driver(driver_id)
 
     def find_currently_logged_driver_ids(self, drivers_ids: List[int], car_classes: List[CarClass]) -> List[int]:
-        return list(map(
-            lambda driver_session: driver_session.driver_id,
-            self.driver_session_repository.find_all_by_logged_out_at_null_and_driver_id_in_and_car_class_in(
-                drivers_ids,
-                car_classes
+        return list(self.find_currently_logged_car_classes(drivers_ids, car_classes))
+
+    def find_currently_logged_car_classes(
+            self,
+            drivers_ids: List[int],
+            car_classes: List[CarClass]
+    ) -> Dict[int, CarClass]:
+        self.load_logged_in_sessions()
+        return self.driver_session_registry.find_logged_car_classes(drivers_ids, car_classes)
+
+    def load_logged_in_sessions(self) -> None:
+        if not self.driver_session_registry.is_loaded() or self.driver_session_registry.is_older_than(
+                self.app_properties.driver_session_registry_ttl_in_seconds):
+            version: int = self.driver_session_registry.version()
+            self.driver_session_registry.rebuild(
+                self.driver_session_repository.find_all_by_logged_out_at_null(),
+                version
             )
-        ))
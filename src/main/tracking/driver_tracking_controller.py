@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List
 
 from fastapi_injector import Injected
 
@@ -25,6 +26,11 @@ class DriverTrackingController:
 
         return self.__to_dto(driver_position)
 
+    @driver_tracking_router.post("/driverPositions/batch")
+    def create_batch(self, driver_position_dtos: List[DriverPositionDTO]) -> List[DriverPositionDTO]:
+        self.tracking_service.register_positions(driver_position_dtos)
+        return driver_position_dtos
+
     @driver_tracking_router.get("/driverPositions/{driver_id}/total")
     def create(self, driver_id: int, from_position: datetime, to_position: datetime) -> float:
         return self.tracking_service.calculate_travelled_distance(
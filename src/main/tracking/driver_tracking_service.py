@@ -1,12 +1,14 @@
-import functools
-import math
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
 
 from dateutil.relativedelta import relativedelta
 from injector import inject
+from sqlalchemy import inspect
 
 from carfleet.car_class import CarClass
+from config.app_properties import AppProperties
+from core.unit_of_work import UnitOfWork, after_commit
 from driverfleet.driver_dto import DriverDTO
 from driverfleet.driver_service import DriverService
 from geolocation.address.address_dto import AddressDTO
@@ -14,10 +16,16 @@ from geolocation.distance import Distance
 from driverfleet.driver import Driver
 from driverfleet.driverreport.travelleddistance.travelled_distance_service import TravelledDistanceService
 from geolocation.geocoding_service import GeocodingService
+from geolocation.nearest_k_selector import NearestKSelector
+from tracking.available_driver import AvailableDriver
+from tracking.driver_ping import DriverPing
 from tracking.driver_position import DriverPosition
+from tracking.driver_position_dto import DriverPositionDTO
+from tracking.driver_position_index import DriverPositionIndex
 from tracking.driver_position_dtov_2 import DriverPositionDTOV2
 from tracking.driver_position_repository import DriverPositionRepositoryImp
 from tracking.driver_session_service import DriverSessionService
+from tracking.nearby_drivers_search import NearbyDriversSearch, bounding_box
 
 
 class DriverTrackingService:
@@ -26,6 +34,10 @@ class DriverTrackingService:
     travelled_distance_service: TravelledDistanceService
     driver_session_service: DriverSessionService
     geocoding_service: GeocodingService
+    nearest_k_selector: NearestKSelector
+    driver_position_index: DriverPositionIndex
+    app_properties: AppProperties
+    unit_of_work: UnitOfWork
 
     @inject
     def __init__(
@@ -35,12 +47,20 @@ class DriverTrackingService:
             travelled_distance_service: TravelledDistanceService,
             driver_session_service: DriverSessionService,
             geocoding_service: GeocodingService,
+            nearest_k_selector: NearestKSelector,
+            driver_position_index: DriverPositionIndex,
+            app_properties: AppProperties,
+            unit_of_work: UnitOfWork,
     ):
         self.position_repository = position_repository
         self.driver_service = driver_service
         self.driver_session_service = driver_session_service
         self.travelled_distance_service = travelled_distance_service
         self.geocoding_service = geocoding_service
+        self.nearest_k_selector = nearest_k_selector
+        self.driver_position_index = driver_position_index
+        self.unit_of_work = unit_of_work
+        self.app_properties = app_properties
 
     def register_position(self, driver_id: int, latitude: float, longitude: float, seen_at: datetime) -> DriverPosition:
         driver: DriverDTO = self.driver_service.load_driver(driver_id)
@@ -55,9 +75,58 @@ class DriverTrackingService:
         position.latitude = latitude
         position.longitude = longitude
         position = self.position_repository.save(position)
+        self.driver_position_index.update(driver_id, latitude, longitude, seen_at, position.id)
         self.travelled_distance_service.add_position(driver_id, latitude, longitude, seen_at)
         return position
 
+    def register_positions(self, positions: List[DriverPositionDTO]) -> List[DriverPosition]:
+        drivers: Dict[int, DriverDTO] = {
+            driver.id: driver for driver in self.driver_service.load_drivers(
+                list({position.driver_id for position in positions})
+            )
+        }
+        for position in positions:
+            driver: DriverDTO = drivers.get(position.driver_id)
+            if driver is None:
+                raise AttributeError(("Driver does not exists, id = " + str(position.driver_id)))
+            if driver.status != Driver.Status.ACTIVE:
+                raise AttributeError(
+                    ("Driver is not active, cannot register position, id = " + str(position.driver_id))
+                )
+
+        driver_positions: List[DriverPosition] = []
+        positions_by_driver: Dict[int, List[DriverPositionDTO]] = defaultdict(list)
+        for position in positions:
+            driver_position = DriverPosition()
+            driver_position.driver_id = position.driver_id
+            driver_position.seen_at = position.seen_at
+            driver_position.latitude = position.latitude
+            driver_position.longitude = position.longitude
+            driver_positions.append(driver_position)
+            positions_by_driver[position.driver_id].append(position)
+
+        # The positions and the distances they add are committed together, once per batch.
+        with self.unit_of_work.begin():
+            driver_positions = self.position_repository.save_all(driver_positions)
+            pings: List[Tuple[int, float, float, datetime, int]] = [
+                (
+                    position.driver_id,
+                    position.latitude,
+                    position.longitude,
+                    position.seen_at,
+                    inspect(driver_position).identity[0]
+                )
+                for position, driver_position in zip(positions, driver_positions)
+            ]
+            after_commit(lambda: self.__index(pings))
+            for driver_id, driver_pings in positions_by_driver.items():
+                self.travelled_distance_service.add_positions(driver_id, driver_pings)
+        return driver_positions
+
+    def __index(self, pings: List[Tuple[int, float, float, datetime, int]]) -> None:
+        for driver_id, latitude, longitude, seen_at, position_id in pings:
+            self.driver_position_index.update(driver_id, latitude, longitude, seen_at, position_id)
+
     def calculate_travelled_distance(self, driver_id: int, since: datetime, to: datetime) -> Distance:
         return self.travelled_distance_service.calculate_distance(driver_id, since, to)
 
@@ -67,43 +136,87 @@ class DriverTrackingService:
             distance: Distance,
             car_classes: List[CarClass]
     ) -> List[DriverPositionDTOV2]:
-        geocoded: List[float] = []
-
-        try:
-            geocoded = self.geocoding_service.geocode_address(address.to_address_entity())
-        except Exception:
-            pass
-
-        longitude: float = geocoded[1]
-        latitude: float = geocoded[0]
-
-        # https://gis.stackexchange.com/questions/2951/algorithm-for-offsetting-a-latitude-longitude-by-some-amount-of-meters
-        # Earth’s radius, sphere
-        # double R = 6378;
-        R: float = 6371  # Changed to 6371 due to Copy&Paste pattern from different source
+        latitude, longitude = self.geocode(address)
+        latitude_min, latitude_max, longitude_min, longitude_max = bounding_box(latitude, longitude, distance)
 
-        # offsets in meters
-        dn: float = distance.to_km_in_float()
-        de: float = distance.to_km_in_float()
-
-        d_lat: float = dn / R
-        d_lon: float = de / (R * math.cos(math.pi * latitude / 180))
+        return self.find_active_drivers_nearby(
+            latitude_min,
+            latitude_max,
+            longitude_min,
+            longitude_max,
+            latitude,
+            longitude,
+            car_classes
+        )
 
-        # Offset positions, decimal degrees
-        latitude_min = latitude - d_lat * 180 / math.pi
-        latitude_max = latitude + d_lat * 180 / math.pi
-        longitude_min = longitude - d_lon * 180 / math.pi
-        longitude_max = longitude + d_lon * 180 / math.pi
+    def search_active_drivers_nearby_by_address(
+            self,
+            address: AddressDTO,
+            max_distance: Distance,
+            car_classes: List[CarClass]
+    ) -> NearbyDriversSearch:
+        latitude, longitude = self.geocode(address)
+        latitude_min, latitude_max, longitude_min, longitude_max = bounding_box(latitude, longitude, max_distance)
 
-        return self.find_active_drivers_nearby(
+        pings: List[DriverPing] = self.find_pings_since(
             latitude_min,
             latitude_max,
             longitude_min,
             longitude_max,
+            datetime.now() - relativedelta(minutes=5)
+        )
+        return NearbyDriversSearch(
             latitude,
             longitude,
+            pings,
+            car_classes,
+            self.driver_session_service,
+            self.driver_service,
+            self.nearest_k_selector
+        )
+
+    def geocode(self, address: AddressDTO) -> Tuple[float, float]:
+        geocoded: List[float] = []
+
+        try:
+            geocoded = self.geocoding_service.geocode_address(address.to_address_entity())
+        except Exception:
+            pass
+
+        return geocoded[0], geocoded[1]
+
+    def find_available_drivers_around(
+            self,
+            pickups: List[Tuple[float, float]],
+            max_distance: Distance,
+            car_classes: List[CarClass]
+    ) -> List[AvailableDriver]:
+        # One candidate fetch for the area covering every pickup, availability checked in bulk.
+        if not pickups or not car_classes:
+            return []
+        boxes: List[Tuple[float, float, float, float]] = [
+            bounding_box(latitude, longitude, max_distance) for latitude, longitude in pickups
+        ]
+        candidates: List[DriverPositionDTOV2] = self.find_average_driver_position_since(
+            min(box[0] for box in boxes),
+            max(box[1] for box in boxes),
+            min(box[2] for box in boxes),
+            max(box[3] for box in boxes),
+            datetime.now() - relativedelta(minutes=5)
+        )
+        driver_ids: List[int] = [position.driver_id for position in candidates]
+        if not driver_ids:
+            return []
+        logged_in: Dict[int, CarClass] = self.driver_session_service.find_currently_logged_car_classes(
+            driver_ids,
             car_classes
         )
+        available: Set[int] = self.driver_service.find_available_driver_ids(list(logged_in))
+        return [
+            AvailableDriver(position, logged_in[position.driver_id])
+            for position in candidates
+            if position.driver_id in available
+        ]
 
     def find_active_drivers_nearby(
             self,
@@ -115,7 +228,7 @@ class DriverTrackingService:
             longitude: float,
             car_classes: List[CarClass],
     ) -> List[DriverPositionDTOV2]:
-        drivers_avg_positions: List[DriverPositionDTOV2] = self.position_repository.find_average_driver_position_since(
+        drivers_avg_positions: List[DriverPositionDTOV2] = self.find_average_driver_position_since(
             latitude_min,
             latitude_max,
             longitude_min,
@@ -123,21 +236,13 @@ class DriverTrackingService:
             datetime.now() - relativedelta(minutes=5)
         )
 
-        def comparator(d1, d2):
-            d1 = math.sqrt(
-                math.pow(latitude - d1.latitude, 2) + math.pow(longitude - d1.longitude, 2)
-            )
-            d2 = math.sqrt(
-                math.pow(latitude - d2.latitude, 2) + math.pow(longitude - d2.longitude, 2)
-            )
-            if d1 < d2:
-                return -1
-            if d1 > d2:
-                return 1
-            return 0
-
-        drivers_avg_positions = sorted(drivers_avg_positions, key=functools.cmp_to_key(comparator))
-        drivers_avg_positions = drivers_avg_positions[:20]
+        drivers_avg_positions = self.nearest_k_selector.select(
+            drivers_avg_positions,
+            latitude,
+            longitude,
+            20,
+            lambda position: (position.latitude, position.longitude)
+        )
 
         drivers_ids: List[int] = list(map(
             lambda position: position.driver_id,
@@ -153,19 +258,80 @@ class DriverTrackingService:
             drivers_avg_positions
         ))
 
-        drivers: Dict[int, DriverDTO] = dict(list(map(
-            lambda driver: (driver.id, driver),
-            self.driver_service.load_drivers(drivers_ids)
-        )))
+        available_driver_ids: Set[int] = self.driver_service.find_available_driver_ids(drivers_ids)
 
-        def position_filter(dap: DriverPositionDTOV2) -> bool:
-            d: DriverDTO = drivers.get(dap.driver_id)
-            return bool(d.status == Driver.Status.ACTIVE and not d.is_occupied)
+        drivers_avg_positions = list(filter(
+            lambda dap: dap.driver_id in available_driver_ids,
+            drivers_avg_positions
+        ))
+        return drivers_avg_positions
 
-        drivers_avg_positions = list(
-            filter(
-                lambda dap: position_filter(dap),
-                drivers_avg_positions
+    def find_average_driver_position_since(
+            self,
+            latitude_min: float,
+            latitude_max: float,
+            longitude_min: float,
+            longitude_max: float,
+            date: datetime,
+    ) -> List[DriverPositionDTOV2]:
+        if not self.__index_covers(date):
+            return self.position_repository.find_average_driver_position_since(
+                latitude_min, latitude_max, longitude_min, longitude_max, date
             )
+        return self.driver_position_index.find_average_driver_position_since(
+            latitude_min, latitude_max, longitude_min, longitude_max, date
         )
-        return drivers_avg_positions
+
+    def find_pings_since(
+            self,
+            latitude_min: float,
+            latitude_max: float,
+            longitude_min: float,
+            longitude_max: float,
+            date: datetime,
+    ) -> List[DriverPing]:
+        if not self.__index_covers(date):
+            return self.position_repository.find_all_pings_since(
+                latitude_min, latitude_max, longitude_min, longitude_max, date
+            )
+        return self.driver_position_index.find_pings_since(
+            latitude_min, latitude_max, longitude_min, longitude_max, date
+        )
+
+    def __index_covers(self, date: datetime) -> bool:
+        if not self.app_properties.driver_position_index_enabled:
+            return False
+        if not self.driver_position_index.is_loaded():
+            last_position_id: int = self.position_repository.find_last_id()
+            self.driver_position_index.rebuild(
+                self.position_repository.find_all_by_seen_at_after(date),
+                date,
+                last_position_id
+            )
+        elif self.driver_position_index.is_older_than(self.app_properties.driver_position_index_refresh_in_seconds):
+            # Pings stored by other processes since the last read.
+            self.driver_position_index.refresh(
+                self.position_repository.find_all_by_id_after(self.driver_position_index.last_position_id())
+            )
+        return self.driver_position_index.covers(date)
+
+    def cross_check_average_driver_positions(
+            self,
+            latitude_min: float,
+            latitude_max: float,
+            longitude_min: float,
+            longitude_max: float,
+            date: datetime,
+    ) -> Set[int]:
+        # Ids of drivers found by only one of the two paths: the in-memory index and the SQL aggregate.
+        from_index: Set[int] = {
+            position.driver_id for position in self.find_average_driver_position_since(
+                latitude_min, latitude_max, longitude_min, longitude_max, date
+            )
+        }
+        from_database: Set[int] = {
+            position.driver_id for position in self.position_repository.find_average_driver_position_since(
+                latitude_min, latitude_max, longitude_min, longitude_max, date
+            )
+        }
+        return from_index ^ from_database
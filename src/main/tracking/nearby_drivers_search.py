@@ -0,0 +1,126 @@
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from carfleet.car_class import CarClass
+from driverfleet.driver_service import DriverService
+from geolocation.distance import Distance
+from geolocation.nearest_k_selector import NearestKSelector
+from tracking.driver_ping import DriverPing
+from tracking.driver_position_dtov_2 import DriverPositionDTOV2
+from tracking.driver_session_service import DriverSessionService
+
+
+def bounding_box(latitude: float, longitude: float, distance: Distance) -> Tuple[float, float, float, float]:
+    # https://gis.stackexchange.com/questions/2951/algorithm-for-offsetting-a-latitude-longitude-by-some-amount-of-meters
+    # Earth’s radius, sphere
+    R: float = 6371
+
+    d_lat: float = distance.to_km_in_float() / R
+    d_lon: float = distance.to_km_in_float() / (R * math.cos(math.pi * latitude / 180))
+
+    return (
+        latitude - d_lat * 180 / math.pi,
+        latitude + d_lat * 180 / math.pi,
+        longitude - d_lon * 180 / math.pi,
+        longitude + d_lon * 180 / math.pi,
+    )
+
+
+class NearbyDriversSearch:
+    """Raw pings around a pickup point, fetched once up to the widest radius.
+
+    Every radius averages the pings inside its own box, as a query per radius would, so a driver
+    who drove into the box is placed by the pings within it only. Session and driver status checks
+    are made only for drivers that actually make it into a radius and are remembered between radii.
+    """
+    MAX_DRIVERS_IN_RADIUS: int = 20
+
+    latitude: float
+    longitude: float
+    car_classes: List[CarClass]
+    driver_session_service: DriverSessionService
+    driver_service: DriverService
+    nearest_k_selector: NearestKSelector
+
+    __by_ring: Dict[int, List[DriverPing]]
+    __available: Dict[int, bool]
+
+    def __init__(
+            self,
+            latitude: float,
+            longitude: float,
+            pings: List[DriverPing],
+            car_classes: List[CarClass],
+            driver_session_service: DriverSessionService,
+            driver_service: DriverService,
+            nearest_k_selector: NearestKSelector,
+    ):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.car_classes = car_classes
+        self.driver_session_service = driver_session_service
+        self.driver_service = driver_service
+        self.nearest_k_selector = nearest_k_selector
+        self.__available = {}
+        # Pings are grouped by the smallest whole-kilometer box they fall into,
+        # so a radius only looks at its own and inner rings.
+        latitude_per_km, _, longitude_per_km, _ = bounding_box(0, 0, Distance.of_km(1))
+        latitude_per_km = abs(latitude_per_km)
+        longitude_per_km = abs(longitude_per_km) / math.cos(math.pi * latitude / 180)
+        self.__by_ring = defaultdict(list)
+        for ping in pings:
+            latitude_in_km: float = abs(ping.latitude - latitude) / latitude_per_km
+            longitude_in_km: float = abs(ping.longitude - longitude) / longitude_per_km
+            ring: int = math.ceil(latitude_in_km if latitude_in_km > longitude_in_km else longitude_in_km)
+            self.__by_ring[ring].append(ping)
+
+    def within(self, distance: Distance) -> List[DriverPositionDTOV2]:
+        in_radius: List[DriverPositionDTOV2] = self.nearest_k_selector.select(
+            self.__averages_within(distance),
+            self.latitude,
+            self.longitude,
+            self.MAX_DRIVERS_IN_RADIUS,
+            lambda position: (position.latitude, position.longitude)
+        )
+
+        self.__check_availability([
+            position.driver_id for position in in_radius if position.driver_id not in self.__available
+        ])
+        return [position for position in in_radius if self.__available[position.driver_id]]
+
+    def __averages_within(self, distance: Distance) -> List[DriverPositionDTOV2]:
+        latitude_min, latitude_max, longitude_min, longitude_max = bounding_box(
+            self.latitude, self.longitude, distance
+        )
+        sums: Dict[int, Tuple[float, float, int, Optional[datetime]]] = {}
+        for ring in range(math.ceil(distance.to_km_in_float()) + 2):
+            for ping in self.__by_ring.get(ring, ()):
+                if latitude_min <= ping.latitude <= latitude_max and longitude_min <= ping.longitude <= longitude_max:
+                    latitude_sum, longitude_sum, count, newest = sums.get(ping.driver_id, (0, 0, 0, None))
+                    sums[ping.driver_id] = (
+                        latitude_sum + ping.latitude,
+                        longitude_sum + ping.longitude,
+                        count + 1,
+                        ping.seen_at if newest is None else max(newest, ping.seen_at),
+                    )
+        return [
+            DriverPositionDTOV2(
+                driver_id=driver_id,
+                latitude=latitude_sum / count,
+                longitude=longitude_sum / count,
+                seen_at=newest
+            )
+            for driver_id, (latitude_sum, longitude_sum, count, newest) in sums.items()
+        ]
+
+    def __check_availability(self, driver_ids: List[int]) -> None:
+        if not driver_ids:
+            return
+        logged_in: Set[int] = set(
+            self.driver_session_service.find_currently_logged_driver_ids(driver_ids, self.car_classes)
+        )
+        available: Set[int] = self.driver_service.find_available_driver_ids(driver_ids)
+        for driver_id in driver_ids:
+            self.__available[driver_id] = driver_id in logged_in and driver_id in available